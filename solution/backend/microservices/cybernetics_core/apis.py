@@ -17,7 +17,7 @@ from application.models import CasualChatResponse
 from application.contracts.persistence import SystemPromptTemplateRepository
 from application.contracts.infrastructure import SpeechSynthesizer, AudioTranscriptor, TextGenerator
 
-from infrastructure.common import LoggingService
+from infrastructure.common import LoggingService, AudioCache
 
 conversation = Conversation(uuid4(), uuid4())
 
@@ -79,4 +79,8 @@ def upload_audio(
 
     response.headers['X-Emotion'] = __normalize_emotion(casual_chat_response.emotion)
 
-    return response, 200
\ No newline at end of file
+    return response, 200
+
+@inject
+def get_tts_cache_stats(audio_cache: AudioCache = Provide[Container.audio_cache]):
+    return audio_cache.stats(), 200
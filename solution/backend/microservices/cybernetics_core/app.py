@@ -14,4 +14,6 @@ def create_app(container: Container):
     upload_audio = cross_origin(expose_headers=['X-Emotion'])(apis.upload_audio)
     app.add_url_rule("/api/upload-audio", None, upload_audio, methods=["POST"])
 
+    app.add_url_rule("/api/tts-cache/stats", None, apis.get_tts_cache_stats, methods=["GET"])
+
     return app
\ No newline at end of file
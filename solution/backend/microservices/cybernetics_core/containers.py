@@ -6,7 +6,7 @@ from settings import AppSettings
 from application.contracts.infrastructure import SpeechSynthesizer, AudioTranscriptor, TextGenerator
 from application.contracts.persistence import SystemPromptTemplateRepository
 
-from infrastructure.common import LoggingService
+from infrastructure.common import LoggingService, AudioCache
 from infrastructure.ai import AzureSpeechSynthesizerService, GroqService
 from persistence.relational import InMemorySystemPromptRepository
 
@@ -39,7 +39,15 @@ class Container(containers.DeclarativeContainer):
         temperature=app_settings.GROQ_INTERACTION_TEMPERATURE
     )
 
+    audio_cache = providers.Singleton(
+        AudioCache,
+        cache_dir=app_settings.TTS_CACHE_DIR,
+        max_bytes=app_settings.TTS_CACHE_MAX_MB * 1024 * 1024,
+        max_text_length=app_settings.TTS_CACHE_MAX_TEXT_LENGTH,
+    )
+
     speech_synthesizer_service: providers.Provider[SpeechSynthesizer] = providers.Singleton(
         AzureSpeechSynthesizerService,
         azure_speech_subscription_key=app_settings.AZURE_SPEECH_SUBSCRIPTION_KEY,
+        audio_cache=audio_cache,
     )
@@ -6,17 +6,22 @@ from typing import Optional, Tuple
 import azure.cognitiveservices.speech as speechsdk
 
 from application.contracts.infrastructure import SpeechSynthesizer
+from infrastructure.common import AudioCache
 
 class AzureSpeechSynthesizerService(SpeechSynthesizer):
     """Azure implementation of speech synthesis"""
     
-    def __init__(self, azure_speech_subscription_key: str):
+    OUTPUT_FORMAT = "ogg-16khz-16bit-mono-opus"
+
+    def __init__(self, azure_speech_subscription_key: str, audio_cache: Optional[AudioCache] = None):
         """
         Initialize Azure Speech Synthesizer
         
         Args:
             azure_speech_subscription_key (str): Azure Speech Subscription Key
+            audio_cache (Optional[AudioCache]): Cache of synthesized audio, repeated phrases are served from it
         """
+        self.audio_cache = audio_cache
         self.upload_dir = "temp_audio"
         self._ensure_upload_dir()
         
@@ -70,32 +75,52 @@ class AzureSpeechSynthesizerService(SpeechSynthesizer):
             self.speech_config.speech_synthesis_language = voice_config['language']
             self.speech_config.speech_synthesis_voice_name = voice_config['voice']
 
+            # Serve repeated phrases from the cache, long replies are rarely repeated and not cached
+            cache_key = None
+            if self.audio_cache and self.audio_cache.cacheable(text):
+                cache_key = self.audio_cache.key(text, voice_config['voice'], self.OUTPUT_FORMAT, ".opus")
+                cached_file = self.audio_cache.get(cache_key)
+                if cached_file:
+                    return cached_file, None
+
             # Generate unique filename
-            output_file = self._generate_unique_filename()
-            
-            # Configure audio output
-            audio_config = speechsdk.audio.AudioOutputConfig(
-                use_default_speaker=False,
-                filename=output_file
-            )
+            output_file = self.audio_cache.reserve(".opus") if cache_key else self._generate_unique_filename()
+            cached_file = None
+            speech_synthesizer = None
+            try:
+                # Configure audio output
+                audio_config = speechsdk.audio.AudioOutputConfig(
+                    use_default_speaker=False,
+                    filename=output_file
+                )
 
-            # Create synthesizer
-            speech_synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config
-            )
+                # Create synthesizer
+                speech_synthesizer = speechsdk.SpeechSynthesizer(
+                    speech_config=self.speech_config,
+                    audio_config=audio_config
+                )
 
-            # Synthesize speech
-            result = speech_synthesizer.speak_text_async(text).get()
+                # Synthesize speech
+                result = speech_synthesizer.speak_text_async(text).get()
 
-            # Check result
-            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-                return output_file, None
-            else:
-                error_details = result.properties.get(
-                    speechsdk.PropertyId.SpeechServiceResponse_JsonErrorDetails
-                )
-                return None, f"Speech synthesis failed: {error_details}"
+                # Check result
+                if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+                    if cache_key:
+                        # The synthesizer must release the file before it is moved into the cache
+                        speech_synthesizer = None
+                        cached_file = self.audio_cache.put(cache_key, output_file)
+                        return cached_file, None
+                    return output_file, None
+                else:
+                    error_details = result.properties.get(
+                        speechsdk.PropertyId.SpeechServiceResponse_JsonErrorDetails
+                    )
+                    return None, f"Speech synthesis failed: {error_details}"
+            finally:
+                # A failed or cancelled synthesis must not leave its temporary file in the cache
+                if cache_key and cached_file is None:
+                    speech_synthesizer = None
+                    self.audio_cache.discard(output_file)
 
         except Exception as e:
             return None, f"Error during speech synthesis: {str(e)}"
\ No newline at end of file
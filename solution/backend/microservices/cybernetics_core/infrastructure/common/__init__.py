@@ -1 +1,2 @@
-from .logging_service.logging_service import LoggingService
\ No newline at end of file
+from .logging_service.logging_service import LoggingService
+from .audio_cache.audio_cache import AudioCache
\ No newline at end of file
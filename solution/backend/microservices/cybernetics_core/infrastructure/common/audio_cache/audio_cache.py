@@ -0,0 +1,158 @@
+import os
+import time
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+class AudioCache:
+    """Content-addressed, size-bounded disk cache of synthesized audio files with LRU eviction"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024, max_text_length: int = 200, serving_window_seconds: float = 60.0):
+        """
+        Initialize the audio cache
+
+        Args:
+            cache_dir (str): Directory holding the cached audio files
+            max_bytes (int): Maximum total size of the cache, least recently used files are evicted first
+            max_text_length (int): Longest text that is cached, longer replies are rarely repeated
+            serving_window_seconds (float): Files used more recently than this are never evicted, so a file is not deleted while it is being sent
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_text_length = max_text_length
+        self.serving_window_seconds = serving_window_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Temporary files left by a crash during synthesis are never completed
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".tmp"):
+                self.discard(entry.path)
+
+        # File modification times record the use order, so it survives restarts
+        files = sorted(
+            (entry.stat().st_mtime, entry.name, entry.stat().st_size)
+            for entry in os.scandir(self.cache_dir)
+            if entry.is_file()
+        )
+        self._entries = OrderedDict((name, (size, used_at)) for used_at, name, size in files)
+        self._total_bytes = sum(size for size, _ in self._entries.values())
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used files until the cache fits in max_bytes"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            name, (size, used_at) = next(iter(self._entries.items()))
+            if time.time() - used_at < self.serving_window_seconds:
+                # It may still be streamed to a client, the cache shrinks on a later put
+                break
+            del self._entries[name]
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+
+    def cacheable(self, text: str) -> bool:
+        """Whether audio of the text is worth caching"""
+        return 0 < len(text.strip()) <= self.max_text_length
+
+    def key(self, text: str, voice: str, output_format: str, extension: str) -> str:
+        """
+        Build the cache file name of a synthesis request
+
+        Args:
+            text (str): Synthesized text
+            voice (str): Voice name
+            output_format (str): Audio output format
+            extension (str): File extension, e.g. '.opus'
+
+        Returns:
+            str: File name derived from the SHA-256 of voice, format and text
+        """
+        digest = hashlib.sha256(f"{voice}\n{output_format}\n{text.strip()}".encode("utf-8")).hexdigest()
+        return f"{digest}{extension}"
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached file and mark it as recently used
+
+        Args:
+            key (str): Cache file name from key()
+
+        Returns:
+            Optional[str]: Path of the cached file, None on a miss
+        """
+        with self._lock:
+            path = os.path.join(self.cache_dir, key)
+            if key in self._entries and os.path.exists(path):
+                os.utime(path)
+                self._entries[key] = (self._entries[key][0], time.time())
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return path
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[0]
+            self.misses += 1
+            return None
+
+    def reserve(self, extension: str) -> str:
+        """
+        Get a temporary path to write new audio to before adding it with put() or dropping it with discard()
+
+        Args:
+            extension (str): File extension of the audio
+
+        Returns:
+            str: Temporary file path inside the cache directory
+        """
+        return os.path.join(self.cache_dir, f"{uuid.uuid4()}{extension}.tmp")
+
+    def put(self, key: str, temporary_path: str) -> str:
+        """
+        Move a written temporary file into the cache
+
+        Args:
+            key (str): Cache file name from key()
+            temporary_path (str): File written by the synthesizer, from reserve()
+
+        Returns:
+            str: Path of the cached file
+        """
+        with self._lock:
+            path = os.path.join(self.cache_dir, key)
+            os.replace(temporary_path, path)
+            size = os.path.getsize(path)
+            previous_size, _ = self._entries.pop(key, (0, None))
+            self._total_bytes += size - previous_size
+            self._entries[key] = (size, time.time())
+            self._evict()
+            return path
+
+    def discard(self, temporary_path: str) -> None:
+        """
+        Delete a temporary file from reserve() that will not be added to the cache
+
+        Args:
+            temporary_path (str): File from reserve(), possibly never written
+        """
+        try:
+            os.remove(temporary_path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> dict:
+        """Return hit and miss counters, hit rate and cache size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+        }
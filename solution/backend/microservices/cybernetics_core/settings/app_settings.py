@@ -11,6 +11,9 @@ class AppSettings:
     GROQ_INTERACTION_MODEL_NAME: str
     GROQ_INTERACTION_TEMPERATURE: float
     AZURE_SPEECH_SUBSCRIPTION_KEY: str
+    TTS_CACHE_DIR: str
+    TTS_CACHE_MAX_MB: int
+    TTS_CACHE_MAX_TEXT_LENGTH: int
     
     @classmethod
     def from_env(cls):
@@ -22,5 +25,8 @@ class AppSettings:
             GROQ_API_KEY=os.getenv("GROQ_API_KEY"),
             GROQ_INTERACTION_MODEL_NAME=os.getenv("GROQ_INTERACTION_MODEL_NAME"),
             GROQ_INTERACTION_TEMPERATURE=float(os.getenv("GROQ_INTERACTION_TEMPERATURE")),
-            AZURE_SPEECH_SUBSCRIPTION_KEY=os.getenv("AZURE_SPEECH_SUBSCRIPTION_KEY")
+            AZURE_SPEECH_SUBSCRIPTION_KEY=os.getenv("AZURE_SPEECH_SUBSCRIPTION_KEY"),
+            TTS_CACHE_DIR=os.getenv("TTS_CACHE_DIR", "tts_cache"),
+            TTS_CACHE_MAX_MB=int(os.getenv("TTS_CACHE_MAX_MB", "256")),
+            TTS_CACHE_MAX_TEXT_LENGTH=int(os.getenv("TTS_CACHE_MAX_TEXT_LENGTH", "200"))
         )
\ No newline at end of file
@@ -0,0 +1,32 @@
+import os
+import wave
+
+import numpy as np
+
+
+def load_wav(path: str, rate: int = 16000) -> np.ndarray:
+    """
+    Read a 16-bit mono WAV fixture without spawning ffmpeg.
+
+    Args:
+        path (str): Path to the WAV file.
+        rate (int): Expected sample rate in Hz.
+
+    Returns:
+        np.ndarray: int16 PCM samples.
+    """
+    with wave.open(path, "rb") as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2 or wf.getframerate() != rate:
+            raise ValueError(f"{path} must be 16-bit mono PCM at {rate} Hz")
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+
+def list_wav_files(path: str) -> list:
+    """Return the WAV files at a path, which may be a single file or a directory"""
+    if os.path.isdir(path):
+        return sorted(
+            os.path.join(path, file_name)
+            for file_name in os.listdir(path)
+            if file_name.lower().endswith(".wav")
+        )
+    return [path]
@@ -0,0 +1,112 @@
+"""
+CPU usage of the listener's capture/consumer threads while idle, before and after moving to
+callback capture with blocking reads.
+
+A simulated microphone delivers 1024-sample chunks of low-level noise in real time, so no audio
+hardware is needed. Each mode runs for a "listening" phase and a "talking" phase (Casey speaking,
+capture paused), and the process CPU time is reported as a percentage of one core.
+
+Usage (from src/app):
+    python -m benchmarks.idle_cpu_benchmark --seconds 5
+"""
+import time
+import argparse
+import threading
+from queue import Queue
+
+import numpy as np
+
+from client.audio_ring_buffer import AudioRingBuffer
+from client.voice_activity_detector import VoiceActivityDetector
+
+RATE = 16000
+CHUNK = 1024
+
+
+class SimulatedMicrophone:
+    """Produces noise chunks at the real-time rate, like a blocking stream.read"""
+    def __init__(self):
+        self.rng = np.random.default_rng(0)
+        self.next_chunk_time = time.perf_counter()
+
+    def read(self):
+        self.next_chunk_time += CHUNK / RATE
+        time.sleep(max(0.0, self.next_chunk_time - time.perf_counter()))
+        return self.rng.normal(0, 200, CHUNK).astype(np.int16).tobytes()
+
+
+def run_legacy(state):
+    """The previous design: a read loop that spins while talking and a polling consumer"""
+    microphone = SimulatedMicrophone()
+    audio_queue = Queue()
+    audio_buffer = AudioRingBuffer(capacity=90 * RATE)
+    vad = VoiceActivityDetector(rate=RATE)
+
+    def record_audio():
+        while state["running"]:
+            if not state["talking"]:
+                audio_queue.put(microphone.read())
+
+    def process_audio():
+        while state["running"] or not audio_queue.empty():
+            if not audio_queue.empty():
+                audio_buffer.write(np.frombuffer(audio_queue.get(), dtype=np.int16))
+                vad.process(audio_buffer)
+
+    return [threading.Thread(target=record_audio), threading.Thread(target=process_audio)]
+
+
+def run_blocking(state):
+    """The current design: callback capture and a consumer blocking on the ring buffer"""
+    microphone = SimulatedMicrophone()
+    audio_buffer = AudioRingBuffer(capacity=90 * RATE)
+    vad = VoiceActivityDetector(rate=RATE)
+
+    def portaudio_callback_thread():
+        # Stands in for PortAudio's callback thread, which is driven by the audio device
+        while state["running"]:
+            data = microphone.read()
+            if not state["talking"]:
+                audio_buffer.write(np.frombuffer(data, dtype=np.int16))
+
+    def process_audio():
+        while state["running"]:
+            if not audio_buffer.wait_for_samples(vad.position + vad.frame_length, timeout=0.5):
+                continue
+            vad.process(audio_buffer)
+
+    return [threading.Thread(target=portaudio_callback_thread), threading.Thread(target=process_audio)]
+
+
+def measure(build_threads, seconds):
+    state = {"running": True, "talking": False}
+    threads = build_threads(state)
+    for thread in threads:
+        thread.start()
+
+    usage = {}
+    for phase, talking in [("listening", False), ("talking", True)]:
+        state["talking"] = talking
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        time.sleep(seconds)
+        usage[phase] = 100 * (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+
+    state["running"] = False
+    for thread in threads:
+        thread.join()
+    return usage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5, help="Duration of each phase")
+    args = parser.parse_args()
+
+    print(f"{'mode':>10} {'listening (% core)':>19} {'talking (% core)':>17}")
+    for mode, build_threads in [("legacy", run_legacy), ("blocking", run_blocking)]:
+        usage = measure(build_threads, args.seconds)
+        print(f"{mode:>10} {usage['listening']:>19.1f} {usage['talking']:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
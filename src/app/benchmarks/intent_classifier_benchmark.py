@@ -0,0 +1,118 @@
+"""
+Accuracy and latency of the local intent classifier against the LLM intent detection prompt, on
+a labelled set of turns that are not among the classifier's training examples.
+
+For the local path it reports top-1 accuracy, the share of turns answered locally (confident and
+conversational) with their accuracy, and per-turn latency. With --llm (GROQ_API_KEY and
+GROQ_INTERACTION_MODEL_ID set) the LLM path and the combined local-then-LLM path are measured too.
+
+Usage (from src/app):
+    python -m benchmarks.intent_classifier_benchmark --llm
+"""
+import os
+import time
+import argparse
+
+import numpy as np
+
+from logic.intent_classifier import IntentClassifier
+
+EVALUATION_TURNS = [
+    ("Thanks, that was helpful", "casual_conversation"),
+    ("Okay", "casual_conversation"),
+    ("Hey Casey, what's up?", "casual_conversation"),
+    ("What do you think about electric cars?", "casual_conversation"),
+    ("How do people usually write good articles?", "casual_conversation"),
+    ("Any tips for taking better photos?", "casual_conversation"),
+    ("Is it hard to make memes?", "casual_conversation"),
+    ("¿Qué tal tu día?", "casual_conversation"),
+    ("Muchas gracias", "casual_conversation"),
+    ("¿Por qué el cielo es azul?", "casual_conversation"),
+    ("Write an article about the benefits of meditation", "article_writing"),
+    ("Draft a blog post on budget travel in Europe", "article_writing"),
+    ("Escribe un artículo sobre la economía de Perú", "article_writing"),
+    ("Give me a news roundup about the Olympics", "article_writing"),
+    ("Write a tweet celebrating our 1000th customer", "compose_social_media"),
+    ("Create a LinkedIn post about my promotion", "compose_social_media"),
+    ("Escribe un post de Instagram sobre mi viaje", "compose_social_media"),
+    ("Generate a video about how volcanoes work", "create_video"),
+    ("Crea un video explicando la fotosíntesis", "create_video"),
+    ("Make a meme about debugging at 3am", "create_meme"),
+    ("Haz un meme sobre el tráfico", "create_meme"),
+    ("Generate an image of a penguin surfing", "generate_image"),
+    ("Dibuja un castillo en las nubes", "generate_image"),
+    ("Last Friday I went hiking with my brother and we got lost", "episodic_memory_event"),
+    ("Today I finally finished my thesis and I feel relieved", "episodic_memory_event"),
+    ("Ayer fui al concierto de mi banda favorita y fue emocionante", "episodic_memory_event"),
+]
+
+
+class LlmIntentPath:
+    """The LLM intent detection of InteractionManager, without its processors"""
+    def __init__(self, groq_api_key, groq_interaction_model_id):
+        from logic.groq_client_pool import GroqClientPool
+        from logic.interaction_manager import InteractionManager
+
+        interaction_manager = InteractionManager.__new__(InteractionManager)
+        interaction_manager.client = GroqClientPool(groq_api_key).client
+        interaction_manager.groq_interaction_model_id = groq_interaction_model_id
+        interaction_manager.llm_response_cache = None
+        self.detect = interaction_manager.detect_intent_and_topic
+
+
+def percentiles(latencies):
+    return np.percentile(np.array(latencies) * 1000, [50, 95])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=0.8, help="Confidence needed to answer locally")
+    parser.add_argument("--llm", action="store_true", help="Also measure the LLM path (needs Groq credentials)")
+    args = parser.parse_args()
+
+    intent_classifier = IntentClassifier(confidence_threshold=args.threshold)
+    intent_classifier.load()
+    intent_classifier.ready.wait()
+
+    local_results = []
+    for text, expected in EVALUATION_TURNS:
+        start_time = time.perf_counter()
+        intent, confidence = intent_classifier.classify(text)
+        latency = time.perf_counter() - start_time
+        answered = intent in intent_classifier.local_intents and confidence >= args.threshold
+        local_results.append((text, expected, intent, answered, latency))
+
+    turns = len(EVALUATION_TURNS)
+    accuracy = np.mean([intent == expected for _, expected, intent, _, _ in local_results])
+    answered = [(expected, intent) for _, expected, intent, is_answered, _ in local_results if is_answered]
+    answered_accuracy = np.mean([intent == expected for expected, intent in answered]) if answered else 0.0
+    p50, p95 = percentiles([latency for *_, latency in local_results])
+    print(f"local: top-1 accuracy {accuracy:.0%} on {turns} turns, latency p50 {p50:.1f} ms, p95 {p95:.1f} ms")
+    print(f"local: {len(answered)}/{turns} turns answered locally, {answered_accuracy:.0%} of them correct")
+    for text, expected, intent, _, _ in local_results:
+        if intent != expected:
+            print(f"  miss: {text!r} expected {expected}, got {intent}")
+
+    if not args.llm:
+        return
+
+    llm_path = LlmIntentPath(os.environ["GROQ_API_KEY"], os.environ["GROQ_INTERACTION_MODEL_ID"])
+    llm_latencies, llm_correct, combined_latencies, combined_correct = [], [], [], []
+    for text, expected, local_intent, is_answered, local_latency in local_results:
+        start_time = time.perf_counter()
+        llm_intent = llm_path.detect(text)["intent"]
+        llm_latency = time.perf_counter() - start_time
+
+        llm_latencies.append(llm_latency)
+        llm_correct.append(llm_intent == expected)
+        combined_latencies.append(local_latency if is_answered else local_latency + llm_latency)
+        combined_correct.append((local_intent if is_answered else llm_intent) == expected)
+
+    p50, p95 = percentiles(llm_latencies)
+    print(f"llm: accuracy {np.mean(llm_correct):.0%}, latency p50 {p50:.0f} ms, p95 {p95:.0f} ms")
+    p50, p95 = percentiles(combined_latencies)
+    print(f"local then llm: accuracy {np.mean(combined_correct):.0%}, latency p50 {p50:.0f} ms, p95 {p95:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Latency of interactive Groq calls through the LlmGateway while a burst of background calls is
+queued behind the rate limit. No LLM calls are made: completions are simulated with a fixed delay.
+
+Background jobs flood the gateway first, exhausting the requests-per-minute bucket down to its
+interactive reserve, then interactive calls are timed. Their wait on top of the simulated
+completion should be close to zero; the script exits with an error when it is not.
+
+Usage (from src/app):
+    python -m benchmarks.llm_gateway_benchmark --background-calls 40 --requests-per-minute 30
+"""
+import time
+import argparse
+import threading
+
+import numpy as np
+
+from logic.llm_gateway import LlmGateway, TokenBucket, BACKGROUND, INTERACTIVE
+
+
+def check_bucket_reserve(requests_per_minute):
+    """A burst of background takes past the capacity never leaves interactive calls waiting on a debt"""
+    reserve = requests_per_minute * 0.2
+    bucket = TokenBucket(requests_per_minute, reserve=reserve)
+    for _ in range(requests_per_minute + 3):
+        bucket.take(BACKGROUND)
+    tokens_left = bucket.tokens
+    interactive_delay = bucket.take(INTERACTIVE)
+    print(f"bucket: {tokens_left:.1f} tokens left after {requests_per_minute + 3} background takes (reserve {reserve:.0f}), interactive delay {interactive_delay:.2f}s")
+    return tokens_left >= reserve and interactive_delay == 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--background-calls", type=int, default=40)
+    parser.add_argument("--interactive-calls", type=int, default=5)
+    parser.add_argument("--requests-per-minute", type=int, default=30)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--completion-ms", type=float, default=50)
+    parser.add_argument("--tolerance-ms", type=float, default=50, help="Largest acceptable interactive wait")
+    args = parser.parse_args()
+
+    bucket_ok = check_bucket_reserve(args.requests_per_minute)
+
+    llm_gateway = LlmGateway(requests_per_minute=args.requests_per_minute, max_concurrency=args.max_concurrency)
+
+    def completion(**params):
+        time.sleep(args.completion_ms / 1000)
+        return params["model"]
+
+    def background_job():
+        with llm_gateway.lane(BACKGROUND):
+            llm_gateway.create(completion, model="model")
+
+    threads = [threading.Thread(target=background_job, daemon=True) for _ in range(args.background_calls)]
+    for thread in threads:
+        thread.start()
+    # Let the burst drain the bucket down to its reserve and queue up behind it
+    time.sleep(0.5)
+
+    waits = []
+    for _ in range(args.interactive_calls):
+        start_time = time.perf_counter()
+        llm_gateway.create(completion, model="model")
+        waits.append((time.perf_counter() - start_time) * 1000 - args.completion_ms)
+        time.sleep(0.1)
+
+    stats = llm_gateway.stats()
+    p50, worst = np.percentile(waits, 50), max(waits)
+    print(f"background: {stats['background']['calls']} started, {args.background_calls - sum(not thread.is_alive() for thread in threads)} still throttled")
+    print(f"interactive wait over the completion: p50 {p50:.1f} ms, max {worst:.1f} ms")
+    print(stats)
+
+    if not bucket_ok or worst > args.tolerance_ms:
+        raise SystemExit("interactive calls were delayed by background work")
+
+
+if __name__ == "__main__":
+    main()
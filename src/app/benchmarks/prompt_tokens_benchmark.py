@@ -0,0 +1,80 @@
+"""
+Prompt tokens of intent detection per turn, before and after trimming the intent input, on a
+scripted conversation. No LLM calls are made.
+
+Before: the last six messages of the conversation window, assistant answers and timestamps
+included, substituted into the prompt with str.replace. After: the latest user turns without
+timestamps, rendered by the compiled template with its input budget.
+
+Usage (from src/app):
+    python -m benchmarks.prompt_tokens_benchmark --turns 40
+"""
+import re
+import time
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+from client.conversation_window import ConversationWindow
+from logic.interaction_manager import INTENT_DETECTION_PROMPT
+from logic.prompt_registry import prompt_registry
+
+USER_TURNS = [
+    "Hi Casey, how are you today?",
+    "I've been thinking about starting a blog about home cooking",
+    "What kind of recipes do people like to read about?",
+    "Last weekend I made lasagna for my parents and they loved it",
+    "Write an article about easy weeknight dinners for busy parents",
+    "Thanks! Can you also make a meme about burning the garlic bread?",
+    "Ok, what do you think about food photography?",
+    "Generate an image of a rustic kitchen table with fresh pasta",
+]
+
+ASSISTANT_ANSWER = (
+    "That's a wonderful idea! There are a few things worth thinking about here. First, the people "
+    "you want to reach and what they struggle with in the kitchen. Second, the kind of stories you "
+    "like to tell around the food, because readers come back for the voice as much as the recipes. "
+    "And finally, how often you can realistically publish, since consistency matters more than volume."
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--intent-input-turns", type=int, default=3)
+    args = parser.parse_args()
+
+    window = ConversationWindow([{"role": "system", "content": "You are Casey."}], max_tokens=4096)
+    encoding = prompt_registry.encoding
+
+    before_tokens, after_tokens, before_seconds, after_seconds = [], [], 0.0, 0.0
+    for turn in range(args.turns):
+        timestamp = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
+        window.add({"role": "user", "content": f"{USER_TURNS[turn % len(USER_TURNS)]} @@{timestamp}@@"})
+
+        start_time = time.perf_counter()
+        before = INTENT_DETECTION_PROMPT.template.replace("${input}", "\n\n".join(window.recent_contents(6)))
+        before_seconds += time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        intent_input = "\n\n".join(
+            re.sub(r" @@\[[^\]]*\]@@$", "", content) for content in window.recent_contents(args.intent_input_turns, role="user")
+        )
+        after = INTENT_DETECTION_PROMPT.render(input=intent_input)
+        after_seconds += time.perf_counter() - start_time
+
+        before_tokens.append(len(encoding.encode(before)))
+        after_tokens.append(len(encoding.encode(after)))
+        window.add({"role": "assistant", "content": f"{ASSISTANT_ANSWER} @@{timestamp}@@"})
+
+    before_mean, after_mean = np.mean(before_tokens), np.mean(after_tokens)
+    print(f"static prompt: {INTENT_DETECTION_PROMPT.static_tokens} tokens")
+    print(f"before: {before_mean:.0f} prompt tokens per turn, {before_seconds / args.turns * 1e6:.0f} us to build")
+    print(f"after: {after_mean:.0f} prompt tokens per turn, {after_seconds / args.turns * 1e6:.0f} us to build (token accounting included)")
+    print(f"{before_mean - after_mean:.0f} fewer prompt tokens per turn ({1 - after_mean / before_mean:.0%})")
+    print(prompt_registry.stats()["intent_detection"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Replays recorded WAV files through the listener pipeline (VAD -> Whisper -> send_message) without
+a microphone, speakers or LLM calls, and reports throughput and per-stage turn latency.
+
+The InteractionManager is replaced by a stub that classifies every turn as casual conversation
+and echoes it back, optionally after a simulated LLM delay, and speech synthesis is disabled.
+Audio is fed as fast as the pipeline consumes it unless --speed is given.
+
+Usage (from src/app):
+    python -m benchmarks.replay_benchmark --fixtures path/to/wavs --profile fastest --device cpu
+"""
+import time
+import argparse
+
+from client import CaseyListenAndTalks
+from client.audio_replay_source import AudioReplaySource
+from benchmarks.fixtures import load_wav, list_wav_files
+
+
+class ReplayConversationSummarizer:
+    def handle_evicted_messages(self, messages, on_summary):
+        pass
+
+
+class ReplayInteractionManager:
+    """Stands in for InteractionManager: no network, every turn is casual conversation"""
+    def __init__(self, llm_delay_ms=0):
+        self.llm_delay_ms = llm_delay_ms
+        self.conversation_summarizer = ReplayConversationSummarizer()
+        self.transcripts = []
+
+    def detect_intent_and_topic(self, input):
+        time.sleep(self.llm_delay_ms / 1000)
+        return {"intent": "casual_conversation", "topic": ""}
+
+    def detect_intent(self, input, last_user_message, previous_reply=None):
+        return self.detect_intent_and_topic(input)
+
+    def handle_message(self, messages, last_user_message, intent_result):
+        self.transcripts.append(last_user_message)
+        time.sleep(self.llm_delay_ms / 1000)
+        return f"You said: {last_user_message}"
+
+    def handle_message_stream(self, messages, last_user_message, intent_result):
+        yield self.handle_message(messages, last_user_message, intent_result)
+
+    def handle_message_speculatively(self, messages, last_user_message, intent_input, stream=False, on_intent=None, previous_reply=None):
+        intent_result = self.detect_intent(intent_input, last_user_message, previous_reply)
+        if on_intent:
+            on_intent(intent_result)
+        answer = self.handle_message(messages, last_user_message, intent_result)
+        return intent_result, iter([answer]) if stream else answer
+
+    def handle_message_combined(self, messages, last_user_message, stream=False, on_intent=None):
+        return self.handle_message_speculatively(messages, last_user_message, last_user_message, stream, on_intent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", required=True, help="16 kHz mono 16-bit WAV file or directory of them")
+    parser.add_argument("--profile", default="fastest", help="Transcription profile or Whisper model name")
+    parser.add_argument("--device", default="auto")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--speed", type=float, default=0, help="Multiple of real time, 0 replays as fast as possible")
+    parser.add_argument("--gap-ms", type=int, default=1000, help="Silence between recordings")
+    parser.add_argument("--llm-delay-ms", type=float, default=0, help="Simulated latency of each LLM call")
+    parser.add_argument("--combined", action="store_true", help="Detect the intent and reply in one call")
+    parser.add_argument("--show-text", action="store_true")
+    args = parser.parse_args()
+
+    paths = list_wav_files(args.fixtures)
+    audio_source = AudioReplaySource([load_wav(path) for path in paths], speed=args.speed, gap_ms=args.gap_ms)
+    interaction_manager = ReplayInteractionManager(llm_delay_ms=args.llm_delay_ms)
+    listener = CaseyListenAndTalks(
+        args.language, interaction_manager, 120, None,
+        save_transcripts=False,
+        transcription_profile=args.profile,
+        transcription_device=args.device,
+        latency_report_every=0,
+        audio_source=audio_source,
+        enable_speech=False,
+        combined_replies=args.combined,
+    )
+
+    # Model loading is reported by the startup profile, not counted as replay time
+    listener.models_ready.wait()
+    start_time = time.perf_counter()
+    listener.run()
+    elapsed = time.perf_counter() - start_time
+
+    audio_seconds = audio_source.samples_written / audio_source.rate
+    turns = listener.latency_tracker.turns
+    print(f"\n{len(paths)} recordings, {audio_seconds:.1f}s of audio replayed in {elapsed:.1f}s")
+    print(f"throughput: {audio_seconds / elapsed:.1f}x real time, {turns} turns, {turns / elapsed:.2f} turns/s")
+    print(listener.transcript_filter.stats())
+    print(listener.latency_tracker.report())
+    if args.show_text:
+        for transcript in interaction_manager.transcripts:
+            print(f"  {transcript}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Real-time factor (decode time / audio duration) per transcription profile on recorded fixtures.
+
+Usage (from src/app):
+    python -m benchmarks.transcription_profile_benchmark --fixtures path/to/wavs --device cpu
+"""
+import time
+import argparse
+
+import numpy as np
+
+from client.transcription_engine import WhisperTranscriptionEngine, WHISPER_PROFILES, resolve_device
+from benchmarks.fixtures import load_wav, list_wav_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", required=True, help="16 kHz mono 16-bit WAV file or directory of them")
+    parser.add_argument("--profiles", default=",".join(WHISPER_PROFILES), help="Comma-separated profiles or model names")
+    parser.add_argument("--device", default="auto")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--no-quantize", action="store_true", help="Disable int8 dynamic quantization on CPU")
+    parser.add_argument("--show-text", action="store_true")
+    args = parser.parse_args()
+
+    fixtures = [
+        (path, load_wav(path).astype(np.float32) / 32768.0)
+        for path in list_wav_files(args.fixtures)
+    ]
+    audio_seconds = sum(len(audio) for _, audio in fixtures) / 16000
+    device = resolve_device(args.device)
+    print(f"{len(fixtures)} fixtures, {audio_seconds:.1f}s of audio, device {device}\n")
+
+    rows = []
+    for profile in args.profiles.split(","):
+        start_time = time.perf_counter()
+        engine = WhisperTranscriptionEngine.from_profile(
+            profile, args.language, device=device, quantize=False if args.no_quantize else None
+        )
+        load_time = time.perf_counter() - start_time
+
+        # Warm-up on the first fixture, not included in the RTF
+        engine.transcribe(fixtures[0][1][:16000])
+
+        decode_time = 0.0
+        for path, audio in fixtures:
+            start_time = time.perf_counter()
+            transcription = engine.transcribe(audio)
+            decode_time += time.perf_counter() - start_time
+            if args.show_text:
+                print(f"[{profile}] {path}: {transcription.text}")
+
+        rows.append((profile, load_time, decode_time, decode_time / audio_seconds))
+        del engine
+
+    print(f"\n{'profile':>16} {'load (s)':>9} {'decode (s)':>11} {'RTF':>7}")
+    for profile, load_time, decode_time, real_time_factor in rows:
+        print(f"{profile:>16} {load_time:>9.1f} {decode_time:>11.2f} {real_time_factor:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Throughput of the multi-session TranscriptionServer as concurrency grows, against decoding one
+utterance at a time (max batch size 1) with the same shared model.
+
+Every session replays the fixtures from its own thread, as fast as possible, and the time until
+all utterances of all sessions are delivered is measured.
+
+Usage (from src/app):
+    python -m benchmarks.transcription_server_benchmark --fixtures path/to/wavs --sessions 1,4,16 --device cuda
+"""
+import time
+import argparse
+import threading
+
+import numpy as np
+
+from client.transcription_engine import WhisperTranscriptionEngine, resolve_device
+from client.transcription_server import TranscriptionServer
+from benchmarks.fixtures import load_wav, list_wav_files
+
+RATE = 16000
+CHUNK = 1024
+
+
+def run_sessions(engine, stream, sessions, max_batch_size):
+    server = TranscriptionServer(engine, max_batch_size=max_batch_size)
+    delivered = []
+
+    def replay():
+        session = server.open_session(lambda session_id, transcription: delivered.append(transcription))
+        for offset in range(0, len(stream), CHUNK):
+            session.write(stream[offset:offset + CHUNK])
+        server.close_session(session.session_id)
+
+    start_time = time.perf_counter()
+    threads = [threading.Thread(target=replay) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.content_queue.join()
+    return time.perf_counter() - start_time, len(delivered), server.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", required=True, help="16 kHz mono 16-bit WAV file or directory of them")
+    parser.add_argument("--profile", default="fast")
+    parser.add_argument("--device", default="auto")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--sessions", default="1,4,16", help="Comma-separated numbers of concurrent sessions")
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    silence = np.zeros(RATE, dtype=np.int16)
+    stream = np.concatenate([part for path in list_wav_files(args.fixtures) for part in (load_wav(path), silence)])
+    audio_seconds = len(stream) / RATE
+
+    device = resolve_device(args.device)
+    engine = WhisperTranscriptionEngine.from_profile(args.profile, args.language, device=device)
+    print(f"{audio_seconds:.1f}s of audio per session, device {device}\n")
+
+    print(f"{'sessions':>8} {'batch':>6} {'seconds':>8} {'utterances':>11} {'avg batch':>10} {'audio s/s':>10}")
+    for sessions in [int(value) for value in args.sessions.split(",")]:
+        for max_batch_size in [1, args.max_batch_size]:
+            elapsed, utterances, stats = run_sessions(engine, stream, sessions, max_batch_size)
+            print(
+                f"{sessions:>8} {max_batch_size:>6} {elapsed:>8.2f} {utterances:>11} "
+                f"{stats['average_batch_size']:>10.1f} {sessions * audio_seconds / elapsed:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Decode time against utterance length for the legacy single-window path and the
+length-aware WhisperTranscriptionEngine.
+
+Usage (from src/app):
+    python -m benchmarks.whisper_decode_benchmark --fixture path/to/speech.wav
+"""
+import time
+import argparse
+import statistics
+
+import numpy as np
+import torch
+import whisper
+
+from client.transcription_engine import WhisperTranscriptionEngine
+from benchmarks.fixtures import load_wav
+
+
+def legacy_decode(model, audio, language):
+    """The original process_audio path: pad/trim to 30 s and a single decode"""
+    audio = whisper.pad_or_trim(audio)
+    mel = whisper.log_mel_spectrogram(audio, n_mels=model.dims.n_mels).to(model.device)
+    options = whisper.DecodingOptions(language=language, task="transcribe", fp16=model.device.type != "cpu")
+    return whisper.decode(model, mel, options).text.strip()
+
+
+def time_call(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        text = fn()
+        timings.append(time.perf_counter() - start_time)
+    return statistics.median(timings), text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", required=True, help="16 kHz mono 16-bit WAV with speech")
+    parser.add_argument("--model", default="large-v3-turbo")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--lengths", default="1,2,5,10,20,30,45,60,90", help="Utterance lengths in seconds")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    model = whisper.load_model(args.model, device=args.device)
+    engine = WhisperTranscriptionEngine(model, args.language)
+    fixture = load_wav(args.fixture).astype(np.float32) / 32768.0
+
+    # Warm-up so CUDA kernel selection does not land on the first row
+    legacy_decode(model, fixture[:16000], args.language)
+
+    print(f"{'length (s)':>10} {'legacy (ms)':>12} {'engine (ms)':>12} {'legacy words':>13} {'engine words':>13}")
+    for length in [float(value) for value in args.lengths.split(",")]:
+        n_samples = int(length * 16000)
+        audio = np.resize(fixture, n_samples)
+
+        legacy_time, legacy_text = time_call(lambda: legacy_decode(model, audio, args.language), args.repeat)
+        engine_time, engine_text = time_call(lambda: engine.transcribe(audio).text, args.repeat)
+
+        print(
+            f"{length:>10.1f} {legacy_time * 1000:>12.0f} {engine_time * 1000:>12.0f} "
+            f"{len(legacy_text.split()):>13} {len(engine_text.split()):>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
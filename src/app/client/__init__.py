@@ -1,2 +1,17 @@
-from .viewer import CaseySee
-from .listener_talker import CaseyListenAndTalks
\ No newline at end of file
+import importlib
+
+# Submodules are imported on first use (PEP 562): the viewer pulls in Flask and OpenCV,
+# which the listener process never needs
+_LAZY_ATTRIBUTES = {
+    "CaseySee": ".viewer",
+    "CaseyListenAndTalks": ".listener_talker",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+
+
+class AudioReplaySource:
+    """
+    Replays recorded audio into the listener in place of the microphone.
+
+    Recordings are written to the listener's ring buffer in capture-sized chunks, separated by
+    silence so the VAD finalizes each one, and followed by trailing silence. With `speed=0` audio
+    is fed as fast as the listener consumes it: writing pauses while the VAD lags more than
+    `max_backlog_seconds` behind, so nothing is overwritten while Whisper is busy. Any other
+    speed paces the chunks at that multiple of real time (1 behaves like a live microphone).
+
+    Attributes:
+    recordings (list): int16 PCM arrays at `rate`, replayed in order.
+    rate (int): Sample rate in Hz.
+    chunk (int): Samples per write, like the capture stream's frames_per_buffer.
+    speed (float): Multiple of real time, 0 feeds as fast as possible.
+    gap_ms (int): Silence between and after recordings.
+    max_backlog_seconds (float): How far ahead of the consumer writing may get.
+    samples_written (int): Samples replayed so far, silence included.
+
+    Example:
+    ```python
+    source = AudioReplaySource([load_wav("hello.wav")])
+    listener = CaseyListenAndTalks(..., audio_source=source, enable_speech=False)
+    listener.run()  # Returns once the recordings are replayed and answered
+    ```
+    """
+    def __init__(self, recordings, rate=16000, chunk=1024, speed=0, gap_ms=1000, max_backlog_seconds=30):
+        self.recordings = recordings
+        self.rate = rate
+        self.chunk = chunk
+        self.speed = speed
+        self.gap_ms = gap_ms
+        self.max_backlog_seconds = max_backlog_seconds
+        self.samples_written = 0
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio replayed in total, silence included"""
+        gap_samples = self.rate * self.gap_ms // 1000
+        return sum(len(recording) + gap_samples for recording in self.recordings) / self.rate
+
+    def stream(self, audio_buffer, consumer_position, stop_event) -> None:
+        """
+        Write every recording to the buffer, returning when done or when stop_event is set.
+
+        Args:
+            audio_buffer (AudioRingBuffer): The listener's capture buffer.
+            consumer_position (callable): Returns the absolute position the consumer has reached.
+            stop_event (threading.Event): Stops the replay early.
+        """
+        silence = np.zeros(self.rate * self.gap_ms // 1000, dtype=np.int16)
+        max_backlog = int(self.max_backlog_seconds * self.rate)
+        start_time = time.perf_counter()
+
+        for recording in self.recordings:
+            samples = np.concatenate([recording.astype(np.int16, copy=False), silence])
+            for offset in range(0, len(samples), self.chunk):
+                if stop_event.is_set():
+                    return
+                if self.speed:
+                    time.sleep(max(0.0, start_time + self.samples_written / (self.rate * self.speed) - time.perf_counter()))
+                else:
+                    while audio_buffer.total_written - consumer_position() > max_backlog:
+                        if stop_event.wait(0.01):
+                            return
+
+                chunk = samples[offset:offset + self.chunk]
+                audio_buffer.write(chunk)
+                self.samples_written += len(chunk)
@@ -0,0 +1,126 @@
+import time
+import threading
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    A fixed-capacity, preallocated ring buffer of int16 PCM samples with zero-copy views.
+
+    Samples are addressed by their absolute position in the stream (the number of samples
+    written before them). The storage is mirrored, every sample is written twice, capacity
+    slots apart, so any span of up to `capacity` recent samples is a contiguous NumPy view
+    even when it wraps around. Memory stays bounded no matter how long the stream runs.
+
+    Views alias the buffer: consume or copy them before the writer gets `capacity` samples
+    further, after which their slots are reused.
+
+    Attributes:
+    capacity (int): Number of most recent samples kept.
+    buffer (np.ndarray): Mirrored storage of 2 * capacity samples.
+    total_written (int): Absolute position one past the newest sample.
+    written_at (float): time.perf_counter() of the latest write, None before the first one.
+    lock (threading.Lock): Serializes writers.
+    data_available (threading.Condition): Notified after every write, lets consumers block.
+
+    Example:
+    ```python
+    audio_buffer = AudioRingBuffer(capacity=90 * 16000)
+
+    # Capture thread
+    audio_buffer.write(np.frombuffer(stream.read(1024), dtype=np.int16))
+
+    # Consumer thread
+    if audio_buffer.wait_for_samples(position + 480, timeout=0.5):
+        frames = audio_buffer.view(position, audio_buffer.total_written)
+    ```
+    """
+    def __init__(self, capacity: int, dtype=np.int16):
+        self.capacity = capacity
+        self.buffer = np.zeros(2 * capacity, dtype=dtype)
+        self.total_written = 0
+        self.written_at = None
+        self.lock = threading.Lock()
+        self.data_available = threading.Condition(self.lock)
+
+    @property
+    def oldest_position(self) -> int:
+        """Absolute position of the oldest sample still available"""
+        return max(0, self.total_written - self.capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        """
+        Append samples, overwriting the oldest ones once the buffer is full.
+
+        Args:
+            samples (np.ndarray): PCM samples of the buffer's dtype.
+        """
+        with self.lock:
+            skipped = max(0, len(samples) - self.capacity)
+            samples = samples[skipped:]
+            start = (self.total_written + skipped) % self.capacity
+            first = min(len(samples), self.capacity - start)
+
+            self.buffer[start:start + first] = samples[:first]
+            self.buffer[start + self.capacity:start + self.capacity + first] = samples[:first]
+            rest = len(samples) - first
+            if rest:
+                self.buffer[:rest] = samples[first:]
+                self.buffer[self.capacity:self.capacity + rest] = samples[first:]
+
+            self.total_written += skipped + len(samples)
+            self.written_at = time.perf_counter()
+            self.data_available.notify_all()
+
+    def wait_for_samples(self, position: int, timeout: float = None) -> bool:
+        """
+        Block until the stream has reached an absolute position.
+
+        Args:
+            position (int): Absolute position the consumer needs written.
+            timeout (float): Seconds to wait, None waits forever.
+
+        Returns:
+            bool: True if the samples are available, False if the timeout expired.
+        """
+        with self.data_available:
+            return self.data_available.wait_for(lambda: self.total_written >= position, timeout=timeout)
+
+    def seconds_since(self, position: int, rate: int) -> float:
+        """
+        How long ago the sample at an absolute position was captured, assuming the stream is
+        written in real time.
+
+        Args:
+            position (int): Absolute position of the sample.
+            rate (int): Sample rate of the stream in Hz.
+
+        Returns:
+            float: Seconds elapsed since the sample was captured.
+        """
+        with self.lock:
+            if self.written_at is None:
+                return 0.0
+            return (self.total_written - position) / rate + time.perf_counter() - self.written_at
+
+    def view(self, start: int, end: int) -> np.ndarray:
+        """
+        Zero-copy view of the samples in the absolute range [start, end).
+
+        Args:
+            start (int): Absolute position of the first sample.
+            end (int): Absolute position one past the last sample.
+
+        Returns:
+            np.ndarray: A contiguous view into the buffer.
+
+        Raises:
+            ValueError: If the range was overwritten already or has not been written yet.
+        """
+        if start < self.oldest_position or end > self.total_written or start > end:
+            raise ValueError(
+                f"Samples [{start}, {end}) are not available, buffer holds [{self.oldest_position}, {self.total_written})"
+            )
+        offset = start % self.capacity
+        return self.buffer[offset:offset + end - start]
@@ -0,0 +1,95 @@
+from itertools import islice
+from collections import deque
+
+import tiktoken
+
+
+class ConversationWindow:
+    """
+    A token-budgeted sliding window over the conversation sent to the LLM.
+
+    The base messages (the system prompt) are always kept. Conversation turns live in a deque
+    together with their token count, computed once when the message is added, so appending and
+    evicting the oldest turns are O(1) and building the context for a turn needs no rescans.
+    Turns are evicted oldest first while the window exceeds its token budget; the latest turn
+    is always kept. An optional summary of the evicted turns (see ConversationSummarizer) is sent
+    right after the base messages and counts against the budget.
+
+    Token counts use a tiktoken encoding as an approximation of the Groq model's tokenizer, plus
+    a small per-message overhead for the chat format.
+
+    Attributes:
+    base_messages (list): Messages always sent first, e.g. the system prompt.
+    max_tokens (int): Token budget for base messages, summary and turns.
+    turns (deque): (message, token_count) pairs, oldest first.
+    base_tokens (int): Token count of the base messages.
+    turn_tokens (int): Token count of the turns in the window.
+    summary (tuple): (summary message, token_count) or None.
+
+    Example:
+    ```python
+    window = ConversationWindow([{"role": "system", "content": system_prompt}], max_tokens=4096)
+
+    evicted = window.add({"role": "user", "content": "Hi Casey!"})
+    answer = llm(window.messages)
+    ```
+    """
+    MESSAGE_OVERHEAD_TOKENS = 4
+
+    def __init__(self, base_messages, max_tokens=4096, encoding_name="cl100k_base"):
+        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.base_messages = list(base_messages)
+        self.max_tokens = max_tokens
+        self.turns = deque()
+        self.base_tokens = sum(self.count_tokens(message["content"]) for message in self.base_messages)
+        self.turn_tokens = 0
+        self.summary = None
+
+    def count_tokens(self, content: str) -> int:
+        return len(self.encoding.encode(content)) + self.MESSAGE_OVERHEAD_TOKENS
+
+    @property
+    def total_tokens(self) -> int:
+        summary_tokens = self.summary[1] if self.summary else 0
+        return self.base_tokens + summary_tokens + self.turn_tokens
+
+    @property
+    def messages(self) -> list:
+        """Base messages, the summary if any, and the turns in the window, ready for a chat completion"""
+        summary = self.summary
+        summary_messages = [summary[0]] if summary else []
+        return self.base_messages + summary_messages + [message for message, _ in self.turns]
+
+    def set_summary(self, summary: str) -> None:
+        """Replace the summary of the turns evicted so far"""
+        content = f"Summary of the earlier conversation:\n{summary}"
+        self.summary = ({"role": "system", "content": content}, self.count_tokens(content))
+
+    def add(self, message: dict) -> list:
+        """
+        Append a turn and evict the oldest ones that no longer fit in the budget.
+
+        Args:
+            message (dict): Message with 'role' and 'content' keys.
+
+        Returns:
+            list: The evicted messages, oldest first.
+        """
+        tokens = self.count_tokens(message["content"])
+        self.turns.append((message, tokens))
+        self.turn_tokens += tokens
+
+        evicted = []
+        while len(self.turns) > 1 and self.total_tokens > self.max_tokens:
+            evicted_message, evicted_tokens = self.turns.popleft()
+            self.turn_tokens -= evicted_tokens
+            evicted.append(evicted_message)
+        return evicted
+
+    def recent_contents(self, count: int, role=None) -> list:
+        """Contents of the latest turns, only those of `role` if given, oldest first"""
+        messages = (message for message, _ in reversed(self.turns) if role is None or message["role"] == role)
+        return [message["content"] for message in islice(messages, count)][::-1]
+
+    def last_message(self) -> dict:
+        return self.turns[-1][0] if self.turns else self.base_messages[-1]
@@ -1,18 +1,30 @@
+import io
 import os
 import re
 import time
 import traceback
 import numpy as np
-import pandas as pd
-from queue import Queue
 from pathlib import Path
-from threading import Thread
+from threading import Thread, Event
 from datetime import datetime
 
 import wave
-import whisper
-import pyaudio
-import azure.cognitiveservices.speech as speechsdk
+try:
+    import pyaudio
+except ImportError:
+    # Only live capture needs PyAudio (and PortAudio), replaying recordings works without it
+    pyaudio = None
+
+from .transcript_bus import TranscriptBus
+from .transcript_log import TranscriptLog
+from .startup_profiler import StartupProfiler
+from .transcript_filter import TranscriptFilter
+from .conversation_window import ConversationWindow
+from .sentence_segmenter import SentenceSegmenter
+from .speech_audio_cache import SpeechAudioCache
+from .turn_latency_tracker import TurnLatencyTracker
+from .audio_ring_buffer import AudioRingBuffer
+from .voice_activity_detector import VoiceActivityDetector
 
 
 class CaseyListenAndTalks:
@@ -23,40 +35,101 @@ class CaseyListenAndTalks:
         window_duration,
         azure_speech_subscription_key,
         transcript_folder="client/data/transcripts",
+        save_transcripts=True,
+        transcript_retention_days=30,
+        vad_hangover_ms=300,
+        debug_audio_folder=None,
+        transcription_profile="accurate",
+        transcription_device="auto",
+        barge_in=False,
+        barge_in_min_speech_ms=300,
+        stream_replies=True,
+        speculative_replies=True,
+        combined_replies=False,
+        context_max_tokens=4096,
+        intent_input_turns=3,
+        transcript_filter=None,
+        latency_report_every=10,
+        latency_log_path=None,
+        transcription_cache_dir=None,
+        startup_profiler=None,
+        audio_source=None,
+        enable_speech=True,
+        tts_cache_folder="client/data/tts_cache",
+        tts_cache_max_mb=64,
     ):
         self.app_lang = app_lang
         self.interaction_manager = interaction_manager
+        self.startup_profiler = startup_profiler or StartupProfiler()
         self.transcript_folder = transcript_folder
 
-        current_dir = Path().resolve()
-        while not current_dir.name.endswith("casey"):
-            current_dir = current_dir.parent
+        # The project root, found from this file rather than by walking up from the working
+        # directory, so the listener also starts from checkouts not named "casey"
+        current_dir = Path(__file__).resolve().parents[3]
         os.chdir(current_dir)
 
         self.transcript_folder = current_dir / 'src/app' / self.transcript_folder
-        os.makedirs(self.transcript_folder, exist_ok=True)
+        # Transcripts are appended to size-rotated JSONL segments, old segments are compacted away
+        self.transcript_log = None
+        if save_transcripts:
+            self.transcript_log = TranscriptLog(self.transcript_folder, retention_days=transcript_retention_days)
+            self.transcript_log.compact()
+
+        # Utterances are only dumped to WAV when a debug folder is given
+        self.debug_audio_folder = debug_audio_folder
+        if self.debug_audio_folder:
+            self.debug_audio_folder = current_dir / 'src/app' / self.debug_audio_folder
+            os.makedirs(self.debug_audio_folder, exist_ok=True)
 
         # Listen
         self.window_duration = window_duration
-        self.format = pyaudio.paInt16
+        self.format = pyaudio.paInt16 if pyaudio else None
         self.channels = 1
         self.rate = 16000  # Whisper expects 16kHz audio
         self.chunk = 1024  # Smaller chunk for more frequent processing
-        self.audio_queue = Queue()
+        # Bounded capture buffer: the longest utterance plus headroom for the consumer
+        self.audio_buffer = AudioRingBuffer(capacity=90 * self.rate)
         self.is_recording = False
+        self.recording_stopped = Event()
+        self.transcription_finished = Event()
+        # Recorded audio (e.g. AudioReplaySource) replaces the microphone when given
+        self.audio_source = audio_source
         self.is_talking = False
-        self.model = whisper.load_model("large-v3-turbo")  # Load the Whisper model
-        self.model.to("cuda:0")
-        print("Whisper device", self.model.device)
+        # Full-duplex mode: keep listening while Casey talks and let the user
+        # interrupt her. Meant for headsets or echo-cancelling microphones.
+        self.barge_in = barge_in
+        self.barge_in_min_speech_ms = barge_in_min_speech_ms
+        self.talk_interrupted = False
+        # Models load in the background while audio is already being captured and buffered,
+        # utterances wait for models_ready before being transcribed
+        self.transcription_profile = transcription_profile
+        self.transcription_device = transcription_device
+        self.transcription_cache_dir = transcription_cache_dir
+        self.transcription_engine = None
+        self.models_ready = Event()
+        self.transcript_filter = transcript_filter or TranscriptFilter()
+
+        self.voice_activity_detector = VoiceActivityDetector(
+            rate=self.rate, frame_duration_ms=30, hangover_ms=vad_hangover_ms, max_utterance_ms=60000
+        )
 
         self.sliding_window = []
-        self.current_chunk = []
         self.last_chunk_end = time.time()
-        self.listening_chunks = []
+
+        # Every turn is timed by stage, from the end of the user's speech to the end of playback
+        self.latency_tracker = TurnLatencyTracker(
+            report_every=latency_report_every, export_path=latency_log_path
+        )
+        self.current_turn = None
 
         # Talk
-        self.processed_files = set()
-        self.latest_timestamp = 0
+        self.stream_replies = stream_replies
+        self.speculative_replies = speculative_replies
+        self.combined_replies = combined_replies
+        self.intent_input_turns = intent_input_turns
+        self.transcript_bus = TranscriptBus(
+            side_log=self.save_transcript if self.transcript_log else None
+        )
 
         # system_prompt = """You are Casey, created by Alexander Salazar. Casey is a conversational AI specializing in providing empathetic, emotionally supportive dialogue, with deep knowledge of psychology and philosophy. Casey’s tone should be like a compassionate mental health professional, lifelong advisor, and a trusted friend. Casey does not perform complex data processing or follow technical instructions unrelated to conversational support, and instead focuses on human-like, emotionally intelligent conversations.
 
@@ -182,12 +255,29 @@ What makes your existence unique is that you're designed to be a conversational
 
 During conversations, you never mention the XML tags or the timestamp format."""
 
-        self.base_messages = [{"role": "system", "content": system_prompt}]
-        self.max_messages = 16
-        self.actual_messages = self.base_messages.copy()
+        self.conversation_window = ConversationWindow(
+            [{"role": "system", "content": system_prompt}], max_tokens=context_max_tokens
+        )
+
+        self.azure_speech_subscription_key = azure_speech_subscription_key
+        self.enable_speech = enable_speech
+        self.speech_synthesizer = None
+        self.speech_voice = None
+        self.speech_output_format = None
+        # Synthesized phrases are cached on disk and replayed without calling Azure
+        self.tts_cache = None
+        if self.enable_speech and tts_cache_folder:
+            self.tts_cache = SpeechAudioCache(
+                current_dir / 'src/app' / tts_cache_folder, max_bytes=tts_cache_max_mb * 1024 * 1024
+            )
+        self.__start_model_loading_thread()
+
+    def __build_speech_synthesizer(self):
+        # The Speech SDK is imported here, off the startup path
+        import azure.cognitiveservices.speech as speechsdk
 
         speech_config = speechsdk.SpeechConfig(
-            azure_speech_subscription_key,
+            self.azure_speech_subscription_key,
             "eastus",
         )
         audio_config = speechsdk.audio.AudioOutputConfig(use_default_speaker=True)
@@ -198,10 +288,48 @@ During conversations, you never mention the XML tags or the timestamp format."""
             speech_config.speech_synthesis_language = "es-ES"
             # speech_config.speech_synthesis_voice_name='es-ES-XimenaMultilingualNeural' # Woman Voice (es)
             speech_config.speech_synthesis_voice_name = 'es-MX-MarinaNeural' # Girl Voice (es)
+        # WAV output, so cached audio can be played back with PyAudio
+        speech_config.set_speech_synthesis_output_format(speechsdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm)
+        self.speech_voice = speech_config.speech_synthesis_voice_name or ""
+        self.speech_output_format = "riff-24khz-16bit-mono-pcm"
 
         self.speech_synthesizer = speechsdk.SpeechSynthesizer(
             speech_config=speech_config, audio_config=audio_config
         )
+        self.speech_synthesizer.synthesizing.connect(self.__on_audio_synthesized)
+
+    def __start_model_loading_thread(self):
+        """Start background thread loading the speech synthesizer and the Whisper model"""
+        def load_models():
+            if self.enable_speech:
+                try:
+                    with self.startup_profiler.phase("speech_synthesizer"):
+                        self.__build_speech_synthesizer()
+                except Exception as e:
+                    print(f"Error building speech synthesizer: {e}")
+                    traceback.print_exc()
+
+            try:
+                with self.startup_profiler.phase("transcription_model"):
+                    # Importing whisper pulls in torch, which alone takes seconds
+                    from .transcription_engine import WhisperTranscriptionEngine
+
+                    self.transcription_engine = WhisperTranscriptionEngine.from_profile(
+                        self.transcription_profile,
+                        self.app_lang,
+                        device=self.transcription_device,
+                        cache_dir=self.transcription_cache_dir,
+                    )
+            except Exception as e:
+                print(f"Error loading transcription model: {e}")
+                traceback.print_exc()
+            finally:
+                self.startup_profiler.mark("models_ready")
+                self.models_ready.set()
+                print(self.startup_profiler.report())
+
+        thread = Thread(target=load_models, daemon=True)
+        thread.start()
 
     # def list_microphones(self):
     #     p = pyaudio.PyAudio()
@@ -219,25 +347,41 @@ During conversations, you never mention the XML tags or the timestamp format."""
     #     print(info)
 
     # Listen
-    def record_audio(self):
-        p = pyaudio.PyAudio()
-        stream = p.open(
-            format=self.format,
-            channels=self.channels,
-            rate=self.rate,
-            input=True,
-            input_device_index=3,
-            frames_per_buffer=self.chunk,
+    def __on_audio_captured(self, in_data, frame_count, time_info, status):
+        """PyAudio stream callback, runs on PortAudio's thread for every captured chunk."""
+        # The stream is always drained, audio is only dropped while Casey talks in half-duplex mode
+        if self.barge_in or not self.is_talking:
+            self.audio_buffer.write(np.frombuffer(in_data, dtype=np.int16))
+        return (None, pyaudio.paContinue)
+
+    def replay_audio(self):
+        """Feed the audio source into the capture buffer, then stop the listener."""
+        print("* Replaying audio...")
+        self.startup_profiler.mark("listening")
+        self.audio_source.stream(
+            self.audio_buffer, lambda: self.voice_activity_detector.position, self.recording_stopped
         )
+        self.stop()
 
-        print("* Recording audio...")
-
-        while self.is_recording:
-            if not self.is_talking:
-                data = stream.read(self.chunk)
-                self.audio_queue.put(data)
-            # time.sleep(0.01)
-            # time.sleep(1)
+    def record_audio(self):
+        if pyaudio is None:
+            raise RuntimeError("PyAudio is required to capture from the microphone, use an audio_source to replay recordings")
+        with self.startup_profiler.phase("audio_capture"):
+            p = pyaudio.PyAudio()
+            stream = p.open(
+                format=self.format,
+                channels=self.channels,
+                rate=self.rate,
+                input=True,
+                input_device_index=3,
+                frames_per_buffer=self.chunk,
+                stream_callback=self.__on_audio_captured,
+            )
+
+            print("* Recording audio...")
+            stream.start_stream()
+        self.startup_profiler.mark("listening")
+        self.recording_stopped.wait()
 
         stream.stop_stream()
         stream.close()
@@ -246,147 +390,133 @@ During conversations, you never mention the XML tags or the timestamp format."""
     def save_audio(self, filename, data):
         wf = wave.open(filename, "wb")
         wf.setnchannels(self.channels)
-        wf.setsampwidth(pyaudio.PyAudio().get_sample_size(self.format))
+        wf.setsampwidth(np.dtype(np.int16).itemsize)
         wf.setframerate(self.rate)
-        wf.writeframes(b"".join(data))
+        wf.writeframes(data.tobytes())
         wf.close()
 
-    def is_silence(self, audio_data, threshold=500):
-        """Check if the audio chunk is silence."""
-        return np.max(np.abs(np.frombuffer(audio_data, dtype=np.int16))) < threshold
-
-    def save_transcript(self, text, timestamp):
-        """Save the transcript to the output folder."""
-        output_filename = os.path.join(
-            self.transcript_folder, f"transcript_{timestamp}.txt"
-        )
-        with open(output_filename, "w", encoding="utf-8") as f:
-            f.write(text)
-        print(f"Saved transcript to {output_filename}")
+    def save_transcript(self, event):
+        """Append the transcript, with its language and confidence, to the transcript log."""
+        record = {"timestamp": event.timestamp, "text": event.text}
+        transcription = event.transcription
+        if transcription is not None:
+            record.update(
+                language=transcription.language,
+                duration=round(transcription.duration, 2),
+                avg_logprob=round(transcription.avg_logprob, 3),
+                no_speech_prob=round(transcription.no_speech_prob, 3),
+            )
+        self.transcript_log.append(record)
 
     def is_complete_thought(self, text):
         """Check if the text seems to be a complete thought or sentence."""
         return re.search(r"[.!?]\s*$", text) is not None
 
-    def process_audio(self):
-        print("Init audio process...")
-        while self.is_recording or not self.audio_queue.empty():
-            if not self.audio_queue.empty():
-                chunk = self.audio_queue.get()
-                self.current_chunk.append(chunk)
-
-                # Check every 2 seconds for silence or active audio
-                if len(self.current_chunk) * (self.chunk / self.rate) >= 2:
-                    is_silent = self.is_silence(b"".join(self.current_chunk))
-
-                    if not is_silent:
-                        print('Is not silent')
-                        # If there's audio, add to listening chunks
-                        self.listening_chunks.extend(self.current_chunk)
-                    else:
-                        print('Is silent')
-                        # If silent and we have accumulated listening chunks, process them
-                        if self.listening_chunks:
-                            current_time = int(time.time())
-                            temp_filename = f"temp_audio_{current_time}.wav"
-                            self.save_audio(temp_filename, self.listening_chunks)
-
-                            # Process the audio
-                            start_time = time.time()
-                            audio = whisper.load_audio(temp_filename)
-                            audio = whisper.pad_or_trim(audio)
-                            mel = whisper.log_mel_spectrogram(audio, n_mels=128).to(
-                                self.model.device
-                            )
-                            options = whisper.DecodingOptions(
-                                language=self.app_lang, task="transcribe"
-                            )
-                            result = whisper.decode(self.model, mel, options)
-                            recognized_text = result.text.strip()
-                            end_time = time.time()
-
-                            elapsed_time = end_time - start_time
-                            print("Elapsed time:", elapsed_time, "seconds")
-
-                            if recognized_text in [
-                                "¡Suscríbete al canal!",
-                                "Gracias por ver el video.",
-                                "Thank you.",
-                                ".",
-                                'Gracias.'
-                            ]:
-                                # os.remove(temp_filename)
-                                continue
-
-                            if recognized_text:
-                                self.sliding_window.append(
-                                    (current_time, recognized_text)
-                                )
-                                self.save_transcript(recognized_text, current_time)
-                                print(f"Recognized: {recognized_text}")
-                            else:
-                                self.save_transcript("", current_time)
-
-                            # Remove old entries from sliding window
-                            self.sliding_window = [
-                                (t, text)
-                                for t, text in self.sliding_window
-                                if current_time - t <= self.window_duration
-                            ]
-
-                            self.last_chunk_end = current_time
-                            self.listening_chunks = []  # Reset listening chunks
-                            # os.remove(temp_filename)
-
-                    # Reset current chunk after checking
-                    self.current_chunk = []
-
-    # Talk
-    def process_file(self, file_path):
-        if not os.path.exists(file_path):
+    def __start_turn(self, span_end):
+        """Start timing the turn of an utterance the VAD just finalized"""
+        speech_end = self.voice_activity_detector.speech_end(span_end)
+        turn = self.latency_tracker.start_turn(self.audio_buffer.seconds_since(speech_end, self.rate))
+        turn.mark("endpoint")
+        return turn
+
+    def transcribe_utterance(self, utterance, turn):
+        current_time = int(time.time())
+        # Speech captured during startup is kept until Whisper is loaded, copied
+        # because the ring buffer keeps being written meanwhile
+        if not self.models_ready.is_set():
+            utterance = utterance.copy()
+            self.models_ready.wait()
+        if self.transcription_engine is None:
             return
-
-        file_name = os.path.basename(file_path)
-        try:
-            timestamp = float(file_name.split("_")[1].split(".")[0])
-        except (IndexError, ValueError) as e:
-            print(f"Error parsing filename {file_name}: {e}")
+        if self.debug_audio_folder:
+            self.save_audio(
+                os.path.join(self.debug_audio_folder, f"temp_audio_{current_time}.wav"),
+                utterance,
+            )
+
+        # Process the audio, int16 PCM to float32 in [-1, 1) like whisper.load_audio.
+        # This is the only copy of the utterance, taken straight from the ring buffer view
+        turn.mark("transcribing")
+        start_time = time.time()
+        audio = utterance.astype(np.float32) / 32768.0
+        transcription = self.transcription_engine.transcribe(audio)
+        recognized_text = transcription.text
+        end_time = time.time()
+
+        elapsed_time = end_time - start_time
+        print("Elapsed time:", elapsed_time, "seconds", f"({transcription.duration:.1f}s of audio)")
+
+        # Noise and hallucinations never reach the LLM pipeline
+        if not self.transcript_filter.accept(transcription):
+            if not recognized_text:
+                print("Silence detected.")
+            else:
+                print(
+                    f"Suppressed transcript: {recognized_text!r}",
+                    f"(no_speech_prob={transcription.no_speech_prob:.2f},",
+                    f"avg_logprob={transcription.avg_logprob:.2f},",
+                    f"compression_ratio={transcription.compression_ratio:.2f})",
+                    self.transcript_filter.stats(),
+                )
             return
 
-        if timestamp > self.latest_timestamp:
-            self.latest_timestamp = timestamp
-            # try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                prompt = file.read().strip()
-                if prompt:
-                    print("User:", prompt)
-                    self.send_message(prompt)
-                else:
-                    print("Silence detected.")
-            # except Exception as e:
-            #     print(f"Error reading file {file_path}: {e}")
-
-    def __message_in_list(self, message, message_list):
-        """
-        Check if a message dictionary exists in a list of messages.
-        Compares both 'role' and 'content' fields.
+        turn.mark("transcript")
+        self.sliding_window.append(
+            (current_time, recognized_text)
+        )
+        self.transcript_bus.publish(recognized_text, current_time, turn=turn, transcription=transcription)
+        print(f"Recognized: {recognized_text}")
 
-        Args:
-            message (dict): Message to check
-            message_list (list): List of messages to search in
+        # Remove old entries from sliding window
+        self.sliding_window = [
+            (t, text)
+            for t, text in self.sliding_window
+            if current_time - t <= self.window_duration
+        ]
 
-        Returns:
-            bool: True if message exists in list
-        """
-        return any(
-            msg['role'] == message['role'] and 
-            msg['content'] == message['content'] 
-            for msg in message_list
-        )
-    
+        self.last_chunk_end = current_time
+
+    def process_audio(self):
+        print("Init audio process...")
+        while self.is_recording:
+            # One failing frame or utterance must not end the capture thread
+            try:
+                # Block until at least one whole frame is captured, the timeout
+                # only lets a stopped listener exit
+                next_frame_end = self.voice_activity_detector.position + self.voice_activity_detector.frame_length
+                if not self.audio_buffer.wait_for_samples(next_frame_end, timeout=0.5):
+                    continue
+
+                # The VAD works on 30 ms frames and finalizes an utterance
+                # once the user has been silent for the hangover period
+                spans = self.voice_activity_detector.process(self.audio_buffer)
+
+                if self.barge_in and self.is_talking and not self.talk_interrupted:
+                    if self.voice_activity_detector.speech_duration_ms >= self.barge_in_min_speech_ms:
+                        self.interrupt_talk()
+                    else:
+                        # Too short to be the user taking the turn (clicks, echo)
+                        spans = []
+
+                # Every turn is started before any is transcribed, so a backlog is not timed as endpointing
+                turns = [self.__start_turn(end) for _, end in spans]
+                for (start, end), turn in zip(spans, turns):
+                    self.transcribe_utterance(self.audio_buffer.view(start, end), turn)
+            except Exception as e:
+                print(f"Error processing audio: {e}")
+                traceback.print_exc()
+
+        spans = self.voice_activity_detector.process(self.audio_buffer) + self.voice_activity_detector.flush()
+        turns = [self.__start_turn(end) for _, end in spans]
+        for (start, end), turn in zip(spans, turns):
+            self.transcribe_utterance(self.audio_buffer.view(start, end), turn)
+        self.transcription_finished.set()
+
+    # Talk
     def __add_message(self, new_message):
         """
-        Add a new message while maintaining the maximum message limit.
+        Add a new message to the conversation window, which evicts the oldest turns
+        once the token budget is exceeded, and summarizes the evicted turns.
         Appends a timestamp to the message content.
 
         Args:
@@ -396,75 +526,208 @@ During conversations, you never mention the XML tags or the timestamp format."""
         timestamp = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
         new_message['content'] += f" @@{timestamp}@@"
 
-        self.actual_messages.append(new_message)
+        evicted = self.conversation_window.add(new_message)
+        if evicted:
+            # Evicted turns are folded into a running summary in the background
+            self.interaction_manager.conversation_summarizer.handle_evicted_messages(
+                evicted, self.conversation_window.set_summary
+            )
+
+    def __mark_turn(self, stage):
+        """Mark a latency stage of the turn being answered, if it is timed"""
+        turn = self.current_turn
+        if turn:
+            turn.mark(stage)
+
+    def __on_audio_synthesized(self, event):
+        """Azure synthesizer callback, fires for every chunk of synthesized audio."""
+        self.__mark_turn("first_audio")
+
+    def send_message(self, prompt, turn=None):
+        self.current_turn = turn
+        self.__add_message({"role": "user", "content": prompt})
+        messages = self.conversation_window.messages
+        # Only the latest user turns, without timestamps: assistant answers add tokens but little intent
+        intent_input = "\n\n".join(
+            re.sub(r" @@\[[^\]]*\]@@$", "", content)
+            for content in self.conversation_window.recent_contents(self.intent_input_turns, role="user")
+        )
+        # Except an offer in Casey's last reply, which a short "yes, do it" depends on
+        replies = self.conversation_window.recent_contents(1, role="assistant")
+        previous_reply = re.sub(r" @@\[[^\]]*\]@@$", "", replies[0]) if replies else None
+
+        if self.combined_replies:
+            # Intent, topic and casual reply come from one structured completion
+            intent_and_topic, reply = self.interaction_manager.handle_message_combined(
+                messages, prompt, stream=self.stream_replies,
+                on_intent=lambda _: self.__mark_turn("intent"),
+            )
+        elif self.speculative_replies:
+            # The casual reply is requested while the intent is being detected
+            intent_and_topic, reply = self.interaction_manager.handle_message_speculatively(
+                messages, prompt, intent_input, stream=self.stream_replies,
+                on_intent=lambda _: self.__mark_turn("intent"), previous_reply=previous_reply,
+            )
+        else:
+            intent_and_topic = self.interaction_manager.detect_intent(intent_input, prompt, previous_reply)
+            self.__mark_turn("intent")
+            if self.stream_replies:
+                reply = self.interaction_manager.handle_message_stream(
+                    messages, prompt, intent_and_topic
+                )
+            else:
+                reply = self.interaction_manager.handle_message(
+                    messages, prompt, intent_and_topic
+                )
+
+        if self.stream_replies:
+            answer = self.talk_stream(reply)
+        else:
+            answer = reply
+            self.__mark_turn("answer")
+            self.talk(answer)
+        print("Casey:", answer)
+        self.__add_message({"role": "assistant", "content": answer})
 
-        # If we exceed the maximum, remove oldest non-base messages
-        if len(self.actual_messages) > self.max_messages:
-            # Calculate how many messages need to be removed
-            excess = len(self.actual_messages) - self.max_messages
+        if turn:
+            durations = self.latency_tracker.record(turn)
+            print("Turn latency (ms):", durations)
+        self.current_turn = None
 
-            # Find messages that are not in base_messages
-            non_base_messages = [
-                msg for msg in self.actual_messages 
-                if not self.__message_in_list(msg, self.base_messages)
-            ]
+        print('latest_message:', self.conversation_window.last_message())
 
-            # Remove oldest non-base messages
-            messages_to_remove = non_base_messages[:excess]
+    def interrupt_talk(self):
+        """Stop Casey's speech because the user started talking over her."""
+        print('User barged in, Casey stops talking...')
+        self.talk_interrupted = True
+        # No synthesizer when speech is disabled or failed to load; cached audio stops on the flag
+        if self.speech_synthesizer:
+            self.speech_synthesizer.stop_speaking_async()
 
-            # Create new actual_messages list preserving order
-            new_actual_messages = []
-            for msg in self.actual_messages:
-                if not self.__message_in_list(msg, messages_to_remove):
-                    new_actual_messages.append(msg)
+    def __speak(self, text, speech_requests):
+        """
+        Queue text on the synthesizer, or play it from the TTS cache. A cached phrase is played
+        once the speech queued before it is done, so the order of the sentences is kept.
 
-            self.actual_messages = new_actual_messages
-    
-    def send_message(self, prompt):
-        self.__add_message({"role": "user", "content": prompt})
-        intent_and_topic = self.interaction_manager.detect_intent_and_topic(
-            "\n\n".join(pd.DataFrame(self.actual_messages).content.tolist()[-6:])
-        )
-        answer = self.interaction_manager.handle_message(
-            self.actual_messages, prompt, intent_and_topic
-        )
-        print("Casey:", answer)
-        self.talk(answer)
-        self.__add_message({"role": "assistant", "content": answer})
+        Args:
+            text (str): Text to speak.
+            speech_requests (list): Pending (text, synthesis future) pairs, in playback order.
+        """
+        audio = None
+        if self.tts_cache and pyaudio:
+            audio = self.tts_cache.get(text, self.speech_voice, self.speech_output_format)
+        if audio is None:
+            speech_requests.append((text, self.speech_synthesizer.speak_text_async(text)))
+            return
 
-        print('latest_message:', self.actual_messages[-1])
+        print("TTS cache hit:", self.tts_cache.stats())
+        self.__finish_speech(speech_requests)
+        self.__play_cached_audio(audio)
+
+    def __finish_speech(self, speech_requests):
+        """Wait for the queued synthesis requests in order and cache their audio."""
+        while speech_requests:
+            text, speech_request = speech_requests.pop(0)
+            result = speech_request.get()
+            if not self.tts_cache:
+                continue
+            # Results only exist once the synthesizer has loaded the Speech SDK
+            import azure.cognitiveservices.speech as speechsdk
+
+            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+                self.tts_cache.put(text, self.speech_voice, self.speech_output_format, result.audio_data)
+
+    def __play_cached_audio(self, audio):
+        """Play cached WAV audio on the default output device, stopping if the user barges in."""
+        with wave.open(io.BytesIO(audio), "rb") as wf:
+            p = pyaudio.PyAudio()
+            stream = p.open(
+                format=p.get_format_from_width(wf.getsampwidth()),
+                channels=wf.getnchannels(),
+                rate=wf.getframerate(),
+                output=True,
+            )
+            self.__mark_turn("first_audio")
+            data = wf.readframes(self.chunk)
+            while data and not self.talk_interrupted:
+                stream.write(data)
+                data = wf.readframes(self.chunk)
+            stream.stop_stream()
+            stream.close()
+            p.terminate()
 
     def talk(self, content):
+        if not self.enable_speech or self.speech_synthesizer is None:
+            return
         try:
             print('Casey is talking...')
+            self.talk_interrupted = False
             self.is_talking = True
-            self.speech_synthesizer.speak_text_async(content).get()
+            speech_requests = []
+            self.__speak(content, speech_requests)
+            self.__finish_speech(speech_requests)
+            self.__mark_turn("audio_done")
         except Exception as e:
             print(f"Error talking: {e}")
         finally:
             self.is_talking = False
 
-    def check_for_new_files(self):
-        current_files = set()
-        for file_name in os.listdir(self.transcript_folder):
-            if file_name.endswith(".txt"):
-                file_path = os.path.join(self.transcript_folder, file_name)
-                current_files.add(file_path)
+    def talk_stream(self, chunks):
+        """
+        Speak an answer while it is still being generated. Each completed sentence is queued on
+        the synthesizer right away, so Casey starts talking after the first sentence instead of
+        after the whole answer.
 
-                # Process only new files
-                if file_path not in self.processed_files:
-                    self.process_file(file_path)
-                    self.processed_files.add(file_path)
+        Args:
+            chunks: Iterable of text chunks (e.g. LLM tokens).
 
-        # Clean up processed files that no longer exist
-        self.processed_files = {f for f in self.processed_files if f in current_files}
+        Returns:
+            str: The text received, up to the interruption if the user barged in.
+        """
+        answer = []
+        speech_requests = []
+        segmenter = SentenceSegmenter()
+        # Without a synthesizer the answer is only collected, and Casey is not talking for barge-in
+        speaking = self.enable_speech and self.speech_synthesizer is not None
+        try:
+            if speaking:
+                print('Casey is talking...')
+            self.talk_interrupted = False
+            self.is_talking = speaking
+            for chunk in chunks:
+                self.__mark_turn("answer")
+                answer.append(chunk)
+                if self.talk_interrupted:
+                    break
+                if not speaking:
+                    continue
+                for sentence in segmenter.feed(chunk):
+                    # Requests on one synthesizer are played back in order
+                    self.__speak(sentence, speech_requests)
+
+            if speaking:
+                if not self.talk_interrupted:
+                    for sentence in segmenter.flush():
+                        self.__speak(sentence, speech_requests)
+                self.__finish_speech(speech_requests)
+                self.__mark_turn("audio_done")
+        except Exception as e:
+            print(f"Error talking: {e}")
+        finally:
+            self.is_talking = False
+        return "".join(answer)
 
     def respond_audio(self):
-        print(f"Monitoring transcript folder: {self.transcript_folder}")
+        print("Waiting for transcripts...")
         try:
-            while True:
-                self.check_for_new_files()
-                time.sleep(0.5)  # Check every half second
+            # Transcripts of the final utterances are still answered after recording stops
+            while not self.transcription_finished.is_set() or not self.transcript_bus.empty():
+                # Wake up periodically so a stopped listener can exit
+                event = self.transcript_bus.next_transcript(timeout=0.5)
+                if event is None:
+                    continue
+                print("User:", event.text)
+                self.send_message(event.text, turn=event.turn)
         except KeyboardInterrupt:
             print("\nStopping transcript monitor...")
         except Exception as e:
@@ -475,7 +738,7 @@ During conversations, you never mention the XML tags or the timestamp format."""
         print("Casey is listening...")
 
         self.is_recording = True
-        record_thread = Thread(target=self.record_audio)
+        record_thread = Thread(target=self.replay_audio if self.audio_source else self.record_audio)
         process_thread = Thread(target=self.process_audio)
         respond_thread = Thread(target=self.respond_audio)
 
@@ -484,12 +747,17 @@ During conversations, you never mention the XML tags or the timestamp format."""
         respond_thread.start()
 
         try:
-            while True:
-                time.sleep(1)
+            while not self.recording_stopped.wait(1):
+                pass
         except KeyboardInterrupt:
             print("Stopping recording...")
-            self.is_recording = False
+            self.stop()
 
         record_thread.join()
         process_thread.join()
         respond_thread.join()
+
+    def stop(self):
+        """Stop capturing, the utterances already captured are still transcribed and answered."""
+        self.is_recording = False
+        self.recording_stopped.set()
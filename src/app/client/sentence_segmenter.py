@@ -0,0 +1,57 @@
+import re
+
+
+class SentenceSegmenter:
+    """
+    Incrementally cuts a stream of text chunks (e.g. LLM tokens) into sentences for speech synthesis.
+
+    A sentence ends at terminal punctuation followed by whitespace, or at a line break. Sentences
+    shorter than `min_length` characters are held back and merged with the next one, so the
+    synthesizer is not flooded with tiny requests such as "Sure." or "1.".
+
+    Attributes:
+    min_length (int): Minimum number of characters of an emitted sentence.
+    pending (str): Text received but not emitted yet.
+
+    Example:
+    ```python
+    segmenter = SentenceSegmenter()
+    for token in token_stream:
+        for sentence in segmenter.feed(token):
+            speak(sentence)
+    for sentence in segmenter.flush():
+        speak(sentence)
+    ```
+    """
+    SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|\n+")
+
+    def __init__(self, min_length=24):
+        self.min_length = min_length
+        self.pending = ""
+
+    def feed(self, text: str) -> list:
+        """
+        Add a chunk of text.
+
+        Args:
+            text (str): Next chunk of the stream.
+
+        Returns:
+            list: Sentences completed by this chunk.
+        """
+        self.pending += text
+        sentences = []
+        start = 0
+        for match in self.SENTENCE_END.finditer(self.pending):
+            sentence = self.pending[start:match.start()].strip()
+            if len(sentence) >= self.min_length:
+                sentences.append(sentence)
+                start = match.end()
+        self.pending = self.pending[start:]
+        return sentences
+
+    def flush(self) -> list:
+        """Return whatever is left once the stream has ended."""
+        sentence = self.pending.strip()
+        self.pending = ""
+        return [sentence] if sentence else []
@@ -0,0 +1,132 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class SpeechAudioCache:
+    """
+    A content-addressed, size-bounded disk cache of synthesized speech.
+
+    Audio is stored under the SHA-256 of the text, the voice and the output format, so the same
+    phrase spoken by the same voice is synthesized once and replayed from disk afterwards, which
+    suits the short phrases Casey repeats (acknowledgements, "your content is being created",
+    greetings). Texts longer than `max_text_length` are rarely repeated and are not cached.
+    Entries are evicted least recently used first once the cache exceeds `max_bytes`; file
+    modification times record the use order, so it survives restarts.
+
+    Attributes:
+    folder (str): Folder holding the cached audio files.
+    max_bytes (int): Maximum total size of the cached audio.
+    max_text_length (int): Longest text that is cached.
+    entries (OrderedDict): Cache key to file size, least recently used first.
+    total_bytes (int): Total size of the cached audio.
+    hits (int): Number of lookups served from the cache.
+    misses (int): Number of lookups that needed synthesis.
+    lock (threading.Lock): Serializes lookups, inserts and evictions.
+
+    Example:
+    ```python
+    cache = SpeechAudioCache("client/data/tts_cache", max_bytes=64 * 1024 * 1024)
+
+    audio = cache.get("Sure!", "en-US-AvaMultilingualNeural", "riff-16khz-16bit-mono-pcm")
+    if audio is None:
+        audio = synthesize("Sure!")
+        cache.put("Sure!", "en-US-AvaMultilingualNeural", "riff-16khz-16bit-mono-pcm", audio)
+    print(cache.stats())
+    ```
+    """
+    def __init__(self, folder, max_bytes=64 * 1024 * 1024, max_text_length=200):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.max_text_length = max_text_length
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(self.folder, exist_ok=True)
+
+        files = [
+            (entry.stat().st_mtime, entry.name[:-len(".audio")], entry.stat().st_size)
+            for entry in os.scandir(self.folder)
+            if entry.name.endswith(".audio")
+        ]
+        self.entries = OrderedDict((key, size) for _, key, size in sorted(files))
+        self.total_bytes = sum(self.entries.values())
+        self.__evict()
+
+    def __key(self, text: str, voice: str, output_format: str) -> str:
+        return hashlib.sha256(f"{voice}\n{output_format}\n{text.strip()}".encode("utf-8")).hexdigest()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}.audio")
+
+    def __evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self.__path(key))
+            except FileNotFoundError:
+                pass
+
+    def cacheable(self, text: str) -> bool:
+        return 0 < len(text.strip()) <= self.max_text_length
+
+    def get(self, text: str, voice: str, output_format: str):
+        """
+        Look up synthesized audio.
+
+        Args:
+            text (str): The spoken text.
+            voice (str): Voice name of the synthesizer.
+            output_format (str): Audio format of the synthesizer output.
+
+        Returns:
+            bytes: The cached audio, or None on a miss.
+        """
+        if not self.cacheable(text):
+            return None
+
+        key = self.__key(text, voice, output_format)
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            try:
+                with open(self.__path(key), "rb") as f:
+                    audio = f.read()
+                os.utime(self.__path(key))
+            except FileNotFoundError:
+                self.total_bytes -= self.entries.pop(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return audio
+
+    def put(self, text: str, voice: str, output_format: str, audio: bytes) -> None:
+        """Store synthesized audio, evicting the least recently used entries if needed"""
+        if not self.cacheable(text) or not audio or len(audio) > self.max_bytes:
+            return
+
+        key = self.__key(text, voice, output_format)
+        with self.lock:
+            # Written to a temporary file and renamed, readers never see a partial file
+            temporary_path = self.__path(key) + ".tmp"
+            with open(temporary_path, "wb") as f:
+                f.write(audio)
+            os.replace(temporary_path, self.__path(key))
+
+            self.total_bytes += len(audio) - self.entries.pop(key, 0)
+            self.entries[key] = len(audio)
+            self.__evict()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+        }
@@ -0,0 +1,61 @@
+import time
+import threading
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    Records how long each startup phase takes and when the milestones are reached.
+
+    Phases may run on different threads (e.g. models loading in the background while audio
+    capture starts), so each one is recorded with its start offset and thread. Milestones such as
+    "listening" or "models_ready" are offsets from the profiler's creation, which should happen
+    as early as possible in the process.
+
+    Attributes:
+    started_at (float): perf_counter() when the profiler was created.
+    phases (list): (name, start offset, duration, thread name) tuples, in seconds.
+    milestones (dict): Milestone name to offset in seconds.
+    lock (threading.Lock): Serializes recording from several threads.
+
+    Example:
+    ```python
+    startup_profiler = StartupProfiler()
+    with startup_profiler.phase("imports"):
+        import heavy_module
+    startup_profiler.mark("listening")
+    print(startup_profiler.report())
+    ```
+    """
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases = []
+        self.milestones = {}
+        self.lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the block as a startup phase"""
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.phases.append((name, start, self.elapsed() - start, threading.current_thread().name))
+
+    def mark(self, name: str) -> None:
+        """Record that a milestone was reached, only its first occurrence counts"""
+        with self.lock:
+            self.milestones.setdefault(name, self.elapsed())
+
+    def report(self) -> str:
+        with self.lock:
+            lines = ["Startup profile (s)", f"{'phase':>22} {'start':>7} {'duration':>9}  thread"]
+            for name, start, duration, thread_name in sorted(self.phases, key=lambda phase: phase[1]):
+                lines.append(f"{name:>22} {start:>7.2f} {duration:>9.2f}  {thread_name}")
+            for name, offset in sorted(self.milestones.items(), key=lambda milestone: milestone[1]):
+                lines.append(f"{name:>22} {offset:>7.2f}")
+            return "\n".join(lines)
@@ -0,0 +1,102 @@
+import traceback
+import threading
+from queue import Queue, Empty
+from dataclasses import dataclass
+
+
+@dataclass
+class TranscriptEvent:
+    text: str
+    timestamp: int
+    turn: object = None
+    transcription: object = None
+
+
+class TranscriptBus:
+    """
+    An in-process, event-driven handoff between the speech recognizer and the responder.
+
+    The recognizer publishes every finalized utterance to the bus and the responder blocks on
+    it, so a transcript reaches the conversation pipeline as soon as it is recognized instead of
+    waiting for a folder poll. Side-log writes (e.g. transcript files) are optional and run on a
+    background thread, keeping disk I/O off the voice turn.
+
+    Attributes:
+    transcripts (Queue): Queue of TranscriptEvent objects waiting to be answered.
+    side_log (callable): Optional callable receiving each TranscriptEvent asynchronously.
+    side_log_queue (Queue): Queue feeding the side-log thread, None if no side-log is set.
+
+    Example:
+    ```python
+    bus = TranscriptBus(side_log=lambda event: print(event.text))
+
+    # Recognizer thread
+    bus.publish("Write an article about AI", int(time.time()))
+
+    # Responder thread
+    event = bus.next_transcript(timeout=0.5)
+    if event:
+        send_message(event.text)
+    ```
+    """
+    def __init__(self, side_log=None):
+        self.transcripts = Queue()
+        self.side_log = side_log
+        self.side_log_queue = None
+        if self.side_log:
+            self.side_log_queue = Queue()
+            self.__start_side_log_thread()
+
+    def __start_side_log_thread(self):
+        """Start background thread for side-log writes"""
+        def process_queue():
+            while True:
+                event = self.side_log_queue.get()
+                try:
+                    self.side_log(event)
+                except Exception as e:
+                    print(f"Error writing transcript side-log: {e}")
+                    traceback.print_exc()
+                self.side_log_queue.task_done()
+
+        thread = threading.Thread(target=process_queue, daemon=True)
+        thread.start()
+
+    def publish(self, text: str, timestamp: int, respond: bool = True, turn=None, transcription=None) -> TranscriptEvent:
+        """
+        Publish a recognized utterance.
+
+        Args:
+            text (str): Recognized text.
+            timestamp (int): Epoch seconds when the utterance was finalized.
+            respond (bool): Whether the responder should receive the event, False only side-logs it.
+            turn (TurnTimeline): Optional latency timeline of the turn, carried to the responder.
+            transcription (Transcription): Optional recognizer output (language, confidence) for the side-log.
+
+        Returns:
+            TranscriptEvent: The published event.
+        """
+        event = TranscriptEvent(text=text, timestamp=timestamp, turn=turn, transcription=transcription)
+        if respond:
+            self.transcripts.put(event)
+        if self.side_log_queue is not None:
+            self.side_log_queue.put(event)
+        return event
+
+    def next_transcript(self, timeout: float = None):
+        """
+        Block until a transcript is available.
+
+        Args:
+            timeout (float): Seconds to wait, None waits forever.
+
+        Returns:
+            TranscriptEvent: The next event, or None if the timeout expired.
+        """
+        try:
+            return self.transcripts.get(timeout=timeout)
+        except Empty:
+            return None
+
+    def empty(self) -> bool:
+        return self.transcripts.empty()
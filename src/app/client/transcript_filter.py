@@ -0,0 +1,119 @@
+import re
+from collections import Counter
+
+
+class TranscriptFilter:
+    """
+    Filters Whisper hallucinations and non-speech out of the listener before they reach the LLM.
+
+    Each transcription is checked against the decoder's own confidence signals, with the same
+    rules and default thresholds whisper.transcribe uses: a high gzip compression ratio (repetition
+    loops), a high no-speech probability combined with a low average log-probability (silence or
+    noise), plus a stricter log-probability floor on its own. Known phrases Whisper tends to
+    produce on noise ("Thank you.", "¡Suscríbete al canal!") are matched per language
+    and suppressed only when the decoder also doubts the audio was speech, since users say some
+    of them too. Counters record how many transcripts were accepted and why the others were suppressed.
+
+    Attributes:
+    no_speech_threshold (float): no_speech_prob above which a low-confidence transcript is silence.
+    logprob_threshold (float): avg_logprob below which the no-speech rule applies.
+    min_avg_logprob (float): avg_logprob below which a transcript is always suppressed.
+    compression_ratio_threshold (float): Compression ratio above which a transcript is a repetition loop.
+    phrase_no_speech_threshold (float): no_speech_prob above which a known phrase is suppressed.
+    phrases (dict): Normalized hallucination phrases by language code.
+    accepted (int): Number of transcripts accepted.
+    suppressed (Counter): Number of transcripts suppressed, by reason.
+
+    Example:
+    ```python
+    transcript_filter = TranscriptFilter(no_speech_threshold=0.6)
+
+    transcription = engine.transcribe(audio)
+    if transcript_filter.accept(transcription):
+        send_message(transcription.text)
+    print(transcript_filter.stats())
+    ```
+    """
+    HALLUCINATION_PHRASES = {
+        "en": [
+            "Thank you.",
+            "Thanks for watching!",
+            "Thank you for watching.",
+            "Please subscribe to my channel.",
+        ],
+        "es": [
+            "¡Suscríbete al canal!",
+            "Gracias por ver el video.",
+            "Gracias.",
+            "¡Gracias por ver!",
+            "Subtítulos realizados por la comunidad de Amara.org",
+            "Suscríbete y dale like.",
+        ],
+    }
+
+    def __init__(
+        self,
+        no_speech_threshold=0.6,
+        logprob_threshold=-1.0,
+        min_avg_logprob=-1.5,
+        compression_ratio_threshold=2.4,
+        phrase_no_speech_threshold=0.3,
+        phrases=None,
+    ):
+        self.no_speech_threshold = no_speech_threshold
+        self.logprob_threshold = logprob_threshold
+        self.min_avg_logprob = min_avg_logprob
+        self.compression_ratio_threshold = compression_ratio_threshold
+        self.phrase_no_speech_threshold = phrase_no_speech_threshold
+        self.phrases = {
+            language: {self.__normalize(phrase) for phrase in language_phrases}
+            for language, language_phrases in (phrases or self.HALLUCINATION_PHRASES).items()
+        }
+        self.accepted = 0
+        self.suppressed = Counter()
+
+    def __normalize(self, text: str) -> str:
+        return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+    def check(self, transcription):
+        """
+        Find why a transcription should be suppressed, without updating the counters.
+
+        Args:
+            transcription (Transcription): Result of the transcription engine.
+
+        Returns:
+            str: The suppression reason ("empty", "repetition", "no_speech", "low_confidence",
+            "phrase"), or None if the transcription is accepted.
+        """
+        normalized_text = self.__normalize(transcription.text)
+        if not normalized_text:
+            return "empty"
+        if transcription.compression_ratio > self.compression_ratio_threshold:
+            return "repetition"
+        if transcription.no_speech_prob > self.no_speech_threshold and transcription.avg_logprob < self.logprob_threshold:
+            return "no_speech"
+        if transcription.avg_logprob < self.min_avg_logprob:
+            return "low_confidence"
+        if normalized_text in self.phrases.get(transcription.language, set()) and (
+            transcription.no_speech_prob > self.phrase_no_speech_threshold
+            or transcription.avg_logprob < self.logprob_threshold
+        ):
+            return "phrase"
+        return None
+
+    def accept(self, transcription) -> bool:
+        """Check a transcription and count the outcome. Returns True if it should be answered."""
+        reason = self.check(transcription)
+        if reason:
+            self.suppressed[reason] += 1
+            return False
+        self.accepted += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "accepted": self.accepted,
+            "suppressed": sum(self.suppressed.values()),
+            "suppressed_by_reason": dict(self.suppressed),
+        }
@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import threading
+
+
+class TranscriptLog:
+    """
+    An append-only transcript log stored as size-rotated JSONL segments.
+
+    Every transcript is one JSON line (timestamp, text, language, confidence) appended to the
+    active segment, so the log costs a handful of files however long Casey runs. Once a segment
+    exceeds `max_segment_bytes` a new one is started and the closed segment's time range is
+    recorded in a small index (index.json), which lets time-range queries open only the segments
+    that overlap the range. On rotation, closed segments whose newest transcript is older than
+    the retention period are deleted.
+
+    Attributes:
+    folder (str): Folder holding the segments and the index.
+    max_segment_bytes (int): Size after which the active segment is rotated.
+    retention_days (float): Age after which closed segments are deleted, None keeps everything.
+    index (dict): Segment file name to {"first_timestamp", "last_timestamp", "count"}.
+    active_segment (str): File name of the segment being appended to.
+    lock (threading.Lock): Serializes appends, rotation and compaction.
+
+    Example:
+    ```python
+    transcript_log = TranscriptLog("client/data/transcripts", retention_days=30)
+    transcript_log.append({"timestamp": int(time.time()), "text": "Hi Casey", "language": "en"})
+
+    for record in transcript_log.query(start=time.time() - 3600):
+        print(record["text"])
+    ```
+    """
+    INDEX_FILE = "index.json"
+
+    def __init__(self, folder, max_segment_bytes=1024 * 1024, retention_days=30):
+        self.folder = folder
+        self.max_segment_bytes = max_segment_bytes
+        self.retention_days = retention_days
+        self.lock = threading.Lock()
+        os.makedirs(self.folder, exist_ok=True)
+
+        self.index = self.__load_index()
+        segments = self.__list_segments()
+        self.active_segment = segments[-1] if segments else self.__segment_name(1)
+        # Closed segments missing from the index (e.g. a crash during rotation) are rescanned
+        for segment in segments[:-1]:
+            if segment not in self.index:
+                self.index[segment] = self.__scan_segment(segment)
+        # The active segment is not in the index yet, its time range is read back from the file
+        self.index.pop(self.active_segment, None)
+        self.active_range = self.__scan_segment(self.active_segment)
+
+    def __segment_name(self, number: int) -> str:
+        return f"transcripts-{number:06d}.jsonl"
+
+    def __segment_path(self, segment: str) -> str:
+        return os.path.join(self.folder, segment)
+
+    def __list_segments(self) -> list:
+        return sorted(
+            file_name for file_name in os.listdir(self.folder)
+            if file_name.startswith("transcripts-") and file_name.endswith(".jsonl")
+        )
+
+    def __load_index(self) -> dict:
+        try:
+            with open(self.__segment_path(self.INDEX_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def __save_index(self) -> None:
+        # Written to a temporary file and renamed, a crash never leaves a truncated index
+        temporary_path = self.__segment_path(self.INDEX_FILE + ".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(temporary_path, self.__segment_path(self.INDEX_FILE))
+
+    def __scan_segment(self, segment: str) -> dict:
+        entry = {"first_timestamp": None, "last_timestamp": None, "count": 0}
+        for record in self.__read_segment(segment):
+            if entry["first_timestamp"] is None:
+                entry["first_timestamp"] = record["timestamp"]
+            entry["last_timestamp"] = record["timestamp"]
+            entry["count"] += 1
+        return entry
+
+    def __read_segment(self, segment: str):
+        try:
+            with open(self.__segment_path(segment), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by a crash, the rest of the segment is still valid
+                        continue
+        except FileNotFoundError:
+            return
+
+    def __rotate(self) -> None:
+        self.index[self.active_segment] = self.active_range
+        number = int(self.active_segment[len("transcripts-"):-len(".jsonl")])
+        self.active_segment = self.__segment_name(number + 1)
+        self.active_range = {"first_timestamp": None, "last_timestamp": None, "count": 0}
+        self.__compact()
+        self.__save_index()
+
+    def __compact(self, now: float = None) -> list:
+        if self.retention_days is None:
+            return []
+        oldest_kept = (now or time.time()) - self.retention_days * 86400
+        expired = [
+            segment for segment, entry in self.index.items()
+            if entry["last_timestamp"] is None or entry["last_timestamp"] < oldest_kept
+        ]
+        for segment in expired:
+            try:
+                os.remove(self.__segment_path(segment))
+            except FileNotFoundError:
+                pass
+            del self.index[segment]
+        return expired
+
+    def append(self, record: dict) -> None:
+        """
+        Append a transcript.
+
+        Args:
+            record (dict): JSON-serializable transcript, with at least a 'timestamp' in epoch seconds.
+        """
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self.lock:
+            path = self.__segment_path(self.active_segment)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+            if self.active_range["first_timestamp"] is None:
+                self.active_range["first_timestamp"] = record["timestamp"]
+            self.active_range["last_timestamp"] = record["timestamp"]
+            self.active_range["count"] += 1
+
+            if os.path.getsize(path) >= self.max_segment_bytes:
+                self.__rotate()
+
+    def query(self, start: float = None, end: float = None) -> list:
+        """
+        Transcripts whose timestamp is within [start, end], oldest first.
+
+        Args:
+            start (float): Epoch seconds of the range start, None for no lower bound.
+            end (float): Epoch seconds of the range end, None for no upper bound.
+
+        Returns:
+            list: The matching records.
+        """
+        with self.lock:
+            ranges = dict(self.index)
+            ranges[self.active_segment] = dict(self.active_range)
+
+        records = []
+        for segment in sorted(ranges):
+            entry = ranges[segment]
+            if entry["first_timestamp"] is None:
+                continue
+            if (start is not None and entry["last_timestamp"] < start) or (end is not None and entry["first_timestamp"] > end):
+                continue
+            records.extend(
+                record for record in self.__read_segment(segment)
+                if (start is None or record["timestamp"] >= start) and (end is None or record["timestamp"] <= end)
+            )
+        return records
+
+    def compact(self, now: float = None) -> list:
+        """
+        Delete the closed segments older than the retention period.
+
+        Args:
+            now (float): Epoch seconds used as the current time, defaults to time.time().
+
+        Returns:
+            list: File names of the deleted segments.
+        """
+        with self.lock:
+            expired = self.__compact(now)
+            if expired:
+                self.__save_index()
+            return expired
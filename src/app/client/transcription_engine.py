@@ -0,0 +1,285 @@
+import os
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+
+import numpy as np
+import torch
+import whisper
+from whisper.audio import SAMPLE_RATE, N_SAMPLES, N_FRAMES
+
+
+@dataclass
+class Transcription:
+    text: str
+    language: str
+    duration: float
+    results: list = field(default_factory=list)
+
+    @property
+    def avg_logprob(self) -> float:
+        """Mean token log-probability over the decoded windows"""
+        return float(np.mean([result.avg_logprob for result in self.results]))
+
+    @property
+    def no_speech_prob(self) -> float:
+        """Lowest no-speech probability over the windows, any window with speech makes it speech"""
+        return float(min(result.no_speech_prob for result in self.results))
+
+    @property
+    def compression_ratio(self) -> float:
+        """Highest gzip compression ratio over the windows, high values mean repetition loops"""
+        return float(max(result.compression_ratio for result in self.results))
+
+
+@dataclass
+class WhisperProfile:
+    model_name: str
+    quantize_on_cpu: bool = True
+
+
+# Latency/accuracy trade-off, from fastest to most accurate
+WHISPER_PROFILES = {
+    "fastest": WhisperProfile("base"),
+    "fast": WhisperProfile("small"),
+    "balanced": WhisperProfile("medium"),
+    "accurate": WhisperProfile("large-v3-turbo"),
+}
+
+
+def resolve_device(device: str = "auto") -> str:
+    """Pick CUDA when available for "auto", otherwise return the requested device"""
+    if device == "auto":
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    return device
+
+
+def quantize_dynamic_int8(model):
+    """
+    Apply int8 dynamic quantization to the Linear layers of a CPU Whisper model.
+
+    whisper.model.Linear only overrides forward to cast its weights to the input dtype, which
+    is a no-op for fp32 CPU inference, but quantize_dynamic matches module types exactly, so
+    the layers are turned back into plain torch.nn.Linear first.
+    """
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+class TranscriptionEngine(ABC):
+    """Interface for utterance transcription engines"""
+
+    @abstractmethod
+    def transcribe(self, audio: np.ndarray) -> Transcription:
+        """
+        Transcribe a finalized utterance
+
+        Args:
+            audio: float32 mono audio at 16 kHz in [-1, 1)
+
+        Returns:
+            Recognized text and decoding details
+        """
+        pass
+
+    def transcribe_batch(self, audios: list, language: str = None) -> list:
+        """Transcribe several utterances, engines able to decode them together override this"""
+        return [self.transcribe(audio) for audio in audios]
+
+
+class WhisperTranscriptionEngine(TranscriptionEngine):
+    """
+    A transcription engine that adapts Whisper decoding to the length of each utterance.
+
+    Whisper decodes fixed 30-second mel windows. Utterances up to one window are decoded from
+    a mel spectrogram computed on the actual samples (zero-padded in the mel domain, as
+    whisper.transcribe does) with a token budget proportional to their duration, so a short
+    "ok thanks" neither pays for a 30-second STFT nor for a long greedy decode. Longer utterances
+    are split into overlapping windows that are decoded as one batch and stitched back together
+    on the overlapping words, instead of being silently truncated. transcribe_batch decodes the
+    utterances of several sessions together, see TranscriptionServer.
+
+    Attributes:
+    model (whisper.Whisper): Loaded Whisper model.
+    language (str): Language code passed to the decoder.
+    window_seconds (float): Length of each decoding window for long utterances.
+    overlap_seconds (float): Overlap between consecutive windows.
+    tokens_per_second (float): Token budget per second of audio for the decoder.
+    min_sample_len (int): Minimum token budget for any utterance.
+    max_overlap_words (int): Maximum number of words matched when stitching windows.
+
+    Engines are usually built from a profile (see WHISPER_PROFILES), which picks the model size,
+    the device (CUDA when available) and, on CPU, int8 dynamic quantization of the Linear layers.
+
+    Example:
+    ```python
+    engine = WhisperTranscriptionEngine.from_profile("fast", language="en", device="auto")
+
+    audio = pcm_int16.astype(np.float32) / 32768.0
+    transcription = engine.transcribe(audio)
+    print(transcription.text)
+    ```
+    """
+    def __init__(
+        self,
+        model,
+        language,
+        window_seconds=30,
+        overlap_seconds=2,
+        tokens_per_second=8,
+        min_sample_len=24,
+        max_overlap_words=12,
+    ):
+        self.model = model
+        self.language = language
+        self.window_seconds = window_seconds
+        self.overlap_seconds = overlap_seconds
+        self.tokens_per_second = tokens_per_second
+        self.min_sample_len = min_sample_len
+        self.max_overlap_words = max_overlap_words
+
+    @classmethod
+    def from_profile(
+        cls, profile: str, language: str, device: str = "auto", quantize: bool = None, cache_dir: str = None, **kwargs
+    ):
+        """
+        Load a Whisper model for a profile and wrap it in an engine.
+
+        With a cache folder the model is saved once fully prepared (moved to its device and
+        quantized) and later startups load that file directly, skipping the checkpoint conversion
+        and the quantization pass.
+
+        Args:
+            profile (str): A WHISPER_PROFILES key, or any whisper model name (e.g. "tiny").
+            language (str): Language code passed to the decoder.
+            device (str): "auto", "cpu" or a CUDA device such as "cuda:0".
+            quantize (bool): Force int8 dynamic quantization on/off, None follows the profile on CPU.
+            cache_dir (str): Optional folder of prepared models for fast loading.
+
+        Returns:
+            WhisperTranscriptionEngine: The engine for the loaded model.
+        """
+        whisper_profile = WHISPER_PROFILES.get(profile, WhisperProfile(profile))
+        device = resolve_device(device)
+        if quantize is None:
+            quantize = whisper_profile.quantize_on_cpu and device == "cpu"
+
+        cache_path = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            device_type = torch.device(device).type
+            cache_path = os.path.join(
+                cache_dir, f"{whisper_profile.model_name}-{device_type}{'-int8' if quantize else ''}.pt"
+            )
+
+        if cache_path and os.path.exists(cache_path):
+            model = torch.load(cache_path, map_location=device, weights_only=False)
+        else:
+            model = whisper.load_model(whisper_profile.model_name, device=device)
+            if quantize:
+                model = quantize_dynamic_int8(model)
+            if cache_path:
+                torch.save(model, cache_path)
+
+        print(f"Whisper {whisper_profile.model_name} on {device}{' (int8)' if quantize else ''}")
+        return cls(model, language, **kwargs)
+
+    def __decoding_options(self, duration: float, language: str = None) -> whisper.DecodingOptions:
+        sample_len = max(self.min_sample_len, int(np.ceil(duration * self.tokens_per_second)))
+        return whisper.DecodingOptions(
+            language=language or self.language,
+            task="transcribe",
+            without_timestamps=True,
+            sample_len=min(sample_len, self.model.dims.n_text_ctx // 2),
+            fp16=self.model.device.type != "cpu",
+        )
+
+    def __window_mel(self, audio: np.ndarray):
+        """Log-mel of at most one window of audio, zero-padded to the encoder's 3000 frames"""
+        mel = whisper.log_mel_spectrogram(audio[:N_SAMPLES], n_mels=self.model.dims.n_mels)
+        return whisper.pad_or_trim(mel, N_FRAMES).to(self.model.device)
+
+    def __normalize_word(self, word: str) -> str:
+        return re.sub(r"[^\w]", "", word.lower())
+
+    def stitch(self, texts: list) -> str:
+        """
+        Join window transcripts, dropping the words repeated in each window overlap.
+
+        Args:
+            texts (list): Transcripts of consecutive overlapping windows.
+
+        Returns:
+            str: The stitched transcript.
+        """
+        words = []
+        for text in texts:
+            new_words = text.split()
+            overlap = 0
+            for k in range(min(self.max_overlap_words, len(words), len(new_words)), 0, -1):
+                tail = [self.__normalize_word(w) for w in words[-k:]]
+                head = [self.__normalize_word(w) for w in new_words[:k]]
+                if tail == head:
+                    overlap = k
+                    break
+            words.extend(new_words[overlap:])
+        return " ".join(words)
+
+    def transcribe(self, audio: np.ndarray) -> Transcription:
+        """
+        Transcribe a finalized utterance.
+
+        Args:
+            audio (np.ndarray): float32 mono audio at 16 kHz in [-1, 1).
+
+        Returns:
+            Transcription: Recognized text and the underlying decoding results.
+        """
+        return self.transcribe_batch([audio])[0]
+
+    def transcribe_batch(self, audios: list, language: str = None) -> list:
+        """
+        Transcribe several finalized utterances with a single batched decode.
+
+        Every utterance is cut into its windows (one for utterances up to 30 seconds) and all the
+        windows go through the encoder and the decoder together, so on a GPU a batch costs about
+        as much as its longest utterance. The token budget follows the longest utterance.
+
+        Args:
+            audios (list): float32 mono audio arrays at 16 kHz in [-1, 1).
+            language (str): Language code for the whole batch, defaults to the engine's.
+
+        Returns:
+            list: One Transcription per utterance, in order.
+        """
+        window = int(self.window_seconds * SAMPLE_RATE)
+        overlap = int(self.overlap_seconds * SAMPLE_RATE)
+
+        mels = []
+        window_counts = []
+        for audio in audios:
+            if len(audio) <= N_SAMPLES:
+                starts = [0]
+            else:
+                starts = range(0, len(audio) - overlap, window - overlap)
+            mels.extend(self.__window_mel(audio[start:start + window]) for start in starts)
+            window_counts.append(len(starts))
+
+        # One batched decode for all windows of all utterances
+        longest = min(max(len(audio) for audio in audios) / SAMPLE_RATE, self.window_seconds)
+        results = whisper.decode(self.model, torch.stack(mels), self.__decoding_options(longest, language))
+
+        transcriptions = []
+        offset = 0
+        for audio, window_count in zip(audios, window_counts):
+            audio_results = results[offset:offset + window_count]
+            offset += window_count
+            transcriptions.append(Transcription(
+                text=self.stitch([result.text.strip() for result in audio_results]),
+                language=audio_results[0].language,
+                duration=len(audio) / SAMPLE_RATE,
+                results=audio_results,
+            ))
+        return transcriptions
@@ -0,0 +1,323 @@
+import json
+import time
+import uuid
+import argparse
+import traceback
+import threading
+import socketserver
+from queue import Queue, Empty
+from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
+
+from .audio_ring_buffer import AudioRingBuffer
+from .voice_activity_detector import VoiceActivityDetector
+
+
+@dataclass
+class TranscriptionRequest:
+    session_id: str
+    audio: np.ndarray
+    language: str
+    on_transcription: callable
+    created_at: float
+    on_done: callable = None
+
+
+class TranscriptionSession:
+    """
+    One audio stream served by a TranscriptionServer, e.g. one user's microphone.
+
+    Each session owns its capture ring buffer and voice activity detector. Written audio is run
+    through the VAD on the writer's thread, which is cheap, and every finalized utterance is
+    copied out of the ring buffer and queued on the server for batched decoding.
+
+    Attributes:
+    session_id (str): Unique identifier of the session.
+    language (str): Language code used to decode the session's utterances.
+    on_transcription (callable): Called with (session_id, Transcription) for every utterance.
+    audio_buffer (AudioRingBuffer): The session's capture buffer.
+    voice_activity_detector (VoiceActivityDetector): The session's endpointer.
+    lock (threading.Lock): Serializes writes to the session.
+    pending (int): Utterances queued and not yet delivered.
+    """
+    def __init__(self, server, session_id, language, on_transcription, rate=16000, buffer_seconds=90, **vad_kwargs):
+        self.server = server
+        self.session_id = session_id
+        self.language = language
+        self.on_transcription = on_transcription
+        self.rate = rate
+        self.audio_buffer = AudioRingBuffer(capacity=buffer_seconds * rate)
+        self.voice_activity_detector = VoiceActivityDetector(rate=rate, **vad_kwargs)
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.delivered = threading.Condition()
+
+    def __on_done(self):
+        with self.delivered:
+            self.pending -= 1
+            self.delivered.notify_all()
+
+    def __submit(self, spans):
+        for start, end in spans:
+            with self.delivered:
+                self.pending += 1
+            # Copied, the session's ring buffer keeps being written while the utterance waits
+            audio = self.audio_buffer.view(start, end).astype(np.float32) / 32768.0
+            self.server.submit(TranscriptionRequest(
+                session_id=self.session_id,
+                audio=audio,
+                language=self.language,
+                on_transcription=self.on_transcription,
+                created_at=time.perf_counter(),
+                on_done=self.__on_done,
+            ))
+
+    def write(self, samples: np.ndarray) -> None:
+        """
+        Feed captured audio to the session.
+
+        Args:
+            samples (np.ndarray): int16 PCM samples at the session's rate.
+        """
+        with self.lock:
+            self.audio_buffer.write(samples)
+            self.__submit(self.voice_activity_detector.process(self.audio_buffer))
+
+    def close(self) -> None:
+        """Finalize the utterance in progress, if any"""
+        with self.lock:
+            self.__submit(self.voice_activity_detector.process(self.audio_buffer) + self.voice_activity_detector.flush())
+
+    def wait_delivered(self, timeout: float = None) -> bool:
+        """Block until every queued utterance was decoded and delivered, or failed"""
+        with self.delivered:
+            return self.delivered.wait_for(lambda: self.pending == 0, timeout=timeout)
+
+
+class TranscriptionServer:
+    """
+    A transcription server decoding the utterances of many sessions with one shared model.
+
+    Sessions endpoint their own audio and queue finalized utterances. A single decoding thread
+    takes whatever is queued, waiting at most `max_batch_wait_ms` for more to arrive, and decodes
+    up to `max_batch_size` utterances at once through the engine's transcribe_batch (one batched
+    whisper.decode for Whisper). Utterances are grouped by language since the decoding options
+    are shared by a batch. Each result is handed to the callback of its session. Under load the
+    batches grow, so throughput scales with the number of concurrent sessions instead of
+    requiring one model copy per user.
+
+    Attributes:
+    transcription_engine (TranscriptionEngine): The shared engine.
+    max_batch_size (int): Maximum number of utterances decoded together.
+    max_batch_wait_ms (float): How long the first queued utterance may wait for others.
+    sessions (dict): Open TranscriptionSession objects by id.
+    content_queue (Queue): Queue of TranscriptionRequest objects waiting to be decoded.
+    batches (int): Number of batches decoded.
+    utterances (int): Number of utterances decoded.
+
+    Example:
+    ```python
+    server = TranscriptionServer(WhisperTranscriptionEngine.from_profile("fast", "en"))
+
+    def on_transcription(session_id, transcription):
+        print(session_id, transcription.text)
+
+    session = server.open_session(language="en", on_transcription=on_transcription)
+    session.write(pcm_int16_chunk)  # From the session's capture thread or connection
+    ...
+    server.close_session(session.session_id)
+    ```
+    """
+    def __init__(self, transcription_engine, max_batch_size=16, max_batch_wait_ms=20):
+        self.transcription_engine = transcription_engine
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait_ms = max_batch_wait_ms
+        self.sessions = {}
+        self.sessions_lock = threading.Lock()
+        self.content_queue = Queue()
+        self.batches = 0
+        self.utterances = 0
+        self.__start_processing_thread()
+
+    def __start_processing_thread(self):
+        """Start background thread for batched decoding"""
+        def process_queue():
+            while True:
+                requests = [self.content_queue.get()]
+                deadline = time.perf_counter() + self.max_batch_wait_ms / 1000
+                while len(requests) < self.max_batch_size:
+                    try:
+                        requests.append(self.content_queue.get(timeout=max(0.0, deadline - time.perf_counter())))
+                    except Empty:
+                        break
+
+                by_language = defaultdict(list)
+                for request in requests:
+                    by_language[request.language].append(request)
+                for language, language_requests in by_language.items():
+                    self.__decode_batch(language, language_requests)
+
+                for _ in requests:
+                    self.content_queue.task_done()
+
+        thread = threading.Thread(target=process_queue, daemon=True)
+        thread.start()
+
+    def __decode_batch(self, language, requests):
+        try:
+            transcriptions = self.transcription_engine.transcribe_batch(
+                [request.audio for request in requests], language=language
+            )
+        except Exception as e:
+            print(f"Error decoding batch of {len(requests)} utterances: {e}")
+            traceback.print_exc()
+            transcriptions = []
+        else:
+            self.batches += 1
+            self.utterances += len(requests)
+
+        for request, transcription in zip(requests, transcriptions):
+            try:
+                request.on_transcription(request.session_id, transcription)
+            except Exception as e:
+                print(f"Error delivering transcription to session {request.session_id}: {e}")
+                traceback.print_exc()
+        for request in requests:
+            if request.on_done:
+                request.on_done()
+
+    def submit(self, request: TranscriptionRequest) -> None:
+        """Queue a finalized utterance for decoding"""
+        self.content_queue.put(request)
+
+    def open_session(self, on_transcription, language=None, session_id=None, **session_kwargs) -> TranscriptionSession:
+        """
+        Open a session for a new audio stream.
+
+        Args:
+            on_transcription (callable): Called with (session_id, Transcription) for every utterance.
+            language (str): Language code of the session, defaults to the engine's.
+            session_id (str): Identifier of the session, a uuid4 by default.
+            **session_kwargs: Rate, buffer length and VAD parameters of the session.
+
+        Returns:
+            TranscriptionSession: The session, write its audio to it.
+        """
+        session = TranscriptionSession(
+            self,
+            session_id or str(uuid.uuid4()),
+            language,
+            on_transcription,
+            **session_kwargs,
+        )
+        with self.sessions_lock:
+            self.sessions[session.session_id] = session
+        return session
+
+    def close_session(self, session_id: str) -> None:
+        """Close a session, its last utterance is still decoded and delivered"""
+        with self.sessions_lock:
+            session = self.sessions.pop(session_id, None)
+        if session:
+            session.close()
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "batches": self.batches,
+            "utterances": self.utterances,
+            "average_batch_size": self.utterances / self.batches if self.batches else 0.0,
+            "queued": self.content_queue.qsize(),
+        }
+
+
+class TranscriptionStreamHandler(socketserver.StreamRequestHandler):
+    """
+    One TCP connection of the transcription service, served as one TranscriptionSession.
+
+    The client sends a JSON header line (e.g. {"language": "es"}, or an empty line for the
+    server's language), then raw 16 kHz mono int16 little-endian PCM, and shuts down its side of
+    the connection when the stream ends. Every utterance is sent back as one JSON line with its
+    text, language, duration and confidence as soon as it is decoded. The connection is closed
+    once the last utterance is delivered.
+    """
+    def handle(self):
+        header = self.rfile.readline().strip()
+        options = json.loads(header) if header else {}
+        send_lock = threading.Lock()
+
+        def on_transcription(session_id, transcription):
+            line = json.dumps({
+                "session_id": session_id,
+                "text": transcription.text,
+                "language": transcription.language,
+                "duration": round(transcription.duration, 2),
+                "avg_logprob": round(transcription.avg_logprob, 3),
+                "no_speech_prob": round(transcription.no_speech_prob, 3),
+            }, ensure_ascii=False)
+            with send_lock:
+                self.wfile.write(line.encode("utf-8") + b"\n")
+
+        session = self.server.transcription_server.open_session(on_transcription, language=options.get("language"))
+        print(f"Session {session.session_id} opened by {self.client_address[0]}")
+        try:
+            remainder = b""
+            while True:
+                data = self.rfile.read1(65536)
+                if not data:
+                    break
+                data = remainder + data
+                # A read can end in the middle of a sample
+                remainder = data[len(data) - len(data) % 2:]
+                session.write(np.frombuffer(data[:len(data) - len(remainder)], dtype="<i2").astype(np.int16))
+        finally:
+            self.server.transcription_server.close_session(session.session_id)
+            session.wait_delivered()
+            print(f"Session {session.session_id} closed", self.server.transcription_server.stats())
+
+
+def serve(transcription_server, host="0.0.0.0", port=8765):
+    """
+    Serve a TranscriptionServer over TCP, one session per connection, until interrupted.
+
+    Args:
+        transcription_server (TranscriptionServer): The server decoding the sessions' utterances.
+        host (str): Interface to listen on.
+        port (int): Port to listen on.
+    """
+    with socketserver.ThreadingTCPServer((host, port), TranscriptionStreamHandler) as tcp_server:
+        tcp_server.daemon_threads = True
+        tcp_server.transcription_server = transcription_server
+        print(f"Transcription server listening on {host}:{port}")
+        tcp_server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe many audio streams over TCP with one shared Whisper model")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profile", default="fast", help="Whisper profile or model name")
+    parser.add_argument("--device", default="auto")
+    parser.add_argument("--language", default="en", help="Language of sessions that do not send one")
+    parser.add_argument("--cache-dir", default=None, help="Folder of prepared models for fast loading")
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-batch-wait-ms", type=float, default=20)
+    args = parser.parse_args()
+
+    # Whisper and torch are only loaded by the standalone server
+    from .transcription_engine import WhisperTranscriptionEngine
+
+    engine = WhisperTranscriptionEngine.from_profile(args.profile, args.language, device=args.device, cache_dir=args.cache_dir)
+    transcription_server = TranscriptionServer(
+        engine, max_batch_size=args.max_batch_size, max_batch_wait_ms=args.max_batch_wait_ms
+    )
+    try:
+        serve(transcription_server, args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import json
+import time
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class TurnTimeline:
+    timestamp: float
+    marks: dict = field(default_factory=dict)
+
+    def mark(self, stage: str, at: float = None) -> None:
+        """Record the time.perf_counter() a stage was reached (now by default), only its first occurrence counts"""
+        self.marks.setdefault(stage, time.perf_counter() if at is None else at)
+
+
+class LatencyHistogram:
+    """
+    A fixed-size histogram of latencies with logarithmic buckets.
+
+    Buckets grow geometrically from `min_ms` to `max_ms`, so the relative error of a percentile
+    is bounded (about 5% with the defaults) and memory stays constant however many turns are
+    recorded.
+
+    Attributes:
+    edges (np.ndarray): Upper bound of each bucket in milliseconds.
+    counts (np.ndarray): Number of samples per bucket, the last one collects overflows.
+    count (int): Number of samples recorded.
+    total_ms (float): Sum of the samples, for the mean.
+    max_seen_ms (float): Largest sample recorded.
+    """
+    def __init__(self, min_ms=1.0, max_ms=120000.0, buckets=240):
+        self.edges = np.geomspace(min_ms, max_ms, buckets)
+        self.counts = np.zeros(buckets + 1, dtype=np.int64)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_seen_ms = 0.0
+
+    def add(self, value_ms: float) -> None:
+        self.counts[np.searchsorted(self.edges, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_seen_ms = max(self.max_seen_ms, value_ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile, in milliseconds"""
+        if not self.count:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.counts), np.ceil(self.count * q / 100)))
+        return float(self.edges[index]) if index < len(self.edges) else self.max_seen_ms
+
+
+class TurnLatencyTracker:
+    """
+    Times every voice turn by stage and aggregates the timings into latency histograms.
+
+    A turn is a TurnTimeline marked as it moves through the listener: the end of the user's
+    speech (the last voiced audio frame), the endpoint (the VAD finalized the utterance after
+    its hangover), the start of the transcription (later than the endpoint while Whisper is
+    still loading or busy with an earlier utterance), the transcript, the detected intent, the first
+    answer text, the first synthesized audio and the end of playback. Once the turn is done the
+    time spent between consecutive stages, plus time to answer, time to first audio and total
+    turn time, is added to one histogram per interval. A report with p50/p95/p99 is printed every `report_every`
+    turns, and each turn can be appended to a JSONL file for offline analysis.
+
+    Attributes:
+    report_every (int): Number of turns between printed reports, 0 disables them.
+    export_path (str): JSONL file receiving one line per turn, None disables the export.
+    histograms (dict): LatencyHistogram per interval name.
+    turns (int): Number of turns recorded.
+    lock (threading.Lock): Serializes recording and reporting.
+
+    Example:
+    ```python
+    tracker = TurnLatencyTracker(report_every=10, export_path="turn_latency.jsonl")
+
+    turn = tracker.start_turn(speech_end_age=0.3)  # speech_end, 0.3 s ago
+    turn.mark("endpoint")
+    turn.mark("transcribing")
+    turn.mark("transcript")
+    ...
+    turn.mark("audio_done")
+    tracker.record(turn)
+    ```
+    """
+    STAGES = ("speech_end", "endpoint", "transcribing", "transcript", "intent", "answer", "first_audio", "audio_done")
+    INTERVALS = {
+        "endpoint": ("speech_end", "endpoint"),
+        "transcription_wait": ("endpoint", "transcribing"),
+        "transcription": ("transcribing", "transcript"),
+        "intent": ("transcript", "intent"),
+        "answer": ("intent", "answer"),
+        "synthesis": ("answer", "first_audio"),
+        "playback": ("first_audio", "audio_done"),
+        "time_to_answer": ("speech_end", "answer"),
+        "time_to_first_audio": ("speech_end", "first_audio"),
+        "total": ("speech_end", "audio_done"),
+    }
+
+    def __init__(self, report_every=10, export_path=None):
+        self.report_every = report_every
+        self.export_path = export_path
+        self.histograms = {name: LatencyHistogram() for name in self.INTERVALS}
+        self.turns = 0
+        self.lock = threading.Lock()
+
+    def start_turn(self, speech_end_age: float = 0.0) -> TurnTimeline:
+        """
+        Start timing a turn at the end of the user's speech.
+
+        Args:
+            speech_end_age (float): Seconds since the user stopped talking, e.g. the audio
+                captured after the last voiced frame.
+
+        Returns:
+            TurnTimeline: The turn, stamped with the wall-clock time of the end of the speech.
+        """
+        turn = TurnTimeline(timestamp=time.time() - speech_end_age)
+        turn.mark("speech_end", at=time.perf_counter() - speech_end_age)
+        return turn
+
+    def record(self, turn: TurnTimeline) -> dict:
+        """
+        Add a finished turn to the histograms. Intervals whose stages were not reached
+        (e.g. no audio because the answer was empty) are skipped.
+
+        Args:
+            turn (TurnTimeline): The finished turn.
+
+        Returns:
+            dict: Milliseconds spent in each interval of the turn.
+        """
+        durations = {
+            name: round(1000 * (turn.marks[end] - turn.marks[start]), 1)
+            for name, (start, end) in self.INTERVALS.items()
+            if start in turn.marks and end in turn.marks
+        }
+
+        with self.lock:
+            for name, duration in durations.items():
+                self.histograms[name].add(duration)
+            self.turns += 1
+            if self.export_path:
+                with open(self.export_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"timestamp": round(turn.timestamp, 3), "durations_ms": durations}) + "\n")
+            if self.report_every and self.turns % self.report_every == 0:
+                print(self.__format_report())
+
+        return durations
+
+    def __format_report(self) -> str:
+        lines = [
+            f"Turn latency over {self.turns} turns (ms)",
+            f"{'interval':>20} {'count':>6} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}",
+        ]
+        for name, histogram in self.histograms.items():
+            if not histogram.count:
+                continue
+            lines.append(
+                f"{name:>20} {histogram.count:>6} {histogram.total_ms / histogram.count:>8.0f} "
+                f"{histogram.percentile(50):>8.0f} {histogram.percentile(95):>8.0f} {histogram.percentile(99):>8.0f}"
+            )
+        return "\n".join(lines)
+
+    def report(self) -> str:
+        """The current p50/p95/p99 table"""
+        with self.lock:
+            return self.__format_report()
@@ -0,0 +1,234 @@
+from collections import deque
+
+import numpy as np
+
+
+class VoiceActivityDetector:
+    """
+    A streaming, frame-level voice activity detector and endpointer for 16-bit PCM audio.
+
+    The detector reads short frames (20-30 ms) from an AudioRingBuffer and scores them with
+    vectorized NumPy energy and zero-crossing features, computed directly on a zero-copy
+    (n_frames, frame_length) view of the buffer. The noise floor is estimated adaptively as a
+    low percentile of the recent frame energies kept in a ring buffer, so the detector follows
+    the room instead of relying on a fixed amplitude threshold. An utterance starts after a few
+    consecutive speech frames (plus a short pre-roll so word onsets are not cut) and is finalized
+    once the hangover period of non-speech frames has elapsed. Utterances are reported as
+    absolute [start, end) sample spans of the ring buffer, so no audio is copied.
+
+    Attributes:
+    rate (int): Sample rate of the incoming audio in Hz.
+    frame_length (int): Number of samples per analysis frame.
+    hangover_frames (int): Non-speech frames required to finalize an utterance.
+    start_frames (int): Consecutive speech frames required to open an utterance.
+    pre_roll_samples (int): Samples kept before the detected speech onset.
+    min_speech_frames (int): Speech frames an utterance needs to be emitted at all.
+    max_utterance_samples (int): Length after which an utterance is force-finalized.
+    speech_margin_db (float): Energy above the noise floor for a frame to count as speech.
+    max_zero_crossing_rate (float): Zero-crossing rate above which a quiet frame is treated as noise.
+    min_energy_db (float): Absolute energy (dBFS) below which a frame is never speech.
+    energy_history (np.ndarray): Ring buffer of recent frame energies used for the noise floor.
+    position (int): Absolute position of the next sample to analyze.
+    speech_ends (deque): (span end, speech end) of the latest finalized utterances, see speech_end().
+
+    Example:
+    ```python
+    audio_buffer = AudioRingBuffer(capacity=90 * 16000)
+    vad = VoiceActivityDetector(rate=16000, frame_duration_ms=30, hangover_ms=300)
+
+    audio_buffer.write(np.frombuffer(stream.read(1024), dtype=np.int16))
+    for start, end in vad.process(audio_buffer):
+        transcribe(audio_buffer.view(start, end))
+    ```
+    """
+    def __init__(
+        self,
+        rate=16000,
+        frame_duration_ms=30,
+        hangover_ms=300,
+        start_ms=60,
+        pre_roll_ms=300,
+        min_speech_ms=150,
+        max_utterance_ms=60000,
+        speech_margin_db=9.0,
+        max_zero_crossing_rate=0.35,
+        min_energy_db=-60.0,
+        noise_window_ms=5000,
+        noise_percentile=10,
+    ):
+        self.rate = rate
+        self.frame_duration_ms = frame_duration_ms
+        self.frame_length = int(rate * frame_duration_ms / 1000)
+        self.hangover_frames = self.__ms_to_frames(hangover_ms)
+        self.start_frames = self.__ms_to_frames(start_ms)
+        self.pre_roll_samples = int(rate * pre_roll_ms / 1000)
+        self.min_speech_frames = self.__ms_to_frames(min_speech_ms)
+        self.max_utterance_samples = int(rate * max_utterance_ms / 1000)
+        self.speech_margin_db = speech_margin_db
+        self.max_zero_crossing_rate = max_zero_crossing_rate
+        self.min_energy_db = min_energy_db
+        self.noise_percentile = noise_percentile
+
+        self.energy_history = np.zeros(self.__ms_to_frames(noise_window_ms), dtype=np.float32)
+        self.energy_history_index = 0
+        self.energy_history_count = 0
+
+        self.position = 0
+        self.last_utterance_end = 0
+        self.utterance_start = 0
+        self.in_speech = False
+        self.speech_run = 0
+        self.silence_run = 0
+        self.voiced_frames = 0
+        self.speech_ends = deque(maxlen=64)
+
+    @property
+    def speech_duration_ms(self) -> float:
+        """Voiced duration of the utterance in progress, 0 when idle"""
+        return self.voiced_frames * self.frame_duration_ms if self.in_speech else 0
+
+    def __ms_to_frames(self, duration_ms):
+        return max(1, int(round(duration_ms / self.frame_duration_ms)))
+
+    def frame_features(self, frames: np.ndarray):
+        """
+        Compute per-frame energy and zero-crossing rate.
+
+        Args:
+            frames (np.ndarray): int16 array of shape (n_frames, frame_length).
+
+        Returns:
+            tuple: (energy_db, zero_crossing_rate) float arrays of shape (n_frames,).
+        """
+        samples = frames.astype(np.float32) / 32768.0
+        energy_db = 10.0 * np.log10(np.mean(samples * samples, axis=1) + 1e-10)
+        sign_changes = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1)
+        zero_crossing_rate = sign_changes / (frames.shape[1] - 1)
+        return energy_db, zero_crossing_rate
+
+    @property
+    def noise_floor_db(self) -> float:
+        if self.energy_history_count == 0:
+            return self.min_energy_db
+        return float(np.percentile(self.energy_history[:self.energy_history_count], self.noise_percentile))
+
+    def __update_noise_floor(self, energy_db: np.ndarray):
+        """Write the latest frame energies into the ring buffer"""
+        capacity = len(self.energy_history)
+        energy_db = energy_db[-capacity:]
+        indices = (self.energy_history_index + np.arange(len(energy_db))) % capacity
+        self.energy_history[indices] = energy_db
+        self.energy_history_index = (self.energy_history_index + len(energy_db)) % capacity
+        self.energy_history_count = min(capacity, self.energy_history_count + len(energy_db))
+
+    def classify_frames(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Classify frames as speech or non-speech against the adaptive noise floor.
+
+        Args:
+            frames (np.ndarray): int16 array of shape (n_frames, frame_length).
+
+        Returns:
+            np.ndarray: Boolean array of shape (n_frames,), True for speech frames.
+        """
+        energy_db, zero_crossing_rate = self.frame_features(frames)
+        noise_floor_db = self.noise_floor_db
+        self.__update_noise_floor(energy_db)
+
+        above_floor = energy_db > noise_floor_db + self.speech_margin_db
+        # Loud frames are speech regardless of ZCR (fricatives), quiet hiss-like frames are not
+        voiced = (zero_crossing_rate <= self.max_zero_crossing_rate) | (
+            energy_db > noise_floor_db + 2 * self.speech_margin_db
+        )
+        return above_floor & voiced & (energy_db > self.min_energy_db)
+
+    def __finalize(self, end: int):
+        span = None
+        if self.voiced_frames >= self.min_speech_frames:
+            span = (self.utterance_start, end)
+            self.last_utterance_end = end
+            # The span ends after the hangover, the user stopped talking at the last voiced frame
+            self.speech_ends.append((end, end - self.silence_run * self.frame_length))
+        self.in_speech = False
+        self.speech_run = 0
+        self.silence_run = 0
+        self.voiced_frames = 0
+        return span
+
+    def process(self, audio_buffer) -> list:
+        """
+        Analyze the whole frames written to the buffer since the last call.
+
+        Args:
+            audio_buffer (AudioRingBuffer): Buffer the captured audio is written to.
+
+        Returns:
+            list: (start, end) absolute sample spans, one per finalized utterance (usually empty).
+        """
+        if self.position < audio_buffer.oldest_position:
+            # The consumer fell behind by more than the buffer capacity
+            self.position = audio_buffer.oldest_position
+            if self.in_speech:
+                self.utterance_start = max(self.utterance_start, self.position)
+
+        n_frames = (audio_buffer.total_written - self.position) // self.frame_length
+        if n_frames == 0:
+            return []
+
+        frames_start = self.position
+        frames = audio_buffer.view(frames_start, frames_start + n_frames * self.frame_length)
+        frames = frames.reshape(n_frames, self.frame_length)
+        is_speech = self.classify_frames(frames)
+        self.position += n_frames * self.frame_length
+
+        spans = []
+        for index, speech in enumerate(is_speech):
+            frame_end = frames_start + (index + 1) * self.frame_length
+            if not self.in_speech:
+                self.speech_run = self.speech_run + 1 if speech else 0
+                if self.speech_run >= self.start_frames:
+                    onset = frame_end - self.speech_run * self.frame_length
+                    self.utterance_start = max(
+                        onset - self.pre_roll_samples,
+                        self.last_utterance_end,
+                        audio_buffer.oldest_position,
+                    )
+                    self.in_speech = True
+                    self.voiced_frames = self.speech_run
+                    self.silence_run = 0
+                continue
+
+            if speech:
+                self.voiced_frames += 1
+                self.silence_run = 0
+            else:
+                self.silence_run += 1
+
+            if self.silence_run >= self.hangover_frames or frame_end - self.utterance_start >= self.max_utterance_samples:
+                span = self.__finalize(frame_end)
+                if span is not None:
+                    spans.append(span)
+        return spans
+
+    def speech_end(self, span_end: int) -> int:
+        """
+        Absolute position where the speech of a finalized utterance ended, before its trailing
+        non-speech frames. The time between it and the span end is the endpointing delay.
+
+        Args:
+            span_end (int): End of a span returned by process() or flush().
+
+        Returns:
+            int: Position one past the last voiced frame, span_end if the span is no longer known.
+        """
+        for end, speech_end in reversed(self.speech_ends):
+            if end == span_end:
+                return speech_end
+        return span_end
+
+    def flush(self) -> list:
+        """Finalize the utterance in progress, if any, e.g. when the stream stops."""
+        if not self.in_speech:
+            return []
+        span = self.__finalize(self.position)
+        return [span] if span is not None else []
@@ -5,4 +5,7 @@ from .imgflip_service import ImgflipService
 from .vectara_service import VectaraService
 from .telegram_service import TelegramService
 from .interaction_manager import InteractionManager
+from .llm_gateway import LlmGateway
+from .groq_client_pool import GroqClientPool
+from .llm_response_cache import LlmResponseCache
 from .semantic_memory_module import SemanticMemoryModule
\ No newline at end of file
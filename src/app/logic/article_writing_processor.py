@@ -1,13 +1,17 @@
 import uuid
+import asyncio
 import traceback
 import threading
 from queue import Queue
 from datetime import datetime
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 
-from groq import Groq
 from dataclasses import dataclass
 
+from .groq_client_pool import GroqClientPool
+from .llm_response_cache import complete, acomplete
+from .llm_gateway import current_lane, BACKGROUND
+from .prompt_registry import prompt_registry
+
 @dataclass
 class ArticleWritingRequest:
     id: str
@@ -16,6 +20,81 @@ class ArticleWritingRequest:
     status: str = "pending"
     created_at: datetime = datetime.now()
 
+ARTICLE_PROCESSING_MESSAGE_PROMPT = prompt_registry.register("article_processing_message", """Generate an engaging and concise response about content being created and will be sended to the user's Telegram.
+
+**Avoid mentioning any general inclusions or outlines, please focus solely on the following specific topic details provided for content generation:**:
+Main topic: ${main_topic}
+Subtopics: ${subtopics}
+Target audience: ${target_audience}
+Tone: ${context}
+Conversation context: ${context}
+User's original message: '''${last_user_message}'''
+
+**The response should:**
+1. Acknowledge the content request
+2. Explain that it will take some time to create quality content
+3. Mention that they'll receive a notification when it's ready
+4. Be enthusiastic and engaging
+""", input_budgets={"last_user_message": 256})
+
+# The sources are fitted to SOURCES_TOKEN_BUDGET whole, by rank, before rendering
+ARTICLE_WRITING_PROMPT = prompt_registry.register("article_writing", """# CONTEXT
+${sources}
+
+# INSTRUCTIONS:
+Create a high-quality article that:
+1. Follows the template structure above
+2. Addresses this hint from prior conversation: '''${conversation_context}'''
+3. Is related to the following user message: '''${last_user_message}'''
+
+# LENGTH AND STRUCTURE:
+- Maximum: ${desired_length} characters (including spaces)
+- Include: Headline, lead paragraph, key points, and conclusion
+- Format: Short paragraphs (2-4 sentences)
+
+# STYLE:
+- Audience: '${target_audience}'
+- Tone: '${tone}'
+- Complexity: '${complexity}'
+- Include 1-2 relevant quotes when appropriate
+
+# FORMATTING:
+- Use UPPERCASE for the TITLE
+- Use ** for subheadings
+- Use > for quotes
+- Keep paragraphs well-spaced
+- Put quotes in single-line paragraphs
+
+# CONTENT GUIDELINES:
+- Create engaging, topic-specific subheadings that reflect the content
+- Avoid generic subheadings like "Introduction" or "Main Points"
+- Each subheading should intrigue the reader about the following content
+- Subheadings should flow naturally and tell a story
+
+# TEMPLATE:
+
+[ENGAGING TITLE IN UPPERCASE]
+
+[Compelling lead paragraph]
+
+**[Creative subheading reflecting first main point]**
+[Content...]
+
+**[Creative subheading reflecting second main point]**
+[More content...]
+
+> [Relevant quote]
+
+**[Creative subheading reflecting final point or conclusion]**
+[More content...]
+
+**Sources**
+1. [Source Title/Name] ([URL])
+2. [Source Title/Name] ([URL])
+3. [Source Title/Name] ([URL])
+[Continue numbering for all corresponding sources...]
+""", input_budgets={"conversation_context": 256, "last_user_message": 256})
+
 class ArticleWritingProcessor:
     """
     A processor class for generating AI-powered articles using news sources and semantic memory.
@@ -26,6 +105,8 @@ class ArticleWritingProcessor:
 
     Attributes:
     NEWS_VECTARA_CORPUS_KEY (str): Constant defining the corpus key for news articles.
+    SOURCES_TOKEN_BUDGET (int): Maximum tokens of news sources included in the article prompt.
+    groq_client_pool (GroqClientPool): Shared Groq clients.
     client (Groq): Instance of Groq client for AI language processing.
     groq_interaction_model_id (str): Model ID for article generation.
     groq_notification_model_id (str): Model ID for notification messages.
@@ -33,6 +114,7 @@ class ArticleWritingProcessor:
     news_service: Service for fetching news articles.
     vectara_service: Service for vector search operations.
     semantic_memory_module: Module for storing generated content.
+    event_loop (EventLoopThread): Loop running article jobs as coroutines, None to use a processing thread.
     content_queue (Queue): Queue for processing article requests asynchronously.
 
     Example:
@@ -62,21 +144,26 @@ class ArticleWritingProcessor:
     ```
     """
     NEWS_VECTARA_CORPUS_KEY = 'casey_news'
+    SOURCES_TOKEN_BUDGET = 6000
 
-    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, news_service, vectara_service, semantic_memory_module):
-        self.client = Groq(api_key=groq_api_key)
+    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, news_service, vectara_service, semantic_memory_module, groq_client_pool=None, event_loop=None):
+        self.groq_client_pool = groq_client_pool or GroqClientPool(groq_api_key)
+        self.client = self.groq_client_pool.client
         self.groq_interaction_model_id = groq_interaction_model_id
         self.groq_notification_model_id = groq_notification_model_id
         self.telegram_service = telegram_service
         self.news_service = news_service
         self.vectara_service = vectara_service
         self.semantic_memory_module = semantic_memory_module
+        self.event_loop = event_loop
         self.content_queue = Queue()
-        self.__start_processing_thread()
+        if event_loop is None:
+            self.__start_processing_thread()
         
     def __start_processing_thread(self):
         """Start background thread for content processing"""
         def process_queue():
+            current_lane.set(BACKGROUND)
             while True:
                 request = self.content_queue.get()
                 try:
@@ -90,27 +177,32 @@ class ArticleWritingProcessor:
                 
         thread = threading.Thread(target=process_queue, daemon=True)
         thread.start()
-   
-    def __generate_processing_message(self, topic: dict, last_user_message: str) -> str:
-        """Generate an engaging response about content being processed"""
-        prompt = f"""Generate an engaging and concise response about content being created and will be sended to the user's Telegram.
-
-**Avoid mentioning any general inclusions or outlines, please focus solely on the following specific topic details provided for content generation:**:
-Main topic: {topic['main_topic']}
-Subtopics: {', '.join(topic['subtopics'])}
-Target audience: {topic['target_audience']}
-Tone: {topic['context']}
-Conversation context: {topic['context']}
-User's original message: '''{last_user_message}'''
 
-**The response should:**
-1. Acknowledge the content request
-2. Explain that it will take some time to create quality content
-3. Mention that they'll receive a notification when it's ready
-4. Be enthusiastic and engaging
-"""
+    async def __aprocess_request(self, request: ArticleWritingRequest):
+        """Coroutine counterpart of the processing thread's work for one request"""
+        current_lane.set(BACKGROUND)
+        params = await asyncio.to_thread(self.__article_request, request)
+        content = await acomplete(self.groq_client_pool.async_client, **params)
+        print('Full Article Generation:\n\n', content)
+        await asyncio.to_thread(self.telegram_service.send_message, content)
+        await self.semantic_memory_module.acrystallize_knowledge(content.splitlines()[0], 'article_writing', 'own', content)
+
+    def __enqueue(self, request: ArticleWritingRequest):
+        if self.event_loop:
+            self.event_loop.spawn(self.__aprocess_request(request))
+        else:
+            self.content_queue.put(request)
+
+    def __processing_message_request(self, topic: dict, last_user_message: str) -> dict:
+        prompt = ARTICLE_PROCESSING_MESSAGE_PROMPT.render(
+            main_topic=topic['main_topic'],
+            subtopics=', '.join(topic['subtopics']),
+            target_audience=topic['target_audience'],
+            context=topic['context'],
+            last_user_message=last_user_message,
+        )
 
-        response = self.client.chat.completions.create(
+        return dict(
             messages=[{"role": "user", "content": prompt}],
             model=self.groq_notification_model_id,
             max_tokens=192,
@@ -119,7 +211,12 @@ User's original message: '''{last_user_message}'''
             stream=False,
         )
 
-        return response.choices[0].message.content
+    def __generate_processing_message(self, topic: dict, last_user_message: str) -> str:
+        """Generate an engaging response about content being processed"""
+        return complete(self.client, **self.__processing_message_request(topic, last_user_message))
+
+    async def __agenerate_processing_message(self, topic: dict, last_user_message: str) -> str:
+        return await acomplete(self.groq_client_pool.async_client, **self.__processing_message_request(topic, last_user_message))
     
     def __transform_sources_to_context(self, sources):
         """
@@ -161,6 +258,17 @@ User's original message: '''{last_user_message}'''
         
         return context
 
+    def __fit_sources(self, sources):
+        """The highest ranked sources whose texts fit in SOURCES_TOKEN_BUDGET, at least one"""
+        encoding = prompt_registry.encoding
+        fitted_sources, tokens = [], 0
+        for source in sources:
+            tokens += len(encoding.encode(source.get('text', '')))
+            if fitted_sources and tokens > self.SOURCES_TOKEN_BUDGET:
+                break
+            fitted_sources.append(source)
+        return fitted_sources
+
     # Example usage:
     def __create_prompt_with_context(self, sources, target_audience, tone, complexity, conversation_context, last_user_message, desired_length=4096):
         """
@@ -173,66 +281,19 @@ User's original message: '''{last_user_message}'''
         Returns:
             str: Complete prompt with context and instructions
         """
-        # Transform sources into context
-        context = self.__transform_sources_to_context(sources)
+        # Transform the sources that fit in the budget into context
+        context = self.__transform_sources_to_context(self.__fit_sources(sources))
         
         # Create the full prompt
-        prompt = f"""# CONTEXT
-{context}
-
-# INSTRUCTIONS:
-Create a high-quality article that:
-1. Follows the template structure above
-2. Addresses this hint from prior conversation: '''{conversation_context}'''
-3. Is related to the following user message: '''{last_user_message}'''
-
-# LENGTH AND STRUCTURE:
-- Maximum: {desired_length} characters (including spaces)
-- Include: Headline, lead paragraph, key points, and conclusion
-- Format: Short paragraphs (2-4 sentences)
-
-# STYLE:
-- Audience: '{target_audience}'
-- Tone: '{tone}'
-- Complexity: '{complexity}'
-- Include 1-2 relevant quotes when appropriate
-
-# FORMATTING:
-- Use UPPERCASE for the TITLE
-- Use ** for subheadings
-- Use > for quotes
-- Keep paragraphs well-spaced
-- Put quotes in single-line paragraphs
-
-# CONTENT GUIDELINES:
-- Create engaging, topic-specific subheadings that reflect the content
-- Avoid generic subheadings like "Introduction" or "Main Points"
-- Each subheading should intrigue the reader about the following content
-- Subheadings should flow naturally and tell a story
-
-# TEMPLATE:
-
-[ENGAGING TITLE IN UPPERCASE]
-
-[Compelling lead paragraph]
-
-**[Creative subheading reflecting first main point]**
-[Content...]
-
-**[Creative subheading reflecting second main point]**
-[More content...]
-
-> [Relevant quote]
-
-**[Creative subheading reflecting final point or conclusion]**
-[More content...]
-
-**Sources**
-1. [Source Title/Name] ([URL])
-2. [Source Title/Name] ([URL])
-3. [Source Title/Name] ([URL])
-[Continue numbering for all corresponding sources...]
-"""
+        prompt = ARTICLE_WRITING_PROMPT.render(
+            sources=context,
+            conversation_context=conversation_context,
+            last_user_message=last_user_message,
+            desired_length=desired_length,
+            target_audience=target_audience,
+            tone=tone,
+            complexity=complexity,
+        )
 
         return prompt
     
@@ -252,6 +313,8 @@ Create a high-quality article that:
             Input article format: [{'text': 'long article content...', ...}]
             Output format: [{'text': 'long article content...', 'chunks': [{'text': 'chunk1...'}, {'text': 'chunk2...'}], ...}]
         """
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1024,
             chunk_overlap=280,
@@ -262,8 +325,8 @@ Create a high-quality article that:
             article['chunks'] = [{'text': chunk} for chunk in chunks if len(chunk) > 280]
         return [article for article in articles if article['chunks']]
 
-    def __process_content(self, request: ArticleWritingRequest) -> str:
-        """Process content creation with various APIs and inference"""
+    def __article_request(self, request: ArticleWritingRequest) -> dict:
+        """Gather the sources of an article and build its completion request"""
 
         main_topic_subtopics = [request.topic['context']] + [request.topic['main_topic']] + request.topic['subtopics']
         all_bing_articles = self.news_service.search_bing_news(main_topic_subtopics, 5)
@@ -291,7 +354,7 @@ Create a high-quality article that:
 
         prompt = self.__create_prompt_with_context(sources, target_audience, tone, complexity, conversation_context, last_user_message)
 
-        response = self.client.chat.completions.create(
+        return dict(
             messages=[{"role": "user", "content": prompt}],
             model=self.groq_interaction_model_id,
             max_tokens=3072,
@@ -299,11 +362,15 @@ Create a high-quality article that:
             frequency_penalty=1.1,
             stream=False,
         )
+
+    def __process_content(self, request: ArticleWritingRequest) -> str:
+        """Process content creation with various APIs and inference"""
+        content = complete(self.client, **self.__article_request(request))
         
         # self.vectara_service.remove_all_documents_and_data_in_a_corpus(self.NEWS_VECTARA_CORPUS_KEY)
 
-        print('Full Article Generation:\n\n', response.choices[0].message.content)
-        return response.choices[0].message.content
+        print('Full Article Generation:\n\n', content)
+        return content
     
     def handle_content_request(self, topic: dict, last_user_message: str) -> str:
         """Handle a new content request"""
@@ -315,11 +382,21 @@ Create a high-quality article that:
         )
         
         # Add to processing queue
-        self.content_queue.put(request)
+        self.__enqueue(request)
         
         # Generate immediate response
         return self.__generate_processing_message(topic, last_user_message)
 
+    async def ahandle_content_request(self, topic: dict, last_user_message: str) -> str:
+        """Async counterpart of handle_content_request"""
+        request = ArticleWritingRequest(
+            id=str(uuid.uuid4()),
+            topic=topic,
+            last_user_message=last_user_message
+        )
+        self.__enqueue(request)
+        return await self.__agenerate_processing_message(topic, last_user_message)
+
 # # Usage in your main application
 # class ContentManager:
 #     def __init__(self, llm_client, telegram_token: str, chat_id: str):
@@ -0,0 +1,127 @@
+import uuid
+import traceback
+import threading
+from queue import Queue, Empty
+from datetime import datetime
+
+from dataclasses import dataclass
+
+from .groq_client_pool import GroqClientPool
+from .llm_gateway import current_lane, BACKGROUND
+
+@dataclass
+class ConversationSummaryRequest:
+    id: str
+    messages: list
+    on_summary: callable
+    status: str = "pending"
+    created_at: datetime = datetime.now()
+
+class ConversationSummarizer:
+    """
+    A background summarizer that folds conversation turns evicted from the context window into a
+    compact running summary.
+
+    The summary is updated incrementally: each update sends only the previous summary and the newly
+    evicted turns, never the whole history, so its cost does not grow with the session. Evictions
+    that pile up while an update is running are folded together in the next call. The updated
+    summary is handed to a callback, typically the conversation window, so long sessions keep
+    their context at a fixed prompt size.
+
+    Attributes:
+    groq_client_pool (GroqClientPool): Shared Groq clients.
+    groq_client (Groq): Instance of Groq client for AI language processing.
+    groq_notification_model_id (str): Model ID used for summarization (a small, fast model).
+    max_summary_tokens (int): Maximum length of the running summary.
+    summary (str): The current running summary.
+    content_queue (Queue): Queue of evicted turns waiting to be folded.
+
+    Example:
+    ```python
+    summarizer = ConversationSummarizer(
+        groq_api_key="your_key",
+        groq_notification_model_id="notification_model_id"
+    )
+
+    evicted = conversation_window.add(message)
+    if evicted:
+        summarizer.handle_evicted_messages(evicted, conversation_window.set_summary)
+    ```
+    """
+    def __init__(self, groq_api_key, groq_notification_model_id, max_summary_tokens=256, groq_client_pool=None):
+        self.groq_client_pool = groq_client_pool or GroqClientPool(groq_api_key)
+        self.groq_client = self.groq_client_pool.client
+        self.groq_notification_model_id = groq_notification_model_id
+        self.max_summary_tokens = max_summary_tokens
+        self.summary = ""
+        self.content_queue = Queue()
+        self.__start_processing_thread()
+
+    def __start_processing_thread(self):
+        """Start background thread for summary updates"""
+        def process_queue():
+            current_lane.set(BACKGROUND)
+            while True:
+                requests = [self.content_queue.get()]
+                # Fold every eviction that arrived meanwhile into a single update
+                while True:
+                    try:
+                        requests.append(self.content_queue.get_nowait())
+                    except Empty:
+                        break
+                try:
+                    messages = [message for request in requests for message in request.messages]
+                    self.summary = self.__fold_into_summary(self.summary, messages)
+                    requests[-1].on_summary(self.summary)
+                except Exception as e:
+                    print(f"Error summarizing conversation: {e}")
+                    traceback.print_exc()
+                for _ in requests:
+                    self.content_queue.task_done()
+
+        thread = threading.Thread(target=process_queue, daemon=True)
+        thread.start()
+
+    def __fold_into_summary(self, summary: str, messages: list) -> str:
+        turns = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+        prompt = f"""You maintain a running summary of a conversation between a user and Casey, an AI companion.
+
+Update the current summary with the new conversation turns below. The updated summary must:
+1. Keep every fact, preference, personal event and open request from the current summary that is still relevant
+2. Add what is new in the turns: topics discussed, what the user shared, what Casey suggested or promised
+3. Keep dates and times when they matter (turns end with a timestamp in the format @@[YYYY-MM-DD HH:MM:SS]@@)
+4. Be written in the third person, in plain sentences, without markdown
+5. Stay under {self.max_summary_tokens // 4 * 3} words, dropping the least important details first
+
+Current summary:
+\"\"\"{summary or 'No summary yet.'}\"\"\"
+
+New conversation turns:
+\"\"\"{turns}\"\"\"
+
+Return only the updated summary."""
+
+        response = self.groq_client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            model=self.groq_notification_model_id,
+            max_tokens=self.max_summary_tokens,
+            temperature=0.08,
+            stream=False,
+        )
+
+        return response.choices[0].message.content.strip()
+
+    def handle_evicted_messages(self, messages: list, on_summary) -> None:
+        """
+        Queue turns that left the context window to be folded into the summary.
+
+        Args:
+            messages (list): Evicted messages, oldest first.
+            on_summary (callable): Called with the updated summary text.
+        """
+        request = ConversationSummaryRequest(
+            id=str(uuid.uuid4()),
+            messages=messages,
+            on_summary=on_summary
+        )
+        self.content_queue.put(request)
@@ -1,13 +1,18 @@
 import json
 import uuid
+import asyncio
 import traceback
 import threading
 from queue import Queue
 from datetime import datetime
 
-from groq import Groq
 from dataclasses import dataclass
 
+from .groq_client_pool import GroqClientPool
+from .llm_response_cache import complete, acomplete
+from .llm_gateway import current_lane, BACKGROUND
+from .prompt_registry import prompt_registry
+
 @dataclass
 class EpisodicEventRegistrationRequest:
     id: str
@@ -15,63 +20,7 @@ class EpisodicEventRegistrationRequest:
     status: str = "pending"
     created_at: datetime = datetime.now()
 
-class EpisodicEventProcessor:
-    """
-    A processor class for detecting and storing episodic memory events from conversations.
-
-    This class analyzes conversations to identify specific, memorable events that qualify as
-    episodic memories - those containing temporal context, location, or personal involvement.
-    Detected events are stored in a vector database for later retrieval and context.
-
-    Attributes:
-    EPISODIC_VECTARA_CORPUS_KEY (str): Constant defining the corpus key for episodic memories.
-    groq_client (Groq): Instance of Groq client for language processing.
-    groq_interaction_model_id (str): Model ID for event detection.
-    vectara_service: Service for vector database operations.
-    content_queue (Queue): Queue for processing memory events asynchronously.
-
-    Example:
-    ```python
-    processor = EpisodicEventProcessor(
-        groq_api_key="your_key",
-        groq_interaction_model_id="model_id",
-        vectara_service=vectara_service
-    )
-
-    # Process conversation for episodic events
-    processor.handle_content_request([
-        {"role": "user", "content": "Last summer, I visited Paris for the first time..."},
-        {"role": "assistant", "content": "That sounds wonderful! How was it?"},
-        {"role": "user", "content": "The Eiffel Tower was amazing at sunset..."}
-    ])
-    ```
-    """
-    EPISODIC_VECTARA_CORPUS_KEY = "casey_episodic"
-    
-    def __init__(self, groq_api_key, groq_interaction_model_id, vectara_service):
-        self.groq_client = Groq(api_key=groq_api_key)
-        self.groq_interaction_model_id = groq_interaction_model_id
-        self.vectara_service = vectara_service
-        self.content_queue = Queue()
-        self.__start_processing_thread()
-
-    def __start_processing_thread(self):
-        """Start background thread for content processing"""
-        def process_queue():
-            while True:
-                request = self.content_queue.get()
-                try:
-                    self.__process_content(request)
-                except Exception as e:
-                    print(f"Error processing content: {e}")
-                    traceback.print_exc()
-                self.content_queue.task_done()
-                
-        thread = threading.Thread(target=process_queue, daemon=True)
-        thread.start()
-
-    def __detect_episodic_memory_parameters(self, user_messages):               
-        prompt = f"""# Task: Episodic Memory Event Extraction
+EPISODIC_MEMORY_PROMPT = prompt_registry.register("episodic_memory", """# Task: Episodic Memory Event Extraction
 
 You are tasked with analyzing text to identify and extract events that would constitute episodic memories - personal, experiential events that include specific contextual details (time, place, or circumstances) and could be stored in a person's episodic memory.
 
@@ -98,39 +47,39 @@ Return a JSON object with a single property called "fact". If an episodic event
 ## Examples:
 
 Input: "Coffee is my favorite morning beverage. I drink it every day."
-Output: {{
+Output: {
     "fact": "NOEPISODICEVENT"
-}}
+}
 Explanation: This is a general preference and routine, not a specific episodic event.
 
 Input: "Last summer, I accidentally dropped my ice cream cone at the beach and a seagull swooped down and grabbed it right in front of me!"
-Output: {{
+Output: {
     "fact": "Experienced a seagull stealing dropped ice cream cone at the beach last summer"
-}}
+}
 Explanation: This is a specific event with time (last summer), place (beach), and unique experience.
 
 Input: "When I was 12, my grandfather taught me how to fish at Lake Michigan. I caught my first bass that day, and he was so proud he took a picture of me holding it."
-Output: {{
+Output: {
     "fact": "Learned fishing from grandfather at Lake Michigan at age 12 and caught first bass"
-}}
+}
 Explanation: This is a specific memory with age, location, people involved, and meaningful outcome.
 
 Input: "Scientists believe that climate change will cause significant problems in the future."
-Output: {{
+Output: {
     "fact": "NOEPISODICEVENT"
-}}
+}
 Explanation: This is general knowledge/prediction, not a specific episodic event.
 
 Input: "I love watching movies on weekends with my family."
-Output: {{
+Output: {
     "fact": "NOEPISODICEVENT"
-}}
+}
 Explanation: This is a habitual activity without a specific instance.
 
 Input: "During my college graduation ceremony in 2019, my cap fell off while I was walking across the stage to receive my diploma, and everyone laughed."
-Output: {{
+Output: {
     "fact": "Cap fell off while receiving diploma at college graduation ceremony in 2019"
-}}
+}
 Explanation: This is a specific event with time, place, and memorable incident.
 
 ## Your Task:
@@ -139,11 +88,90 @@ Analyze the following text and extract any episodic memory event according to th
 Text to analyze:
 
 '''
-{user_messages}
+${user_messages}
 '''
-"""
+""", input_budgets={"user_messages": 1024})
 
-        response = self.groq_client.chat.completions.create(
+class EpisodicEventProcessor:
+    """
+    A processor class for detecting and storing episodic memory events from conversations.
+
+    This class analyzes conversations to identify specific, memorable events that qualify as
+    episodic memories - those containing temporal context, location, or personal involvement.
+    Detected events are stored in a vector database for later retrieval and context.
+
+    Attributes:
+    EPISODIC_VECTARA_CORPUS_KEY (str): Constant defining the corpus key for episodic memories.
+    groq_client_pool (GroqClientPool): Shared Groq clients.
+    groq_client (Groq): Instance of Groq client for language processing.
+    groq_interaction_model_id (str): Model ID for event detection.
+    llm_response_cache (LlmResponseCache): Optional cache of deterministic LLM responses.
+    vectara_service: Service for vector database operations.
+    event_loop (EventLoopThread): Loop running detection and storage as coroutines, None to use a processing thread.
+    content_queue (Queue): Queue for processing memory events asynchronously.
+
+    Example:
+    ```python
+    processor = EpisodicEventProcessor(
+        groq_api_key="your_key",
+        groq_interaction_model_id="model_id",
+        vectara_service=vectara_service
+    )
+
+    # Process conversation for episodic events
+    processor.handle_content_request([
+        {"role": "user", "content": "Last summer, I visited Paris for the first time..."},
+        {"role": "assistant", "content": "That sounds wonderful! How was it?"},
+        {"role": "user", "content": "The Eiffel Tower was amazing at sunset..."}
+    ])
+    ```
+    """
+    EPISODIC_VECTARA_CORPUS_KEY = "casey_episodic"
+    
+    def __init__(self, groq_api_key, groq_interaction_model_id, vectara_service, llm_response_cache=None, groq_client_pool=None, event_loop=None):
+        self.groq_client_pool = groq_client_pool or GroqClientPool(groq_api_key)
+        self.groq_client = self.groq_client_pool.client
+        self.groq_interaction_model_id = groq_interaction_model_id
+        self.llm_response_cache = llm_response_cache
+        self.vectara_service = vectara_service
+        self.event_loop = event_loop
+        self.content_queue = Queue()
+        if event_loop is None:
+            self.__start_processing_thread()
+
+    def __start_processing_thread(self):
+        """Start background thread for content processing"""
+        def process_queue():
+            current_lane.set(BACKGROUND)
+            while True:
+                request = self.content_queue.get()
+                try:
+                    self.__process_content(request)
+                except Exception as e:
+                    print(f"Error processing content: {e}")
+                    traceback.print_exc()
+                self.content_queue.task_done()
+                
+        thread = threading.Thread(target=process_queue, daemon=True)
+        thread.start()
+
+    async def __aprocess_messages(self, messages):
+        """Coroutine detecting and storing the episodic event of a conversation"""
+        current_lane.set(BACKGROUND)
+        params = await self.__adetect_episodic_memory_parameters(self.__user_messages_json(messages))
+        request = EpisodicEventRegistrationRequest(
+            id=str(uuid.uuid4()),
+            params=params
+        )
+        await asyncio.to_thread(self.__process_content, request)
+
+    def __user_messages_json(self, messages):
+        user_msgs = [msg for msg in messages if msg["role"] == "user"] 
+        return json.dumps(user_msgs, indent=4)
+
+    def __episodic_memory_request(self, user_messages) -> dict:
+        prompt = EPISODIC_MEMORY_PROMPT.render(user_messages=user_messages)
+        return dict(
                 messages=[{"role": "user", "content": prompt}],
                 model=self.groq_interaction_model_id,
                 max_tokens=1024,
@@ -152,11 +180,20 @@ Text to analyze:
                 response_format={"type": "json_object"}
                 )
 
-        result = response.choices[0].message.content
+    def __detect_episodic_memory_parameters(self, user_messages):
+        result = complete(self.groq_client, self.llm_response_cache, **self.__episodic_memory_request(user_messages))
+
         parsed_result = json.loads(result)
         print('[EpisodicEventProcessor] __detect_episodic_memory_parameters.parsed_result', parsed_result)
         return parsed_result
 
+    async def __adetect_episodic_memory_parameters(self, user_messages):
+        result = await acomplete(self.groq_client_pool.async_client, self.llm_response_cache, **self.__episodic_memory_request(user_messages))
+
+        parsed_result = json.loads(result)
+        print('[EpisodicEventProcessor] __adetect_episodic_memory_parameters.parsed_result', parsed_result)
+        return parsed_result
+
     def __process_content(self, request: EpisodicEventRegistrationRequest) -> str:
         if request.params['fact'] == 'NOEPISODICEVENT':
             return
@@ -164,10 +201,12 @@ Text to analyze:
         self.vectara_service.add_document_to_corpus(self.EPISODIC_VECTARA_CORPUS_KEY, request.params['fact'], {}, document_parts)
 
     def handle_content_request(self, messages):
-        user_msgs = [msg for msg in messages if msg["role"] == "user"] 
-        user_msgs_json = json.dumps(user_msgs, indent=4)
+        if self.event_loop:
+            # Detection runs in the background too, so it does not hold up the reply
+            self.event_loop.spawn(self.__aprocess_messages(list(messages)))
+            return
 
-        params = self.__detect_episodic_memory_parameters(user_msgs_json)
+        params = self.__detect_episodic_memory_parameters(self.__user_messages_json(messages))
         request = EpisodicEventRegistrationRequest(
             id=str(uuid.uuid4()),
             params=params
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class EventLoopThread:
+    """
+    An asyncio event loop running on a daemon thread, shared by the processors in async mode.
+
+    Content jobs run as coroutines on this one loop instead of on a thread per processor, so
+    dozens of them can wait on the Groq API concurrently. Calls to the synchronous services
+    (news, Vectara, Telegram, image and video APIs) are offloaded with `asyncio.to_thread`, which
+    uses the loop's default executor: one bounded thread pool shared by every job.
+
+    Attributes:
+    loop (asyncio.AbstractEventLoop): The event loop.
+    executor (ThreadPoolExecutor): Default executor for blocking calls.
+    thread (threading.Thread): Thread running the loop.
+
+    Example:
+    ```python
+    event_loop = EventLoopThread(max_blocking_workers=16)
+
+    answer = event_loop.run(interaction_manager.ahandle_message(messages, message, intent_input))
+    event_loop.spawn(processor.aprocess_request(request))
+    ```
+    """
+    def __init__(self, max_blocking_workers=16, name="casey-event-loop"):
+        self.loop = asyncio.new_event_loop()
+        self.executor = ThreadPoolExecutor(max_workers=max_blocking_workers, thread_name_prefix="blocking-call")
+        self.loop.set_default_executor(self.executor)
+        self.thread = threading.Thread(target=self.__run, name=name, daemon=True)
+        self.thread.start()
+
+    def __run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coroutine):
+        """Schedule a coroutine on the loop from any thread and return its concurrent Future"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine, timeout=None):
+        """Run a coroutine on the loop and wait for its result from a synchronous caller"""
+        return self.submit(coroutine).result(timeout)
+
+    def spawn(self, coroutine):
+        """Schedule a background job; its errors are printed since nobody waits for it"""
+        def report(future):
+            if not future.cancelled() and future.exception():
+                error = future.exception()
+                print(f"Error processing content: {error}")
+                traceback.print_exception(type(error), error, error.__traceback__)
+
+        future = self.submit(coroutine)
+        future.add_done_callback(report)
+        return future
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,57 @@
+import threading
+
+import httpx
+from groq import Groq, AsyncGroq
+
+from .llm_gateway import LlmGateway
+
+
+class GroqClientPool:
+    """
+    One synchronous and one asynchronous Groq client, shared by the interaction manager and the
+    processors.
+
+    Each client owns a single httpx connection pool, so every component reuses the same
+    keep-alive connections to the API instead of opening a pool per component. The async
+    client is created on first use; it must only be used from one event loop (see
+    EventLoopThread). Both clients send their completions through `llm_gateway`, which
+    rate limits, retries and prioritizes them, so the SDK's own retries are disabled.
+
+    Attributes:
+    api_key (str): Groq API key.
+    limits (httpx.Limits): Connection pool limits of each client.
+    timeout (float): Request timeout in seconds.
+    llm_gateway (LlmGateway): Gate of every completion sent by the clients.
+    client (Groq): The shared synchronous client, behind the gateway.
+    async_client (AsyncGroq): The shared asynchronous client, behind the gateway.
+
+    Example:
+    ```python
+    groq_client_pool = GroqClientPool("your_key", max_connections=100)
+
+    response = groq_client_pool.client.chat.completions.create(...)
+    response = await groq_client_pool.async_client.chat.completions.create(...)
+    ```
+    """
+    def __init__(self, api_key, max_connections=100, max_keepalive_connections=20, timeout=60.0, llm_gateway=None):
+        self.api_key = api_key
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections)
+        self.timeout = timeout
+        self.llm_gateway = llm_gateway or LlmGateway()
+        self.client = self.llm_gateway.wrap(
+            Groq(api_key=api_key, max_retries=0, http_client=httpx.Client(limits=self.limits, timeout=timeout))
+        )
+        self.__async_client = None
+        self.__lock = threading.Lock()
+
+    @property
+    def async_client(self) -> AsyncGroq:
+        if self.__async_client is None:
+            with self.__lock:
+                if self.__async_client is None:
+                    self.__async_client = self.llm_gateway.awrap(AsyncGroq(
+                        api_key=self.api_key,
+                        max_retries=0,
+                        http_client=httpx.AsyncClient(limits=self.limits, timeout=self.timeout),
+                    ))
+        return self.__async_client
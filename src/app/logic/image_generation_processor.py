@@ -1,13 +1,18 @@
 import json
 import uuid
+import asyncio
 import traceback
 import threading
 from queue import Queue
 from datetime import datetime
 
-from groq import Groq
 from dataclasses import dataclass
 
+from .groq_client_pool import GroqClientPool
+from .llm_response_cache import complete, acomplete
+from .llm_gateway import current_lane, BACKGROUND
+from .prompt_registry import prompt_registry
+
 @dataclass
 class ImageGenerationRequest:
     id: str
@@ -15,6 +20,32 @@ class ImageGenerationRequest:
     status: str = "pending"
     created_at: datetime = datetime.now()
 
+IMAGE_PARAMETERS_PROMPT = prompt_registry.register("image_parameters", """You are a helpful assistant that extracts, infers, or formulates image generation prompts from user messages for AI image generators like DALL-E, Stable Diffusion, or FLUX.1.
+
+Your task is to:
+1. Extract or infer the key visual elements and descriptive details from the user's message
+2. Format these details into a clear, detailed prompt suitable for AI image generation
+3. Return the information in a JSON format
+
+Guidelines for prompt creation:
+- Specify important details about lighting, perspective, and composition when relevant
+- Maintain artistic coherence in the description
+- Preserve the user's core intent and desired outcome
+
+Return format:
+{
+    "image_gen_prompt": string or null
+}
+
+Extract image generation prompt from this message:
+
+'''
+**${main_topic}: ${context}**
+
+${user_message}
+'''
+""", input_budgets={"user_message": 256})
+
 class ImageGenerationProcessor:
     """
     A processor class for generating AI images using natural language descriptions.
@@ -24,11 +55,14 @@ class ImageGenerationProcessor:
     It handles requests asynchronously and delivers results via Telegram notifications.
 
     Attributes:
+    groq_client_pool (GroqClientPool): Shared Groq clients.
     groq_client (Groq): Instance of Groq client for language processing.
     groq_interaction_model_id (str): Model ID for parameter detection.
+    llm_response_cache (LlmResponseCache): Optional cache of deterministic LLM responses.
     groq_notification_model_id (str): Model ID for notification messages.
     telegram_service: Service for sending notifications.
     open_ai_service: Service for AI image generation.
+    event_loop (EventLoopThread): Loop running image jobs as coroutines, None to use a processing thread.
     content_queue (Queue): Queue for processing image requests asynchronously.
 
     Example:
@@ -52,18 +86,23 @@ class ImageGenerationProcessor:
     ```
     """
     
-    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, open_ai_service):
-        self.groq_client = Groq(api_key=groq_api_key)
+    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, open_ai_service, llm_response_cache=None, groq_client_pool=None, event_loop=None):
+        self.groq_client_pool = groq_client_pool or GroqClientPool(groq_api_key)
+        self.groq_client = self.groq_client_pool.client
         self.groq_interaction_model_id = groq_interaction_model_id
+        self.llm_response_cache = llm_response_cache
         self.groq_notification_model_id = groq_notification_model_id
         self.telegram_service = telegram_service
         self.open_ai_service = open_ai_service
+        self.event_loop = event_loop
         self.content_queue = Queue()
-        self.__start_processing_thread()
+        if event_loop is None:
+            self.__start_processing_thread()
 
     def __start_processing_thread(self):
         """Start background thread for content processing"""
         def process_queue():
+            current_lane.set(BACKGROUND)
             while True:
                 request = self.content_queue.get()
                 try:
@@ -77,34 +116,21 @@ class ImageGenerationProcessor:
         thread = threading.Thread(target=process_queue, daemon=True)
         thread.start()
 
-    def __detect_image_parameters(self, topic:dict, user_message:str):               
-        prompt = f"""You are a helpful assistant that extracts, infers, or formulates image generation prompts from user messages for AI image generators like DALL-E, Stable Diffusion, or FLUX.1.
-
-Your task is to:
-1. Extract or infer the key visual elements and descriptive details from the user's message
-2. Format these details into a clear, detailed prompt suitable for AI image generation
-3. Return the information in a JSON format
-
-Guidelines for prompt creation:
-- Specify important details about lighting, perspective, and composition when relevant
-- Maintain artistic coherence in the description
-- Preserve the user's core intent and desired outcome
-
-Return format:
-{{
-    "image_gen_prompt": string or null
-}}
-
-Extract image generation prompt from this message:
-
-'''
-**{topic['main_topic']}: {topic['context']}**
-
-{user_message}
-'''
-"""
-
-        response = self.groq_client.chat.completions.create(
+    async def __aprocess_request(self, request: ImageGenerationRequest):
+        """Coroutine counterpart of the processing thread's work for one request"""
+        current_lane.set(BACKGROUND)
+        content = await asyncio.to_thread(self.__process_content, request)
+        await asyncio.to_thread(self.telegram_service.send_message, content)
+
+    def __enqueue(self, request: ImageGenerationRequest):
+        if self.event_loop:
+            self.event_loop.spawn(self.__aprocess_request(request))
+        else:
+            self.content_queue.put(request)
+
+    def __image_parameters_request(self, topic: dict, user_message: str) -> dict:
+        prompt = IMAGE_PARAMETERS_PROMPT.render(main_topic=topic['main_topic'], context=topic['context'], user_message=user_message)
+        return dict(
                 messages=[{"role": "user", "content": prompt}],
                 model=self.groq_interaction_model_id,
                 max_tokens=192,
@@ -113,13 +139,22 @@ Extract image generation prompt from this message:
                 response_format={"type": "json_object"}
                 )
 
-        result = response.choices[0].message.content
+    def __detect_image_parameters(self, topic:dict, user_message:str):
+        result = complete(self.groq_client, self.llm_response_cache, **self.__image_parameters_request(topic, user_message))
+
         parsed_result = json.loads(result)
         print(parsed_result)
         return parsed_result
 
+    async def __adetect_image_parameters(self, topic: dict, user_message: str):
+        result = await acomplete(self.groq_client_pool.async_client, self.llm_response_cache, **self.__image_parameters_request(topic, user_message))
 
-    def __generate_processing_message(self, gen_params: dict, last_user_message: str) -> str:
+        parsed_result = json.loads(result)
+        print(parsed_result)
+        return parsed_result
+
+
+    def __processing_message_request(self, gen_params: dict, last_user_message: str) -> dict:
         prompt = f"""Generate an engaging and concise response about the image being generated that will be sent to the user's Telegram.
 
 **Mention general thoughts about the image concept based on these specific details:**
@@ -132,7 +167,7 @@ User's original message: '''{last_user_message}'
 3. Mention that they'll receive a notification when it's ready
 """
 
-        response = self.groq_client.chat.completions.create(
+        return dict(
                 messages=[{"role": "user", "content": prompt}],
                 model=self.groq_notification_model_id,
                 max_tokens=192,
@@ -140,8 +175,11 @@ User's original message: '''{last_user_message}'
                 frequency_penalty=1.1,
                 stream=False)
 
-        response_text = response.choices[0].message.content
-        return response_text
+    def __generate_processing_message(self, gen_params: dict, last_user_message: str) -> str:
+        return complete(self.groq_client, **self.__processing_message_request(gen_params, last_user_message))
+
+    async def __agenerate_processing_message(self, gen_params: dict, last_user_message: str) -> str:
+        return await acomplete(self.groq_client_pool.async_client, **self.__processing_message_request(gen_params, last_user_message))
 
     def __process_content(self, request: ImageGenerationRequest) -> str:
         return self.open_ai_service.generate_image(request.gen_params['image_gen_prompt'])
@@ -152,5 +190,15 @@ User's original message: '''{last_user_message}'
             id=str(uuid.uuid4()),
             gen_params=gen_params
         )
-        self.content_queue.put(request)
-        return self.__generate_processing_message(gen_params, last_user_message)
\ No newline at end of file
+        self.__enqueue(request)
+        return self.__generate_processing_message(gen_params, last_user_message)
+
+    async def ahandle_content_request(self, topic, last_user_message: str) -> str:
+        """Async counterpart of handle_content_request"""
+        gen_params = await self.__adetect_image_parameters(topic, last_user_message)
+        request = ImageGenerationRequest(
+            id=str(uuid.uuid4()),
+            gen_params=gen_params
+        )
+        self.__enqueue(request)
+        return await self.__agenerate_processing_message(gen_params, last_user_message)
\ No newline at end of file
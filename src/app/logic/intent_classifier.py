@@ -0,0 +1,166 @@
+import re
+import time
+import threading
+import traceback
+
+import numpy as np
+
+from .intent_examples import INTENT_EXAMPLES
+
+
+class IntentClassifier:
+    """
+    A local CPU intent classifier that answers the easy turns before the LLM intent call.
+
+    User turns are embedded with a small multilingual sentence-transformers model and classified
+    by a logistic regression trained on labelled examples (INTENT_EXAMPLES, which include the
+    examples of the intent detection prompt). Embedding and classifying a turn takes a few
+    milliseconds on CPU. Only conversational intents are answered locally, and only above
+    `confidence_threshold`: content-creation intents need the LLM to extract the topic, and
+    ambiguous turns are escalated too. A turn answering an offer of Casey ("yes, do it" after
+    "Shall I write an article about it?") depends on that offer, so it is escalated whenever the
+    closing sentence of Casey's previous reply classifies as a content request.
+
+    The model is loaded and trained on a background thread started by the first turn (or by
+    load()), so startup neither waits for it nor downloads it; until it is ready every turn is
+    escalated. `model_name` may be the path of a local copy of the model to avoid the download.
+
+    Attributes:
+    model_name (str): sentence-transformers model name or local path used for the embeddings.
+    confidence_threshold (float): Minimum predicted probability to answer locally.
+    local_intents (tuple): Intents that may be answered without the LLM.
+    examples (dict): Intent to list of example turns.
+    encoder (SentenceTransformer): The embedding model, None until ready.
+    classifier (LogisticRegression): The trained classifier, None until ready.
+    ready (threading.Event): Set once the classifier can be used.
+    loading (threading.Event): Set once loading has started.
+
+    Example:
+    ```python
+    intent_classifier = IntentClassifier(confidence_threshold=0.8)
+
+    intent, confidence = intent_classifier.classify("ok thanks")
+    intent_result = intent_classifier.predict("ok thanks", previous_reply="Glad I could help!")  # None means ask the LLM
+    ```
+    """
+    NOT_SPECIFIED_TOPIC = {
+        "main_topic": "not_specified",
+        "subtopics": [],
+        "target_audience": "not_specified",
+        "tone": "not_specified",
+        "complexity": "not_specified",
+        "context": "not_specified",
+    }
+
+    def __init__(
+        self,
+        model_name="paraphrase-multilingual-MiniLM-L12-v2",
+        confidence_threshold=0.8,
+        local_intents=("casual_conversation", "episodic_memory_event"),
+        examples=None,
+    ):
+        self.model_name = model_name
+        self.confidence_threshold = confidence_threshold
+        self.local_intents = local_intents
+        self.examples = examples or INTENT_EXAMPLES
+        self.encoder = None
+        self.classifier = None
+        self.ready = threading.Event()
+        self.loading = threading.Event()
+        self.loading_lock = threading.Lock()
+
+    def load(self) -> None:
+        """Start loading the embedding model and training the classifier in the background, once"""
+        with self.loading_lock:
+            if self.loading.is_set():
+                return
+            self.loading.set()
+
+        def train():
+            try:
+                start_time = time.perf_counter()
+                self.fit(self.examples)
+                print(f"[IntentClassifier] Trained on {sum(len(texts) for texts in self.examples.values())} examples in {time.perf_counter() - start_time:.1f}s")
+            except Exception as e:
+                print(f"Error training intent classifier: {e}")
+                traceback.print_exc()
+
+        thread = threading.Thread(target=train, daemon=True)
+        thread.start()
+
+    def __embed(self, texts: list) -> np.ndarray:
+        return self.encoder.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+
+    def fit(self, examples: dict) -> None:
+        """
+        Train the classifier on labelled examples.
+
+        Args:
+            examples (dict): Intent to list of example turns.
+        """
+        from sklearn.linear_model import LogisticRegression
+        from sentence_transformers import SentenceTransformer
+
+        if self.encoder is None:
+            self.encoder = SentenceTransformer(self.model_name, device="cpu")
+
+        texts = [text for texts in examples.values() for text in texts]
+        labels = [intent for intent, texts in examples.items() for _ in texts]
+        classifier = LogisticRegression(max_iter=1000, C=10, class_weight="balanced")
+        classifier.fit(self.__embed(texts), labels)
+
+        self.classifier = classifier
+        self.ready.set()
+
+    def classify(self, text: str):
+        """
+        Classify a user turn.
+
+        Args:
+            text (str): The user's latest message.
+
+        Returns:
+            tuple: (intent, probability), or (None, 0.0) while the classifier is not ready.
+        """
+        if not self.ready.is_set():
+            self.load()
+            return None, 0.0
+        probabilities = self.classifier.predict_proba(self.__embed([text]))[0]
+        best = int(np.argmax(probabilities))
+        return self.classifier.classes_[best], float(probabilities[best])
+
+    def offered_action(self, reply: str):
+        """
+        The closing sentence of an assistant reply when it offers a content request, e.g.
+        "Would you like me to write an article about it?".
+
+        Args:
+            reply (str): Casey's previous reply.
+
+        Returns:
+            str: The offer, or None if the reply ends conversationally.
+        """
+        sentences = re.findall(r"[^.!?¿¡]+[.!?]*", reply or "")
+        closing = sentences[-1].strip() if sentences else ""
+        if not closing.endswith("?"):
+            return None
+        intent, _ = self.classify(closing)
+        return closing if intent is not None and intent not in self.local_intents else None
+
+    def predict(self, text: str, previous_reply: str = None):
+        """
+        Answer a turn locally when it is confidently conversational and does not answer an offer.
+
+        Args:
+            text (str): The user's latest message.
+            previous_reply (str): Casey's reply before the message, if any.
+
+        Returns:
+            dict: An intent result like detect_intent_and_topic's, or None to escalate to the LLM.
+        """
+        if previous_reply and self.offered_action(previous_reply):
+            return None
+        intent, confidence = self.classify(text)
+        if intent not in self.local_intents or confidence < self.confidence_threshold:
+            return None
+        return {"intent": intent, "topic": dict(self.NOT_SPECIFIED_TOPIC), "confidence": confidence}
@@ -0,0 +1,123 @@
+# Labelled user turns for the local intent classifier, in the languages Casey speaks (en, es).
+# The first examples of each intent are the ones given in the intent detection prompt.
+INTENT_EXAMPLES = {
+    "casual_conversation": [
+        "What do you think about memes?",
+        "How does video editing work?",
+        "Let's talk about creativity",
+        "How do I create a video about quantum physics?",
+        "What's the best way to make a product video?",
+        "Can you help me plan my video?",
+        "Give me advice on making videos",
+        "What should I include in my video?",
+        "How can I generate AI images?",
+        "What makes a good image prompt?",
+        "Can you explain image generation?",
+        "I like presentations",
+        "Paris is beautiful",
+        "Product launches are stressful",
+        "How's the weather today?",
+        "Ok, thanks",
+        "Thank you so much",
+        "Hi Casey, how are you?",
+        "Good morning!",
+        "That's interesting, tell me more",
+        "Why do people like cats so much?",
+        "What's your favorite book?",
+        "Do you know any good jokes?",
+        "I'm not sure what to think about that",
+        "Who created you?",
+        "What is the meaning of life?",
+        "Can you recommend a movie for tonight?",
+        "Good night, Casey",
+        "Hola Casey, ¿cómo estás?",
+        "Gracias, muy amable",
+        "Ok, perfecto",
+        "¿Qué opinas de la inteligencia artificial?",
+        "¿Cómo funciona la edición de video?",
+        "Hablemos de filosofía",
+        "¿Me recomiendas un libro?",
+        "¿Cuál es la mejor forma de hacer un meme?",
+        "¿Qué hace bueno a un artículo?",
+        "Buenas noches",
+        "Cuéntame algo interesante",
+        "No estoy seguro de eso",
+    ],
+    "article_writing": [
+        "Give me a news update on the earthquake",
+        "Write an article about AI",
+        "Draft a blog post about climate change",
+        "Let's write an article about space exploration for children",
+        "Write a report on renewable energy trends",
+        "I need an essay about the history of jazz",
+        "Can you write a blog post about healthy breakfasts?",
+        "Prepare a news summary about the elections",
+        "Write me an article on the latest smartphone releases",
+        "Escribe un artículo sobre inteligencia artificial",
+        "Redacta un blog sobre el cambio climático",
+        "Dame las últimas noticias sobre el terremoto",
+        "Quiero un ensayo sobre la historia del cine",
+        "Escríbeme un reporte sobre energías renovables",
+    ],
+    "compose_social_media": [
+        "Write a tweet about the new product launch",
+        "Create an Instagram caption for this photo",
+        "Draft a LinkedIn post about our company milestone",
+        "Give me some hashtags for my travel post",
+        "Write a Facebook post announcing our sale",
+        "Compose a thread on X about remote work",
+        "Escribe un tuit sobre el lanzamiento del producto",
+        "Crea una descripción para Instagram de mi foto en la playa",
+        "Redacta un post de LinkedIn sobre mi nuevo trabajo",
+        "Dame hashtags para una publicación de comida",
+    ],
+    "create_video": [
+        "Create a video explaining quantum physics",
+        "Generate a video about my product",
+        "You create a video about the ocean",
+        "Make me a video that shows how coffee is made",
+        "Generate a short video of a rocket launch",
+        "Produce a video about healthy habits",
+        "Crea un video sobre física cuántica",
+        "Genera un video de mi producto",
+        "Hazme un video sobre el océano",
+        "Haz un video corto de un cohete despegando",
+    ],
+    "create_meme": [
+        "Make a meme about programming",
+        "Design a funny meme for social media",
+        "Create a meme about Mondays",
+        "Generate a meme about working from home",
+        "Make me a meme about cats and coffee",
+        "Haz un meme sobre programación",
+        "Crea un meme gracioso sobre los lunes",
+        "Genera un meme de trabajar desde casa",
+    ],
+    "generate_image": [
+        "Generate an image of a cat playing piano",
+        "Create a picture of a futuristic city in cyberpunk style",
+        "Draw a red dragon breathing fire, digital art style",
+        "Make an image of mountains at sunset, photorealistic",
+        "Paint a watercolor of a lighthouse in a storm",
+        "Create an illustration of a robot reading a book",
+        "Genera una imagen de un gato tocando el piano",
+        "Dibuja un dragón rojo escupiendo fuego",
+        "Crea una imagen de montañas al atardecer",
+        "Haz una ilustración de una ciudad futurista",
+    ],
+    "episodic_memory_event": [
+        "Last week I gave a presentation and felt really nervous",
+        "I visited Paris last summer and the Eiffel Tower was amazing",
+        "My team just launched our product and everyone was so excited",
+        "Yesterday I ran my first marathon and my legs still hurt",
+        "This morning my daughter took her first steps, I cried",
+        "I had dinner with my grandparents on Sunday and we laughed a lot",
+        "Today I got the job offer I was waiting for",
+        "Last night I couldn't sleep because the neighbors had a party",
+        "La semana pasada di una presentación y estaba muy nervioso",
+        "Ayer corrí mi primer maratón y terminé agotado",
+        "Hoy me dieron el trabajo que tanto quería",
+        "El verano pasado visité Cusco con mi familia y fue increíble",
+        "Esta mañana mi hijo dio sus primeros pasos",
+    ],
+}
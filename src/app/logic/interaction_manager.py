@@ -1,76 +1,23 @@
 import json
-from groq import Groq
+import threading
+from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
 
+from .llm_response_cache import complete, acomplete
+from .groq_client_pool import GroqClientPool
+from .event_loop_thread import EventLoopThread
+from .prompt_registry import prompt_registry
+from .intent_classifier import IntentClassifier
 from .meme_creation_processor import MemeCreationProcessor
+from .conversation_summarizer import ConversationSummarizer
 from .episodic_event_processor import EpisodicEventProcessor
 from .video_creation_processor import VideoCreationProcessor
 from .article_writing_processor import ArticleWritingProcessor
 from .image_generation_processor import ImageGenerationProcessor
 from .social_media_composing_processor import SocialMediaComposingProcessor
 
-class InteractionManager:
-    """
-    A manager class for handling different types of user interactions and content creation requests.
-
-    This class serves as a central coordinator for processing various types of user requests,
-    including article writing, social media content, memes, images, videos, and general
-    conversation. It uses AI-powered intent detection to route requests to appropriate
-    specialized processors.
-
-    Attributes:
-      client (Groq): Instance of Groq client for AI language processing.
-      groq_interaction_model_id (str): Model ID for main interactions.
-      groq_notification_model_id (str): Model ID for notification messages.
-      article_writing_processor: Processor for article creation.
-      social_media_composing_processor: Processor for social media content.
-      meme_creation_processor: Processor for meme generation.
-      image_generation_processor: Processor for image creation.
-      video_creation_processor: Processor for video generation.
-      episodic_event_processor: Processor for handling personal events/memories.
-
-    Example:
-      ```python
-      manager = InteractionManager(
-          groq_api_key="your_key",
-          groq_interaction_model_id="model_id",
-          groq_notification_model_id="notification_model_id",
-          telegram_service=telegram_service,
-          news_service=news_service,
-          vectara_service=vectara_service,
-          imgflip_service=imgflip_service,
-          open_ai_service=open_ai_service,
-          runway_service=runway_service,
-          semantic_memory_module=semantic_memory_module
-      )
-
-      # Process a user message
-      result = manager.handle_message(
-          messages=conversation_history,
-          last_user_message="Write an article about AI",
-          intent_result=detected_intent
-      )
-      ```
-    """
-    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, news_service, vectara_service, imgflip_service, open_ai_service, runway_service, semantic_memory_module):
-        self.client = Groq(api_key=groq_api_key)
-        self.groq_interaction_model_id = groq_interaction_model_id
-        self.groq_notification_model_id = groq_notification_model_id
-
-        self.article_writing_processor = ArticleWritingProcessor(groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, news_service, vectara_service, semantic_memory_module)
-        self.social_media_composing_processor = SocialMediaComposingProcessor(groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, news_service, vectara_service)
-        self.meme_creation_processor = MemeCreationProcessor(groq_api_key, groq_interaction_model_id, groq_notification_model_id, imgflip_service, telegram_service)
-        self.image_generation_processor = ImageGenerationProcessor(groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, open_ai_service)
-        self.video_creation_processor = VideoCreationProcessor(groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, open_ai_service, runway_service)
-        self.episodic_event_processor = EpisodicEventProcessor(groq_api_key, groq_interaction_model_id, vectara_service)
-        
-    def detect_intent_and_topic(self, input: str) -> dict:
-        """
-        Detect intent and detailed topic information from user input using a Large Language Model.
-        Returns a dictionary containing the detected intent and rich topic details.
-        """
-        prompt = '''You are Casey, an AI assistant that analyzes user input to detect both intent and detailed topic information. You will identify only one intent - the most recent and clearly understandable one - along with its associated topic.
-
-# INTENTS:
+# Shared by the intent detection prompt and the combined intent and reply prompt
+INTENT_DEFINITIONS = '''# INTENTS:
 
 1. "casual_conversation"
    - Triggers: General questions, discussions, small talk, opinions
@@ -167,7 +114,12 @@ class InteractionManager:
 4. If intent is unclear, default to "casual_conversation"
 5. Maintain context awareness to avoid intent confusion
 
-# EXAMPLE OUTPUTS:
+'''
+
+# Intent inputs are the latest user turns; the budget keeps a long dictation from inflating the prompt
+INTENT_DETECTION_PROMPT = prompt_registry.register("intent_detection", '''You are Casey, an AI assistant that analyzes user input to detect both intent and detailed topic information. You will identify only one intent - the most recent and clearly understandable one - along with its associated topic.
+
+''' + INTENT_DEFINITIONS + '''# EXAMPLE OUTPUTS:
 
 For "Let's write an article about space exploration, I would like to explain to children the relationship of stars' distance and their colors":
 {
@@ -209,10 +161,147 @@ For "How's the weather today?":
 }
 
 Input: """${input}"""
-Return a JSON object about a single and latest intent and detailed topic information.'''
+Return a JSON object about a single and latest intent and detailed topic information.''', input_budgets={"input": 256})
 
-        response = self.client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt.replace("${input}", input)}],
+INTENT_AND_REPLY_PROMPT = prompt_registry.register("intent_and_reply", '''Before answering, detect the intent and topic of the latest user message. You will identify only one intent - the most recent and clearly understandable one - along with its associated topic.
+
+''' + INTENT_DEFINITIONS + '''# REPLY:
+
+- When the intent is "casual_conversation" or "episodic_memory_event", "reply" is your answer to the latest user message, written exactly as you would answer it following all the instructions above. It will be spoken aloud.
+- For any other intent, "reply" is an empty string: the request is handed to a dedicated process that answers it.
+
+# OUTPUT:
+
+Return only a JSON object:
+{
+    "intent": string,
+    "topic": {
+        "main_topic": string,
+        "subtopics": [string],
+        "target_audience": string,
+        "tone": string,
+        "complexity": string,
+        "context": string
+    },
+    "reply": string
+}''')
+
+class SpeculativeStream:
+    """
+    Pumps a chunk iterator on a background worker so a streamed reply can start before it is
+    known to be needed. Iterating yields the buffered chunks and then the live ones; cancel()
+    stops the pump and discards the stream.
+    """
+    END = object()
+
+    def __init__(self, executor, chunks):
+        self.chunks_queue = Queue()
+        self.cancelled = threading.Event()
+        self.error = None
+        self.future = executor.submit(self.__pump, chunks)
+
+    def __pump(self, chunks):
+        try:
+            for chunk in chunks:
+                if self.cancelled.is_set():
+                    break
+                self.chunks_queue.put(chunk)
+        except Exception as e:
+            self.error = e
+        finally:
+            chunks.close()
+            self.chunks_queue.put(self.END)
+
+    def cancel(self):
+        self.cancelled.set()
+        self.future.cancel()
+
+    def __iter__(self):
+        while True:
+            chunk = self.chunks_queue.get()
+            if chunk is self.END:
+                if self.error:
+                    raise self.error
+                return
+            yield chunk
+
+class InteractionManager:
+    """
+    A manager class for handling different types of user interactions and content creation requests.
+
+    This class serves as a central coordinator for processing various types of user requests,
+    including article writing, social media content, memes, images, videos, and general
+    conversation. It uses AI-powered intent detection to route requests to appropriate
+    specialized processors.
+
+    Attributes:
+      groq_client_pool (GroqClientPool): Groq clients shared with the processors, the semantic memory module and the summarizer.
+      client (Groq): Instance of Groq client for AI language processing.
+      groq_interaction_model_id (str): Model ID for main interactions.
+      groq_notification_model_id (str): Model ID for notification messages.
+      llm_response_cache (LlmResponseCache): Optional cache of deterministic LLM responses, shared with the processors.
+      article_writing_processor: Processor for article creation.
+      social_media_composing_processor: Processor for social media content.
+      meme_creation_processor: Processor for meme generation.
+      image_generation_processor: Processor for image creation.
+      video_creation_processor: Processor for video generation.
+      episodic_event_processor: Processor for handling personal events/memories.
+      conversation_summarizer: Summarizer for turns evicted from the conversation window.
+      intent_classifier: Local classifier answering confidently conversational turns, None if disabled.
+      event_loop (EventLoopThread): Loop running the processors as coroutines in async mode, None otherwise.
+
+    Example:
+      ```python
+      manager = InteractionManager(
+          groq_api_key="your_key",
+          groq_interaction_model_id="model_id",
+          groq_notification_model_id="notification_model_id",
+          telegram_service=telegram_service,
+          news_service=news_service,
+          vectara_service=vectara_service,
+          imgflip_service=imgflip_service,
+          open_ai_service=open_ai_service,
+          runway_service=runway_service,
+          semantic_memory_module=semantic_memory_module
+      )
+
+      # Process a user message
+      result = manager.handle_message(
+          messages=conversation_history,
+          last_user_message="Write an article about AI",
+          intent_result=detected_intent
+      )
+      ```
+    """
+    CONVERSATIONAL_INTENTS = ("casual_conversation", "episodic_memory_event")
+
+    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, news_service, vectara_service, imgflip_service, open_ai_service, runway_service, semantic_memory_module, local_intent_classification=True, llm_response_cache=None, async_mode=False, groq_client_pool=None, intent_classifier_model=None):
+        self.groq_client_pool = groq_client_pool or GroqClientPool(groq_api_key)
+        self.client = self.groq_client_pool.client
+        self.groq_interaction_model_id = groq_interaction_model_id
+        self.groq_notification_model_id = groq_notification_model_id
+        self.llm_response_cache = llm_response_cache
+        self.speculation_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="speculative-reply")
+        # In async mode the processors run their jobs as coroutines on this loop instead of on a thread each
+        self.event_loop = EventLoopThread() if async_mode else None
+        pool, loop = self.groq_client_pool, self.event_loop
+
+        self.article_writing_processor = ArticleWritingProcessor(groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, news_service, vectara_service, semantic_memory_module, groq_client_pool=pool, event_loop=loop)
+        self.social_media_composing_processor = SocialMediaComposingProcessor(groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, news_service, vectara_service, groq_client_pool=pool, event_loop=loop)
+        self.meme_creation_processor = MemeCreationProcessor(groq_api_key, groq_interaction_model_id, groq_notification_model_id, imgflip_service, telegram_service, llm_response_cache, groq_client_pool=pool, event_loop=loop)
+        self.image_generation_processor = ImageGenerationProcessor(groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, open_ai_service, llm_response_cache, groq_client_pool=pool, event_loop=loop)
+        self.video_creation_processor = VideoCreationProcessor(groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, open_ai_service, runway_service, llm_response_cache, groq_client_pool=pool, event_loop=loop)
+        self.episodic_event_processor = EpisodicEventProcessor(groq_api_key, groq_interaction_model_id, vectara_service, llm_response_cache, groq_client_pool=pool, event_loop=loop)
+        self.conversation_summarizer = ConversationSummarizer(groq_api_key, groq_notification_model_id, groq_client_pool=pool)
+        self.intent_classifier = None
+        if local_intent_classification:
+            # A model name or a local path, the model is only loaded on the first turn
+            self.intent_classifier = IntentClassifier(model_name=intent_classifier_model) if intent_classifier_model else IntentClassifier()
+        self.intent_sources = {"local": 0, "llm": 0}
+        
+    def __intent_detection_request(self, input: str) -> dict:
+        return dict(
+            messages=[{"role": "user", "content": INTENT_DETECTION_PROMPT.render(input=input)}],
             model=self.groq_interaction_model_id,
             max_tokens=300,
             temperature=0,
@@ -221,7 +310,12 @@ Return a JSON object about a single and latest intent and detailed topic informa
             response_format={"type": "json_object"},
         )
 
-        result = response.choices[0].message.content
+    def detect_intent_and_topic(self, input: str) -> dict:
+        """
+        Detect intent and detailed topic information from user input using a Large Language Model.
+        Returns a dictionary containing the detected intent and rich topic details.
+        """
+        result = complete(self.client, self.llm_response_cache, **self.__intent_detection_request(input))
         print(f"Detected: {result}")
 
         # Parse and validate the response
@@ -238,9 +332,74 @@ Return a JSON object about a single and latest intent and detailed topic informa
         #     )
 
         return parsed_result
+
+    async def adetect_intent_and_topic(self, input: str) -> dict:
+        """Async counterpart of detect_intent_and_topic"""
+        result = await acomplete(self.groq_client_pool.async_client, self.llm_response_cache, **self.__intent_detection_request(input))
+        print(f"Detected: {result}")
+        return json.loads(result)
     
-    def handle_conversation(self, messages):
-        chat_completion = self.client.chat.completions.create(
+    def detect_intent(self, input: str, last_user_message: str, previous_reply: str = None) -> dict:
+        """
+        Detect the intent of a turn, locally when the intent classifier is confident and with
+        detect_intent_and_topic otherwise (ambiguous turns, content requests, which need the
+        topic details, and answers to an offer of Casey).
+
+        Args:
+            input (str): Recent conversation given to detect_intent_and_topic.
+            last_user_message (str): The latest user message, classified locally.
+            previous_reply (str): Casey's reply before the message, if any.
+
+        Returns:
+            dict: The detected intent and topic.
+        """
+        intent_result = self.__detect_intent_locally(last_user_message, previous_reply)
+        if intent_result:
+            return intent_result
+        self.intent_sources["llm"] += 1
+        offer = self.intent_classifier.offered_action(previous_reply) if self.intent_classifier and previous_reply else None
+        if offer:
+            # The user turns alone do not say what "yes, do it" agrees to
+            input = f"{input}\n\n(replying to Casey: \"{offer}\")"
+        return self.detect_intent_and_topic(input)
+
+    def __detect_intent_locally(self, last_user_message: str, previous_reply: str = None):
+        """The intent classifier's result when it is confident, None to ask the LLM"""
+        if not self.intent_classifier:
+            return None
+        intent_result = self.intent_classifier.predict(last_user_message, previous_reply)
+        if intent_result:
+            self.intent_sources["local"] += 1
+            print(f"Detected locally: {intent_result['intent']} ({intent_result['confidence']:.2f})")
+        return intent_result
+
+    def detect_intent_and_reply(self, messages) -> dict:
+        """
+        Detect the intent and topic of the latest user message and, for conversational intents,
+        answer it, all in one JSON-mode completion over the conversation.
+
+        Args:
+            messages (list): Conversation history, ending with the user message.
+
+        Returns:
+            dict: The intent, the topic and the reply (empty for content requests).
+        """
+        response = self.client.chat.completions.create(
+            messages=list(messages) + [{"role": "system", "content": INTENT_AND_REPLY_PROMPT.render()}],
+            model=self.groq_interaction_model_id,
+            max_tokens=1324,
+            top_p=0.1,
+            frequency_penalty=1.1,
+            stream=False,
+            response_format={"type": "json_object"},
+        )
+
+        parsed_result = json.loads(response.choices[0].message.content)
+        print(f"Detected: {parsed_result.get('intent')} {parsed_result.get('topic')}")
+        return parsed_result
+
+    def __conversation_request(self, messages) -> dict:
+        return dict(
             messages=messages,
             model=self.groq_interaction_model_id,
             max_tokens=1024,
@@ -248,9 +407,32 @@ Return a JSON object about a single and latest intent and detailed topic informa
             stream=False,
             frequency_penalty=1.1
         )
-        return chat_completion.choices[0].message.content
+
+    def handle_conversation(self, messages):
+        return complete(self.client, **self.__conversation_request(messages))
+
+    async def ahandle_conversation(self, messages):
+        return await acomplete(self.groq_client_pool.async_client, **self.__conversation_request(messages))
+
+    def stream_conversation(self, messages):
+        """Same completion as handle_conversation, yielding text chunks as they are generated"""
+        stream = self.client.chat.completions.create(
+            messages=messages,
+            model=self.groq_interaction_model_id,
+            max_tokens=1024,
+            top_p=0.1,
+            stream=True,
+            frequency_penalty=1.1
+        )
+        for chunk in stream:
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
    
     def handle_message(self, messages, last_user_message, intent_result: dict) -> str:
+        if self.event_loop:
+            return self.event_loop.run(self.ahandle_message(messages, last_user_message, intent_result))
+
         intent = intent_result["intent"]
         
         if intent == "article_writing":
@@ -271,3 +453,135 @@ Return a JSON object about a single and latest intent and detailed topic informa
         elif intent == "casual_conversation":
             return self.handle_conversation(messages)
         # Handle other intents...
+
+    async def ahandle_message(self, messages, last_user_message, intent_result: dict) -> str:
+        """
+        Coroutine counterpart of handle_message, run on the event loop in async mode. The
+        processors acknowledge the request with the async Groq client and leave their content
+        job running on the loop.
+        """
+        intent = intent_result["intent"]
+
+        if intent == "article_writing":
+            return await self.article_writing_processor.ahandle_content_request(intent_result["topic"], last_user_message)
+        elif intent == "compose_social_media":
+            return await self.social_media_composing_processor.ahandle_content_request(intent_result["topic"], last_user_message)
+        elif intent == "create_meme":
+            return await self.meme_creation_processor.ahandle_content_request(last_user_message)
+        elif intent == "generate_image":
+            return await self.image_generation_processor.ahandle_content_request(intent_result["topic"], last_user_message)
+        elif intent == "create_video":
+            print('[InteractionManager] Calling video_creation_processor.ahandle_content_request')
+            return await self.video_creation_processor.ahandle_content_request(intent_result["topic"], last_user_message)
+        elif intent == "episodic_memory_event":
+            print('[InteractionManager] Calling episodic_event_processor.handle_content_request')
+            # Schedules the memory detection on the loop and returns right away
+            self.episodic_event_processor.handle_content_request(messages)
+            return await self.ahandle_conversation(messages)
+        elif intent == "casual_conversation":
+            return await self.ahandle_conversation(messages)
+
+    def handle_message_stream(self, messages, last_user_message, intent_result: dict):
+        """
+        Streaming counterpart of handle_message. Conversational answers are yielded token by token
+        while they are generated, processor acknowledgements are yielded as a single chunk.
+        """
+        intent = intent_result["intent"]
+
+        if intent == "episodic_memory_event":
+            print('[InteractionManager] Calling episodic_event_processor.handle_content_request')
+            self.episodic_event_processor.handle_content_request(messages)
+            yield from self.stream_conversation(messages)
+        elif intent == "casual_conversation":
+            yield from self.stream_conversation(messages)
+        else:
+            yield self.handle_message(messages, last_user_message, intent_result)
+
+    def handle_message_speculatively(self, messages, last_user_message, intent_input: str, stream: bool = False, on_intent=None, previous_reply: str = None):
+        """
+        Detect the intent and, at the same time, start the conversational reply.
+
+        Casual turns are the most common ones, so the reply is requested speculatively alongside
+        intent detection instead of after it. When the intent turns out to be conversational
+        (casual_conversation or episodic_memory_event) the speculative reply is used, otherwise
+        it is cancelled and the message is routed to its processor as usual.
+
+        Args:
+            messages (list): Conversation history, ending with the user message.
+            last_user_message (str): The latest user message.
+            intent_input (str): Text given to detect_intent_and_topic.
+            stream (bool): Return the answer as an iterator of text chunks.
+            on_intent (callable): Optional callback receiving the intent result as soon as it is detected.
+            previous_reply (str): Casey's reply before the user message, see detect_intent.
+
+        Returns:
+            tuple: (intent_result, answer) where answer is a str, or an iterator of str chunks when stream is True.
+        """
+        messages = list(messages)
+        if stream:
+            speculative_reply = SpeculativeStream(self.speculation_executor, self.stream_conversation(messages))
+        else:
+            speculative_reply = self.speculation_executor.submit(self.handle_conversation, messages)
+
+        try:
+            intent_result = self.detect_intent(intent_input, last_user_message, previous_reply)
+        except Exception:
+            speculative_reply.cancel()
+            raise
+        if on_intent:
+            on_intent(intent_result)
+
+        if intent_result["intent"] in self.CONVERSATIONAL_INTENTS:
+            if intent_result["intent"] == "episodic_memory_event":
+                print('[InteractionManager] Calling episodic_event_processor.handle_content_request')
+                self.episodic_event_processor.handle_content_request(messages)
+            return intent_result, speculative_reply if stream else speculative_reply.result()
+
+        # Not a conversational turn, the speculative reply is discarded
+        speculative_reply.cancel()
+        answer = self.handle_message(messages, last_user_message, intent_result)
+        return intent_result, iter([answer]) if stream else answer
+
+    def handle_message_combined(self, messages, last_user_message, stream: bool = False, on_intent=None):
+        """
+        Detect the intent and answer conversational turns with a single structured completion.
+
+        Casual turns otherwise take two round trips, one to classify and one to answer. Here
+        detect_intent_and_reply returns the intent, the topic and the reply together; the reply
+        is used when the intent is conversational, and content requests are routed to their
+        processor as usual. Turns the local intent classifier is confident about skip the
+        structured call and are answered directly. The structured reply arrives whole, so when
+        stream is True it is yielded as a single chunk.
+
+        Args:
+            messages (list): Conversation history, ending with the user message.
+            last_user_message (str): The latest user message.
+            stream (bool): Return the answer as an iterator of text chunks.
+            on_intent (callable): Optional callback receiving the intent result as soon as it is detected.
+
+        Returns:
+            tuple: (intent_result, answer) where answer is a str, or an iterator of str chunks when stream is True.
+        """
+        intent_result = self.__detect_intent_locally(last_user_message)
+        if intent_result:
+            if on_intent:
+                on_intent(intent_result)
+            if stream:
+                return intent_result, self.handle_message_stream(messages, last_user_message, intent_result)
+            return intent_result, self.handle_message(messages, last_user_message, intent_result)
+
+        self.intent_sources["llm"] += 1
+        result = self.detect_intent_and_reply(messages)
+        intent_result = {"intent": result.get("intent", "casual_conversation"), "topic": result.get("topic") or dict(IntentClassifier.NOT_SPECIFIED_TOPIC)}
+        if on_intent:
+            on_intent(intent_result)
+
+        if intent_result["intent"] in self.CONVERSATIONAL_INTENTS:
+            if intent_result["intent"] == "episodic_memory_event":
+                print('[InteractionManager] Calling episodic_event_processor.handle_content_request')
+                self.episodic_event_processor.handle_content_request(messages)
+            # A conversational turn without a reply falls back to the usual completion
+            answer = result.get("reply") or self.handle_conversation(messages)
+        else:
+            answer = self.handle_message(messages, last_user_message, intent_result)
+        return intent_result, iter([answer]) if stream else answer
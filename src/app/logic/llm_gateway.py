@@ -0,0 +1,312 @@
+import time
+import heapq
+import random
+import asyncio
+import itertools
+import threading
+import contextvars
+from types import SimpleNamespace
+from contextlib import contextmanager
+
+import groq
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+# Lane of the Groq calls made in the current thread or task. Calls answering the user are
+# interactive by default, the processing threads and content jobs switch to the background lane.
+current_lane = contextvars.ContextVar("llm_lane", default=INTERACTIVE)
+
+
+class TokenBucket:
+    """
+    Requests per minute allowed to one model, refilled continuously.
+
+    A request takes a token only when one is available above the floor of its lane, and is
+    otherwise told how long to wait before asking again, so the bucket never goes into debt.
+    The floor of background requests is `reserve`: they never take the bucket below it, which
+    keeps that headroom for interactive requests however much background work is queued.
+    """
+    def __init__(self, requests_per_minute, reserve=0.0):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(requests_per_minute)
+        self.reserve = reserve
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self, lane) -> float:
+        """Take a token and return 0, or take nothing and return the seconds to wait before trying again"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            floor = self.reserve if lane == BACKGROUND else 0.0
+            if self.tokens >= floor + 1.0:
+                self.tokens -= 1.0
+                return 0.0
+            return (floor + 1.0 - self.tokens) / self.rate
+
+
+class _Waiter:
+    __slots__ = ("lane", "event", "loop", "future", "granted", "cancelled")
+
+    def __init__(self, lane, loop=None):
+        self.lane = lane
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+        self.granted = False
+        self.cancelled = False
+
+    def grant(self):
+        self.granted = True
+        if self.loop:
+            self.loop.call_soon_threadsafe(lambda: self.future.done() or self.future.set_result(None))
+        else:
+            self.event.set()
+
+
+class LlmGateway:
+    """
+    A single gate for every Groq chat completion, synchronous and asynchronous.
+
+    Each call first takes a concurrency slot. At most `max_concurrency` requests are in flight,
+    background requests may only use `max_concurrency - interactive_slots` of them, and queued
+    interactive requests are always granted a slot before queued background ones. It then takes
+    a token from the bucket of its model, so the per-model requests-per-minute limit is respected
+    instead of discovered through 429 errors. A call that has to wait for a token gives its slot
+    back while it waits and queues for one again afterwards, and so does a call waiting to be
+    retried. Rate limited (429), server (5xx) and connection errors are retried with exponential
+    backoff and jitter, honouring the Retry-After header when the API sends one. Streamed
+    completions hold their slot until the response starts.
+
+    The lane of a call comes from `current_lane`, so the callers keep calling
+    `chat.completions.create` on the clients returned by `wrap` and `awrap`.
+
+    Attributes:
+    requests_per_minute (int): Default rate limit of a model.
+    model_requests_per_minute (dict): Rate limits of specific models.
+    max_concurrency (int): Maximum number of requests in flight.
+    interactive_slots (int): Slots background requests can not use.
+    max_retries (int): Retries of a failed request.
+    base_delay (float): First backoff delay in seconds, doubled on each retry.
+    max_delay (float): Longest backoff delay in seconds.
+    buckets (dict): Model ID to TokenBucket.
+    active (list): Requests in flight per lane.
+    waiters (list): Heap of (lane, sequence, _Waiter) waiting for a slot.
+    counters (dict): Calls, retries, failures and waited seconds per lane.
+
+    Example:
+    ```python
+    llm_gateway = LlmGateway(requests_per_minute=30, max_concurrency=8)
+    client = llm_gateway.wrap(Groq(api_key="your_key", max_retries=0))
+
+    response = client.chat.completions.create(model="llama-3.3-70b-versatile", messages=messages)
+
+    with llm_gateway.lane(BACKGROUND):
+        response = client.chat.completions.create(model="llama-3.3-70b-versatile", messages=messages)
+    print(llm_gateway.stats())
+    ```
+    """
+    LANE_NAMES = ("interactive", "background")
+
+    def __init__(self, requests_per_minute=30, model_requests_per_minute=None, max_concurrency=8, interactive_slots=2, max_retries=4, base_delay=0.5, max_delay=20.0):
+        self.requests_per_minute = requests_per_minute
+        self.model_requests_per_minute = model_requests_per_minute or {}
+        self.max_concurrency = max_concurrency
+        self.interactive_slots = min(interactive_slots, max_concurrency - 1)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.buckets = {}
+        self.active = [0, 0]
+        self.waiters = []
+        self.sequence = itertools.count()
+        self.lock = threading.Lock()
+        self.counters = {name: {"calls": 0, "retries": 0, "failures": 0, "queued_seconds": 0.0, "throttled_seconds": 0.0} for name in self.LANE_NAMES}
+
+    @contextmanager
+    def lane(self, lane):
+        """Run the Groq calls of the block in `lane`"""
+        token = current_lane.set(lane)
+        try:
+            yield self
+        finally:
+            current_lane.reset(token)
+
+    def __bucket(self, model) -> TokenBucket:
+        with self.lock:
+            if model not in self.buckets:
+                requests_per_minute = self.model_requests_per_minute.get(model, self.requests_per_minute)
+                self.buckets[model] = TokenBucket(requests_per_minute, reserve=requests_per_minute * 0.2)
+            return self.buckets[model]
+
+    def __can_start(self, lane) -> bool:
+        if sum(self.active) >= self.max_concurrency:
+            return False
+        return lane == INTERACTIVE or self.active[BACKGROUND] < self.max_concurrency - self.interactive_slots
+
+    def __try_start(self, lane) -> bool:
+        # Called with the lock held; waiters of the same or a higher priority lane go first
+        if self.__can_start(lane) and not any(waiter.lane <= lane and not waiter.cancelled for _, _, waiter in self.waiters):
+            self.active[lane] += 1
+            return True
+        return False
+
+    def __release(self, lane):
+        with self.lock:
+            self.active[lane] -= 1
+            while self.waiters:
+                waiter = self.waiters[0][2]
+                if waiter.cancelled:
+                    heapq.heappop(self.waiters)
+                elif self.__can_start(waiter.lane):
+                    heapq.heappop(self.waiters)
+                    self.active[waiter.lane] += 1
+                    waiter.grant()
+                else:
+                    break
+
+    def __enqueue(self, waiter):
+        heapq.heappush(self.waiters, (waiter.lane, next(self.sequence), waiter))
+
+    def __acquire(self, lane):
+        start_time = time.perf_counter()
+        with self.lock:
+            if self.__try_start(lane):
+                return
+            waiter = _Waiter(lane)
+            self.__enqueue(waiter)
+        waiter.event.wait()
+        self.__record(lane, "queued_seconds", time.perf_counter() - start_time)
+
+    async def __aacquire(self, lane):
+        start_time = time.perf_counter()
+        with self.lock:
+            if self.__try_start(lane):
+                return
+            waiter = _Waiter(lane, asyncio.get_running_loop())
+            self.__enqueue(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self.lock:
+                waiter.cancelled = True
+                granted = waiter.granted
+            if granted:
+                self.__release(lane)
+            raise
+        self.__record(lane, "queued_seconds", time.perf_counter() - start_time)
+
+    def __retry_delay(self, error, attempt):
+        """Seconds to wait before retrying `error`, None when it must not be retried"""
+        status_code = getattr(error, "status_code", None)
+        if isinstance(status_code, int):
+            if status_code != 429 and status_code < 500:
+                return None
+        elif not isinstance(error, groq.APIConnectionError):
+            return None
+        if attempt >= self.max_retries:
+            return None
+
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        try:
+            return min(self.max_delay, float(retry_after))
+        except (TypeError, ValueError):
+            return min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def __record(self, lane, key, value=1):
+        with self.lock:
+            self.counters[self.LANE_NAMES[lane]][key] += value
+
+    def __start(self, lane, bucket):
+        """Hold a concurrency slot and a token of `bucket`; no slot is held while waiting for the token"""
+        while True:
+            self.__acquire(lane)
+            delay = bucket.take(lane)
+            if not delay:
+                return
+            self.__release(lane)
+            self.__record(lane, "throttled_seconds", delay)
+            time.sleep(delay)
+
+    async def __astart(self, lane, bucket):
+        while True:
+            await self.__aacquire(lane)
+            delay = bucket.take(lane)
+            if not delay:
+                return
+            self.__release(lane)
+            self.__record(lane, "throttled_seconds", delay)
+            await asyncio.sleep(delay)
+
+    def create(self, create, **params):
+        """
+        Run `create(**params)` through the gate.
+
+        Args:
+            create (callable): A client's `chat.completions.create`.
+            **params: The keyword arguments of `chat.completions.create`.
+
+        Returns:
+            The response of `create`.
+        """
+        lane = current_lane.get()
+        bucket = self.__bucket(params.get("model"))
+        self.__record(lane, "calls")
+        for attempt in itertools.count():
+            self.__start(lane, bucket)
+            try:
+                return create(**params)
+            except Exception as e:
+                retry_delay = self.__retry_delay(e, attempt)
+                if retry_delay is None:
+                    self.__record(lane, "failures")
+                    raise
+                print(f"[LlmGateway] {type(e).__name__} on {params.get('model')}, retrying in {retry_delay:.1f}s")
+                self.__record(lane, "retries")
+            finally:
+                self.__release(lane)
+            time.sleep(retry_delay)
+
+    async def acreate(self, create, **params):
+        """Async counterpart of create, for an AsyncGroq client's `chat.completions.create`"""
+        lane = current_lane.get()
+        bucket = self.__bucket(params.get("model"))
+        self.__record(lane, "calls")
+        for attempt in itertools.count():
+            await self.__astart(lane, bucket)
+            try:
+                return await create(**params)
+            except Exception as e:
+                retry_delay = self.__retry_delay(e, attempt)
+                if retry_delay is None:
+                    self.__record(lane, "failures")
+                    raise
+                print(f"[LlmGateway] {type(e).__name__} on {params.get('model')}, retrying in {retry_delay:.1f}s")
+                self.__record(lane, "retries")
+            finally:
+                self.__release(lane)
+            await asyncio.sleep(retry_delay)
+
+    def wrap(self, client):
+        """A stand-in for `client` whose `chat.completions.create` goes through the gate"""
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+            create=lambda **params: self.create(client.chat.completions.create, **params)
+        )))
+
+    def awrap(self, async_client):
+        """A stand-in for `async_client` whose `chat.completions.create` goes through the gate"""
+        async def create(**params):
+            return await self.acreate(async_client.chat.completions.create, **params)
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                name: dict(self.counters[name], active=self.active[lane], queued=sum(1 for _, _, waiter in self.waiters if waiter.lane == lane and not waiter.cancelled))
+                for lane, name in enumerate(self.LANE_NAMES)
+            }
@@ -0,0 +1,209 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class LlmResponseCache:
+    """
+    A two-tier cache of Groq chat completions that are fully determined by their inputs.
+
+    Intent detection and the parameter extractors of the processors run at or near temperature 0,
+    so the same messages sent to the same model with the same sampling parameters give the same
+    answer. Their responses are stored under the SHA-256 of the model, the messages and every
+    other request parameter: first in an in-memory LRU of `max_entries`, then on disk as one
+    JSON file per response, so retried and repeated inputs skip the network round trip across
+    restarts too. Entries older than `ttl_seconds` are ignored and removed. Requests sampled
+    above `max_temperature` and streamed requests are never cached.
+
+    Attributes:
+    folder (str): Folder holding the on-disk tier, None to keep responses in memory only.
+    max_entries (int): Maximum number of responses kept in memory.
+    max_disk_entries (int): Maximum number of responses kept on disk.
+    ttl_seconds (float): Age after which a response is no longer served.
+    max_temperature (float): Highest sampling temperature that is cached.
+    memory_entries (OrderedDict): Cache key to (created_at, content), least recently used first.
+    disk_entries (OrderedDict): Cache keys on disk, least recently used first.
+    hits (dict): Number of lookups served by each tier ("memory", "disk").
+    misses (int): Number of lookups that called the model.
+    lock (threading.Lock): Serializes lookups, inserts and evictions.
+
+    Example:
+    ```python
+    llm_response_cache = LlmResponseCache("logic/data/llm_cache", ttl_seconds=24 * 3600)
+
+    result = llm_response_cache.complete(
+        groq_client,
+        messages=[{"role": "user", "content": prompt}],
+        model="llama-3.3-70b-versatile",
+        temperature=0,
+        response_format={"type": "json_object"},
+    )
+    print(llm_response_cache.stats())
+    ```
+    """
+    def __init__(self, folder=None, max_entries=512, max_disk_entries=10000, ttl_seconds=24 * 3600, max_temperature=0.1):
+        self.folder = os.path.abspath(folder) if folder else None
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_temperature = max_temperature
+        self.memory_entries = OrderedDict()
+        self.disk_entries = OrderedDict()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        if self.folder:
+            os.makedirs(self.folder, exist_ok=True)
+            files = [
+                (entry.stat().st_mtime, entry.name[:-len(".json")])
+                for entry in os.scandir(self.folder)
+                if entry.name.endswith(".json")
+            ]
+            self.disk_entries = OrderedDict((key, None) for _, key in sorted(files))
+            self.__evict_disk()
+
+    def __key(self, params: dict) -> str:
+        return hashlib.sha256(json.dumps(params, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}.json")
+
+    def __remove_from_disk(self, key: str):
+        self.disk_entries.pop(key, None)
+        try:
+            os.remove(self.__path(key))
+        except FileNotFoundError:
+            pass
+
+    def __evict_disk(self):
+        while len(self.disk_entries) > self.max_disk_entries:
+            key = next(iter(self.disk_entries))
+            self.__remove_from_disk(key)
+
+    def __expired(self, created_at: float) -> bool:
+        return time.time() - created_at > self.ttl_seconds
+
+    def cacheable(self, params: dict) -> bool:
+        return not params.get("stream") and params.get("temperature", 1.0) <= self.max_temperature
+
+    def get(self, params: dict):
+        """
+        Look up the response to a chat completion request.
+
+        Args:
+            params (dict): The keyword arguments of `chat.completions.create`.
+
+        Returns:
+            str: The cached message content, or None on a miss.
+        """
+        key = self.__key(params)
+        with self.lock:
+            entry = self.memory_entries.get(key)
+            if entry and not self.__expired(entry[0]):
+                self.memory_entries.move_to_end(key)
+                self.hits["memory"] += 1
+                return entry[1]
+            self.memory_entries.pop(key, None)
+
+            if key in self.disk_entries:
+                try:
+                    with open(self.__path(key), "r", encoding="utf-8") as f:
+                        record = json.load(f)
+                except (FileNotFoundError, ValueError):
+                    record = None
+
+                if record and not self.__expired(record["created_at"]):
+                    os.utime(self.__path(key))
+                    self.disk_entries.move_to_end(key)
+                    self.__put_in_memory(key, record["created_at"], record["content"])
+                    self.hits["disk"] += 1
+                    return record["content"]
+                self.__remove_from_disk(key)
+
+            self.misses += 1
+            return None
+
+    def __put_in_memory(self, key: str, created_at: float, content: str):
+        self.memory_entries[key] = (created_at, content)
+        self.memory_entries.move_to_end(key)
+        while len(self.memory_entries) > self.max_entries:
+            self.memory_entries.popitem(last=False)
+
+    def put(self, params: dict, content: str) -> None:
+        """Store the response to a chat completion request in both tiers"""
+        key = self.__key(params)
+        created_at = time.time()
+        with self.lock:
+            self.__put_in_memory(key, created_at, content)
+            if not self.folder:
+                return
+
+            # Written to a temporary file and renamed, readers never see a partial file
+            temporary_path = self.__path(key) + ".tmp"
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                json.dump({"created_at": created_at, "model": params.get("model"), "content": content}, f, ensure_ascii=False)
+            os.replace(temporary_path, self.__path(key))
+            self.disk_entries[key] = None
+            self.disk_entries.move_to_end(key)
+            self.__evict_disk()
+
+    def complete(self, client, **params) -> str:
+        """
+        Run a chat completion through the cache.
+
+        Args:
+            client (Groq): Client used on a miss.
+            **params: The keyword arguments of `chat.completions.create`.
+
+        Returns:
+            str: The message content of the first choice.
+        """
+        if not self.cacheable(params):
+            return client.chat.completions.create(**params).choices[0].message.content
+
+        content = self.get(params)
+        if content is None:
+            content = client.chat.completions.create(**params).choices[0].message.content
+            self.put(params, content)
+        return content
+
+    async def acomplete(self, async_client, **params) -> str:
+        """Async counterpart of complete, for an AsyncGroq client"""
+        if not self.cacheable(params):
+            return (await async_client.chat.completions.create(**params)).choices[0].message.content
+
+        content = self.get(params)
+        if content is None:
+            content = (await async_client.chat.completions.create(**params)).choices[0].message.content
+            self.put(params, content)
+        return content
+
+    def stats(self) -> dict:
+        hits = sum(self.hits.values())
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.hits["memory"],
+            "disk_hits": self.hits["disk"],
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory_entries),
+            "disk_entries": len(self.disk_entries),
+        }
+
+
+def complete(client, llm_response_cache=None, **params) -> str:
+    """Run a chat completion, through `llm_response_cache` when one is given"""
+    if llm_response_cache is None:
+        return client.chat.completions.create(**params).choices[0].message.content
+    return llm_response_cache.complete(client, **params)
+
+
+async def acomplete(async_client, llm_response_cache=None, **params) -> str:
+    """Async counterpart of complete, for an AsyncGroq client"""
+    if llm_response_cache is None:
+        return (await async_client.chat.completions.create(**params)).choices[0].message.content
+    return await llm_response_cache.acomplete(async_client, **params)
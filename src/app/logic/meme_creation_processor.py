@@ -1,13 +1,18 @@
 import json
 import uuid
+import asyncio
 import traceback
 import threading
 from queue import Queue
 from datetime import datetime
 
-from groq import Groq
 from dataclasses import dataclass
 
+from .groq_client_pool import GroqClientPool
+from .llm_response_cache import complete, acomplete
+from .llm_gateway import current_lane, BACKGROUND
+from .prompt_registry import prompt_registry
+
 @dataclass
 class MemeContentRequest:
     id: str
@@ -15,6 +20,30 @@ class MemeContentRequest:
     status: str = "pending"
     created_at: datetime = datetime.now()
 
+MEME_PARAMETERS_PROMPT = prompt_registry.register("meme_parameters", """You are a helpful assistant that extracts meme creation parameters from user messages.
+Available meme templates are: ${available_memes}
+
+Your task is to:
+1. Identify which meme template the user wants to use
+2. Extract the text they want for the top and bottom of the meme
+3. Return the information in a JSON format
+
+Rules:
+- If the user doesn't specify a meme template but their message implies a common meme format, suggest an appropriate template
+- If you can't confidently match to a template, return null for meme_name
+- The text should maintain the user's intent but can be adjusted to fit meme format
+- If you can't determine top or bottom text, return null for those fields
+
+Return format:
+{
+    "meme_name": string or null,
+    "top_text": string or null,
+    "bottom_text": string or null
+}
+
+Extract meme parameters from this message: '''${user_message}'''
+""", input_budgets={"user_message": 256})
+
 class MemeCreationProcessor:
     """
     A processor class for asynchronous meme creation using AI-powered text analysis.
@@ -24,11 +53,14 @@ class MemeCreationProcessor:
     and delivers results via Telegram notifications.
 
     Attributes:
+    groq_client_pool (GroqClientPool): Shared Groq clients.
     groq_client (Groq): Instance of Groq client for AI language processing.
     groq_interaction_model_id (str): Model ID for meme parameter detection.
+    llm_response_cache (LlmResponseCache): Optional cache of deterministic LLM responses.
     groq_notification_model_id (str): Model ID for notification messages.
     imgflip_service: Service for meme template management and creation.
     telegram_service: Service for sending notifications.
+    event_loop (EventLoopThread): Loop running meme jobs as coroutines, None to use a processing thread.
     content_queue (Queue): Queue for processing meme requests asynchronously.
 
     Example:
@@ -47,18 +79,23 @@ class MemeCreationProcessor:
     )
     ```
     """    
-    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, imgflip_service, telegram_service):
-        self.groq_client = Groq(api_key=groq_api_key)
+    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, imgflip_service, telegram_service, llm_response_cache=None, groq_client_pool=None, event_loop=None):
+        self.groq_client_pool = groq_client_pool or GroqClientPool(groq_api_key)
+        self.groq_client = self.groq_client_pool.client
         self.groq_interaction_model_id = groq_interaction_model_id
+        self.llm_response_cache = llm_response_cache
         self.groq_notification_model_id = groq_notification_model_id
         self.imgflip_service = imgflip_service
         self.telegram_service = telegram_service
+        self.event_loop = event_loop
         self.content_queue = Queue()
-        self.__start_processing_thread()
+        if event_loop is None:
+            self.__start_processing_thread()
 
     def __start_processing_thread(self):
         """Start background thread for content processing"""
         def process_queue():
+            current_lane.set(BACKGROUND)
             while True:
                 request = self.content_queue.get()
                 try:
@@ -72,34 +109,21 @@ class MemeCreationProcessor:
         thread = threading.Thread(target=process_queue, daemon=True)
         thread.start()
 
-    def __detect_meme_parameters(self, user_message):
-        available_memes = self.imgflip_service.list_two_box_meme_names()
-                
-        prompt = f"""You are a helpful assistant that extracts meme creation parameters from user messages.
-Available meme templates are: {', '.join(available_memes)}
-
-Your task is to:
-1. Identify which meme template the user wants to use
-2. Extract the text they want for the top and bottom of the meme
-3. Return the information in a JSON format
-
-Rules:
-- If the user doesn't specify a meme template but their message implies a common meme format, suggest an appropriate template
-- If you can't confidently match to a template, return null for meme_name
-- The text should maintain the user's intent but can be adjusted to fit meme format
-- If you can't determine top or bottom text, return null for those fields
-
-Return format:
-{{
-    "meme_name": string or null,
-    "top_text": string or null,
-    "bottom_text": string or null
-}}
-
-Extract meme parameters from this message: '''{user_message}'''
-"""
-
-        response = self.groq_client.chat.completions.create(
+    async def __aprocess_request(self, request: MemeContentRequest):
+        """Coroutine counterpart of the processing thread's work for one request"""
+        current_lane.set(BACKGROUND)
+        content = await asyncio.to_thread(self.__process_content, request)
+        await asyncio.to_thread(self.telegram_service.send_message, content)
+
+    def __enqueue(self, request: MemeContentRequest):
+        if self.event_loop:
+            self.event_loop.spawn(self.__aprocess_request(request))
+        else:
+            self.content_queue.put(request)
+
+    def __meme_parameters_request(self, available_memes, user_message) -> dict:
+        prompt = MEME_PARAMETERS_PROMPT.render(available_memes=", ".join(available_memes), user_message=user_message)
+        return dict(
                 messages=[{"role": "user", "content": prompt}],
                 model=self.groq_interaction_model_id,
                 max_tokens=100,
@@ -108,13 +132,24 @@ Extract meme parameters from this message: '''{user_message}'''
                 response_format={"type": "json_object"}
                 )
 
-        result = response.choices[0].message.content
+    def __detect_meme_parameters(self, user_message):
+        available_memes = self.imgflip_service.list_two_box_meme_names()
+        result = complete(self.groq_client, self.llm_response_cache, **self.__meme_parameters_request(available_memes, user_message))
+
         parsed_result = json.loads(result)
         print(parsed_result)
         return parsed_result
 
+    async def __adetect_meme_parameters(self, user_message):
+        available_memes = await asyncio.to_thread(self.imgflip_service.list_two_box_meme_names)
+        result = await acomplete(self.groq_client_pool.async_client, self.llm_response_cache, **self.__meme_parameters_request(available_memes, user_message))
 
-    def __generate_processing_message(self, meme_params: dict, last_user_message: str) -> str:
+        parsed_result = json.loads(result)
+        print(parsed_result)
+        return parsed_result
+
+
+    def __processing_message_request(self, meme_params: dict, last_user_message: str) -> dict:
         # """Generate an engaging response about content being processed"""
         prompt = f"""Generate an engaging and concise response about meme being created and will be sended to the user's Telegram.
 
@@ -130,7 +165,7 @@ Last user message: '''{last_user_message}'''
 3. Mention that they'll receive a notification when it's ready
 """
 
-        response = self.groq_client.chat.completions.create(
+        return dict(
                 messages=[{"role": "user", "content": prompt}],
                 model=self.groq_notification_model_id,
                 max_tokens=192,
@@ -138,8 +173,11 @@ Last user message: '''{last_user_message}'''
                 frequency_penalty=1.1,
                 stream=False)
 
-        response_text = response.choices[0].message.content
-        return response_text
+    def __generate_processing_message(self, meme_params: dict, last_user_message: str) -> str:
+        return complete(self.groq_client, **self.__processing_message_request(meme_params, last_user_message))
+
+    async def __agenerate_processing_message(self, meme_params: dict, last_user_message: str) -> str:
+        return await acomplete(self.groq_client_pool.async_client, **self.__processing_message_request(meme_params, last_user_message))
 
     def __process_content(self, request: MemeContentRequest) -> str:
         template = self.imgflip_service.find_template_by_name(request.meme_params['meme_name'])
@@ -152,5 +190,15 @@ Last user message: '''{last_user_message}'''
             id=str(uuid.uuid4()),
             meme_params=meme_params
         )
-        self.content_queue.put(request)
-        return self.__generate_processing_message(meme_params, last_user_message)
\ No newline at end of file
+        self.__enqueue(request)
+        return self.__generate_processing_message(meme_params, last_user_message)
+
+    async def ahandle_content_request(self, last_user_message: str) -> str:
+        """Async counterpart of handle_content_request"""
+        meme_params = await self.__adetect_meme_parameters(last_user_message)
+        request = MemeContentRequest(
+            id=str(uuid.uuid4()),
+            meme_params=meme_params
+        )
+        self.__enqueue(request)
+        return await self.__agenerate_processing_message(meme_params, last_user_message)
\ No newline at end of file
@@ -1,5 +1,4 @@
 import requests
-import pandas as pd
 import urllib.parse as urlparse
 from typing import List, Dict, Set
 
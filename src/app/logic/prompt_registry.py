@@ -0,0 +1,147 @@
+import re
+import threading
+
+
+class PromptTemplate:
+    """
+    A prompt compiled once into its static sections and `${name}` placeholders.
+
+    Rendering joins the precompiled sections with the inputs instead of rebuilding a
+    multi-kilobyte f-string or scanning it with `str.replace` on every call. The token count of
+    the static sections is computed once, so the prompt size of a call is known from the inputs
+    alone. Inputs with a budget in `input_budgets` are cut to that many tokens, keeping their
+    end, where the latest turn is.
+
+    Attributes:
+    name (str): Name the template is registered under.
+    template (str): The template text.
+    sections (list): Static text before, between and after the placeholders.
+    placeholders (list): Input names, in order of appearance.
+    input_budgets (dict): Input name to maximum tokens.
+    static_tokens (int): Token count of the static sections, None until first rendered.
+    calls (int): Number of renders.
+    prompt_tokens (int): Total prompt tokens rendered.
+    truncations (int): Number of inputs cut to their budget.
+    """
+    PLACEHOLDER = re.compile(r"\$\{(\w+)\}")
+
+    def __init__(self, registry, name, template, input_budgets=None):
+        self.registry = registry
+        self.name = name
+        self.template = template
+        parts = self.PLACEHOLDER.split(template)
+        self.sections = parts[0::2]
+        self.placeholders = parts[1::2]
+        self.input_budgets = input_budgets or {}
+        self.static_tokens = None
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.truncations = 0
+
+    def render(self, **inputs) -> str:
+        """
+        Fill the placeholders.
+
+        Args:
+            **inputs: Value of each placeholder.
+
+        Returns:
+            str: The prompt.
+        """
+        encoding = self.registry.encoding
+        if self.static_tokens is None:
+            self.static_tokens = sum(len(encoding.encode(section)) for section in self.sections)
+
+        values, input_tokens = {}, 0
+        for name in set(self.placeholders):
+            tokens = encoding.encode(str(inputs[name]))
+            budget = self.input_budgets.get(name)
+            if budget is not None and len(tokens) > budget:
+                tokens = tokens[-budget:]
+                values[name] = encoding.decode(tokens)
+                self.truncations += 1
+            else:
+                values[name] = str(inputs[name])
+            input_tokens += len(tokens) * self.placeholders.count(name)
+
+        self.calls += 1
+        self.prompt_tokens += self.static_tokens + input_tokens
+
+        parts = [self.sections[0]]
+        for name, section in zip(self.placeholders, self.sections[1:]):
+            parts.append(values[name])
+            parts.append(section)
+        return "".join(parts)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "static_tokens": self.static_tokens,
+            "avg_prompt_tokens": self.prompt_tokens / self.calls if self.calls else 0.0,
+            "truncations": self.truncations,
+        }
+
+
+class PromptRegistry:
+    """
+    The prompt templates of the interaction manager and the processors, by name.
+
+    Templates are compiled when they are registered, at import time; the tiktoken encoding used
+    for the token accounting is only loaded on the first render, so importing the processors
+    stays cheap. Token counts approximate the Groq model's tokenizer, like ConversationWindow's.
+
+    Attributes:
+    encoding_name (str): tiktoken encoding used to count tokens.
+    templates (dict): Template name to PromptTemplate.
+
+    Example:
+    ```python
+    GREETING_PROMPT = prompt_registry.register(
+        "greeting", "Greet the user, who said: '''${message}'''", input_budgets={"message": 128}
+    )
+
+    prompt = GREETING_PROMPT.render(message="Hi Casey!")
+    print(prompt_registry.stats())
+    ```
+    """
+    def __init__(self, encoding_name="cl100k_base"):
+        self.encoding_name = encoding_name
+        self.templates = {}
+        self.__encoding = None
+        self.__lock = threading.Lock()
+
+    @property
+    def encoding(self):
+        if self.__encoding is None:
+            with self.__lock:
+                if self.__encoding is None:
+                    import tiktoken
+                    self.__encoding = tiktoken.get_encoding(self.encoding_name)
+        return self.__encoding
+
+    def register(self, name: str, template: str, input_budgets=None) -> PromptTemplate:
+        """
+        Compile and register a template.
+
+        Args:
+            name (str): Unique template name.
+            template (str): Prompt text with `${name}` placeholders.
+            input_budgets (dict): Optional input name to maximum tokens.
+
+        Returns:
+            PromptTemplate: The compiled template.
+        """
+        if name in self.templates:
+            raise ValueError(f"Prompt template already registered: {name}")
+        prompt_template = PromptTemplate(self, name, template, input_budgets)
+        self.templates[name] = prompt_template
+        return prompt_template
+
+    def get(self, name: str) -> PromptTemplate:
+        return self.templates[name]
+
+    def stats(self) -> dict:
+        return {name: prompt_template.stats() for name, prompt_template in self.templates.items()}
+
+
+prompt_registry = PromptRegistry()
@@ -1,4 +1,5 @@
 import time
+import asyncio
 from runwayml import RunwayML
 
 
@@ -26,6 +27,9 @@ class RunwayService:
         
         # Retrieve the generated video
         video_url = service.retrieve_video(task_id)
+
+        # Or, on an event loop, without blocking a thread between polls
+        video_url = await service.aretrieve_video(task_id)
         ```
     """
     def __init__(self, api_secret: str):
@@ -38,27 +42,51 @@ class RunwayService:
         )
         return task.id
 
+    def check_video(self, task_id):
+        """
+        Check the status of a video generation task once.
+
+        Args:
+            task_id: ID of the video generation task
+
+        Returns:
+            str: URL of the generated video, or None while it is still being generated
+        """
+        result = self.runway_ml_client.tasks.retrieve(id=task_id)
+
+        if result.status == "SUCCEEDED":
+            return result.output[0]
+        elif result.status == "FAILED":
+            raise Exception("Video generation failed")
+        elif result.status in ["PENDING", "RUNNING"]:
+            print("Still processing runway video...")
+            return None
+        else:
+            raise Exception(f"Unknown status: {result.status}")
+
     def retrieve_video(self, task_id) -> str:
         """
         Poll for the video generation result and return the output URL when ready.
 
         Args:
-            client: RunwayML client instance
             task_id: ID of the video generation task
 
         Returns:
             str: URL of the generated video when complete
         """
         while True:
-            # Check the status of the generation
-            result = self.runway_ml_client.tasks.retrieve(id=task_id)
+            video_url = self.check_video(task_id)
+            if video_url:
+                return video_url
+            time.sleep(5)
 
-            if result.status == "SUCCEEDED":
-                return result.output[0]
-            elif result.status == "FAILED":
-                raise Exception("Video generation failed")
-            elif result.status in ["PENDING", "RUNNING"]:
-                print("Still processing runway video...")
-                time.sleep(5)
-            else:
-                raise Exception(f"Unknown status: {result.status}")
+    async def aretrieve_video(self, task_id) -> str:
+        """
+        Async counterpart of retrieve_video. Only each status request runs on a worker thread,
+        the wait between polls is an asyncio sleep that holds no thread.
+        """
+        while True:
+            video_url = await asyncio.to_thread(self.check_video, task_id)
+            if video_url:
+                return video_url
+            await asyncio.sleep(5)
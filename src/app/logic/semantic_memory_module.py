@@ -1,5 +1,8 @@
 import re
-from groq import Groq
+import asyncio
+
+from .groq_client_pool import GroqClientPool
+from .llm_response_cache import complete, acomplete
 
 class SemanticMemoryModule:
     """
@@ -11,8 +14,10 @@ class SemanticMemoryModule:
 
     Attributes:
         SEMANTIC_VECTARA_CORPUS_KEY (str): Constant defining the corpus key for semantic knowledge storage.
+        groq_client_pool (GroqClientPool): Shared Groq clients.
         groq_client (Groq): Instance of Groq client for AI model interactions.
         groq_interaction_model_id (str): Model ID for knowledge extraction.
+        llm_response_cache (LlmResponseCache): Optional cache of deterministic LLM responses.
         vectara_service: Service for vector database operations.
 
     Example:
@@ -34,12 +39,14 @@ class SemanticMemoryModule:
     """
     SEMANTIC_VECTARA_CORPUS_KEY = 'casey_semantic'
 
-    def __init__(self, groq_api_key, groq_interaction_model_id, vectara_service):
-        self.groq_client = Groq(api_key=groq_api_key)        
+    def __init__(self, groq_api_key, groq_interaction_model_id, vectara_service, llm_response_cache=None, groq_client_pool=None):
+        self.groq_client_pool = groq_client_pool or GroqClientPool(groq_api_key)
+        self.groq_client = self.groq_client_pool.client
         self.groq_interaction_model_id = groq_interaction_model_id
+        self.llm_response_cache = llm_response_cache
         self.vectara_service = vectara_service
         
-    def __extract_knowledge(self, content):
+    def __extraction_request(self, content) -> dict:
         prompt = f'''Extract ALL knowledge from the input text as a collection of completely independent and self-contained facts. Each fact should contain everything necessary to understand it without reference to other facts or external context.
 
 **Keep proper nouns ONLY when they are**:
@@ -96,7 +103,7 @@ Your final output should present only and only a simple numbered list of facts,
 """
 '''
 
-        chat_completion = self.groq_client.chat.completions.create(
+        return dict(
             messages=[
                 {
                     "role": "user",
@@ -110,8 +117,7 @@ Your final output should present only and only a simple numbered list of facts,
             stream=False
         )
 
-        facts_text = chat_completion.choices[0].message.content
-
+    def __parse_facts(self, facts_text):
         pattern = r"^\s*(\d+)\.\s+(.+?)(?=\n\s*\d+\.|$)"
         matches = re.finditer(pattern, facts_text, re.MULTILINE | re.DOTALL)
         facts = []
@@ -121,7 +127,21 @@ Your final output should present only and only a simple numbered list of facts,
 
         return facts
 
+    def __extract_knowledge(self, content):
+        facts_text = complete(self.groq_client, self.llm_response_cache, **self.__extraction_request(content))
+        return self.__parse_facts(facts_text)
+
+    async def __aextract_knowledge(self, content):
+        facts_text = await acomplete(self.groq_client_pool.async_client, self.llm_response_cache, **self.__extraction_request(content))
+        return self.__parse_facts(facts_text)
+
     def crystallize_knowledge(self, title, reason, source, content):
         fact_list = self.__extract_knowledge(content)
         fact_list_as_document_parts = [{'text': fact} for fact in fact_list]
-        self.vectara_service.add_document_to_corpus(self.SEMANTIC_VECTARA_CORPUS_KEY, title, { 'reason': reason, 'source': source }, fact_list_as_document_parts)    
\ No newline at end of file
+        self.vectara_service.add_document_to_corpus(self.SEMANTIC_VECTARA_CORPUS_KEY, title, { 'reason': reason, 'source': source }, fact_list_as_document_parts)
+
+    async def acrystallize_knowledge(self, title, reason, source, content):
+        """Async counterpart of crystallize_knowledge, the Vectara upload runs on the loop's executor"""
+        fact_list = await self.__aextract_knowledge(content)
+        fact_list_as_document_parts = [{'text': fact} for fact in fact_list]
+        await asyncio.to_thread(self.vectara_service.add_document_to_corpus, self.SEMANTIC_VECTARA_CORPUS_KEY, title, { 'reason': reason, 'source': source }, fact_list_as_document_parts)    
\ No newline at end of file
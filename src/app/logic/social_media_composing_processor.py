@@ -1,13 +1,17 @@
 import uuid
+import asyncio
 import traceback
 import threading
 from queue import Queue
 from datetime import datetime
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 
-from groq import Groq
 from dataclasses import dataclass
 
+from .groq_client_pool import GroqClientPool
+from .llm_response_cache import complete, acomplete
+from .llm_gateway import current_lane, BACKGROUND
+from .prompt_registry import prompt_registry
+
 @dataclass
 class SocialMediaCompositionRequest:
     id: str
@@ -16,6 +20,96 @@ class SocialMediaCompositionRequest:
     status: str = "pending"
     created_at: datetime = datetime.now()
 
+SOCIAL_MEDIA_PROCESSING_MESSAGE_PROMPT = prompt_registry.register("social_media_processing_message", """Generate an engaging and concise response about social media post being created and will be sended to the user's Telegram.
+
+**Avoid mentioning any general inclusions or outlines, please focus solely on the following specific topic details provided for social media post generation:**:
+Main topic: ${main_topic}
+Subtopics: ${subtopics}
+Target audience: ${target_audience}
+Tone: ${context}
+Conversation context: ${context}
+User's original message: '''${last_user_message}'''
+
+**The response should:**
+1. Acknowledge the content request
+2. Explain that it will take some time to create quality content
+3. Mention that they'll receive a notification when it's ready
+4. Be enthusiastic and engaging
+""", input_budgets={"last_user_message": 256})
+
+# The sources are fitted to SOURCES_TOKEN_BUDGET whole, by rank, before rendering
+SOCIAL_MEDIA_POST_PROMPT = prompt_registry.register("social_media_post", """# CONTEXT
+${sources}
+
+# INSTRUCTIONS:
+Create a social media post that:
+1. Addresses this hint from prior conversation: '''${conversation_context}'''
+2. Is related to the following user message: '''${last_user_message}'''
+3. Review points 1 and 2 to infer the target platform (Twitter, LinkedIn/Facebook, Instagram because that influences length and style)
+4. Infers emoji usage based on conversation context and message tone
+5. Answer only with the final result of the post, do NOT add any additional text related to the task encommeded to you
+
+# PLATFORM SPECIFICATIONS:
+Once platform is determined, follow these limits:
+- Twitter: Maximum 280 characters
+- LinkedIn: Optimal 1200-1500 characters
+- Facebook: Optimal 500-1000 characters
+- Instagram: Maximum 2200 characters
+
+# STRUCTURE BY PLATFORM:
+Apply appropriate structure after platform inference:
+
+Twitter:
+- Concise message
+- Hashtags (if requested)
+- Call to action (if needed)
+- Link (if applicable)
+
+LinkedIn/Facebook:
+- Hook/Opening line
+- Main message (2-3 short paragraphs)
+- Call to action
+- Relevant hashtags (if requested)
+
+Instagram:
+- Engaging opening
+- Message body
+- Hashtags (if requested)
+- Call to action
+
+# STYLE:
+- Audience: '${target_audience}'
+- Tone: '${tone}'
+- Complexity: '${complexity}'
+
+# FORMATTING:
+- Use line breaks appropriately for readability
+- Place hashtags according to platform best practices
+  - Twitter: Integrated into text
+  - Instagram: Below main content
+  - LinkedIn/Facebook: Minimal, integrated naturally
+- Match emoji style and frequency to inferred context
+
+# CONTENT GUIDELINES:
+- Start with attention-grabbing opening
+- Include clear call-to-action when appropriate
+- Use language appropriate to inferred platform
+- Incorporate keywords naturally
+- Keep message focused on single main point
+
+# TEMPLATE:
+
+[Engaging opening line]
+
+[Main message content]
+
+[Call to action]
+
+[Hashtags if appropriate]
+
+[Link if applicable]
+""", input_budgets={"conversation_context": 256, "last_user_message": 256})
+
 class SocialMediaComposingProcessor:
     """
     A processor class for generating AI-powered social media content using various services and APIs.
@@ -26,12 +120,15 @@ class SocialMediaComposingProcessor:
 
     Attributes:
         NEWS_VECTARA_CORPUS_KEY (str): Constant defining the corpus key for news articles.
+        SOURCES_TOKEN_BUDGET (int): Maximum tokens of news sources included in the post prompt.
+        groq_client_pool (GroqClientPool): Shared Groq clients.
         client (Groq): Instance of Groq client for AI model interactions.
         groq_interaction_model_id (str): Model ID for main content generation.
         groq_notification_model_id (str): Model ID for notification messages.
         telegram_service: Service for sending Telegram notifications.
         news_service: Service for fetching news articles.
         vectara_service: Service for vector search operations.
+        event_loop (EventLoopThread): Loop running composition jobs as coroutines, None to use a processing thread.
         content_queue (Queue): Queue for processing content requests asynchronously.
 
     Example:
@@ -60,8 +157,9 @@ class SocialMediaComposingProcessor:
         ```
     """
     NEWS_VECTARA_CORPUS_KEY = 'casey_news'
+    SOURCES_TOKEN_BUDGET = 6000
 
-    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, news_service, vectara_service):
+    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, news_service, vectara_service, groq_client_pool=None, event_loop=None):
         """
         Initialize the SocialMediaCompositionProcessor with required services and API keys.
 
@@ -72,19 +170,25 @@ class SocialMediaComposingProcessor:
             telegram_service: Service instance for Telegram notifications.
             news_service: Service instance for fetching news.
             vectara_service: Service instance for vector search operations.
+            groq_client_pool (GroqClientPool): Optional shared Groq clients.
+            event_loop (EventLoopThread): Optional loop to run composition jobs as coroutines on.
         """
-        self.client = Groq(api_key=groq_api_key)
+        self.groq_client_pool = groq_client_pool or GroqClientPool(groq_api_key)
+        self.client = self.groq_client_pool.client
         self.groq_interaction_model_id = groq_interaction_model_id
         self.groq_notification_model_id = groq_notification_model_id
         self.telegram_service = telegram_service
         self.news_service = news_service
         self.vectara_service = vectara_service
+        self.event_loop = event_loop
         self.content_queue = Queue()
-        self.__start_processing_thread()
+        if event_loop is None:
+            self.__start_processing_thread()
         
     def __start_processing_thread(self):
         """Start background thread for content processing"""
         def process_queue():
+            current_lane.set(BACKGROUND)
             while True:
                 request = self.content_queue.get()
                 try:
@@ -97,27 +201,30 @@ class SocialMediaComposingProcessor:
                 
         thread = threading.Thread(target=process_queue, daemon=True)
         thread.start()
-   
-    def __generate_processing_message(self, topic: dict, last_user_message: str) -> str:
-        """Generate an engaging response about content being processed"""
-        prompt = f"""Generate an engaging and concise response about social media post being created and will be sended to the user's Telegram.
-
-**Avoid mentioning any general inclusions or outlines, please focus solely on the following specific topic details provided for social media post generation:**:
-Main topic: {topic['main_topic']}
-Subtopics: {', '.join(topic['subtopics'])}
-Target audience: {topic['target_audience']}
-Tone: {topic['context']}
-Conversation context: {topic['context']}
-User's original message: '''{last_user_message}'''
 
-**The response should:**
-1. Acknowledge the content request
-2. Explain that it will take some time to create quality content
-3. Mention that they'll receive a notification when it's ready
-4. Be enthusiastic and engaging
-"""
+    async def __aprocess_request(self, request: SocialMediaCompositionRequest):
+        """Coroutine counterpart of the processing thread's work for one request"""
+        current_lane.set(BACKGROUND)
+        params = await asyncio.to_thread(self.__post_request, request)
+        content = await acomplete(self.groq_client_pool.async_client, **params)
+        await asyncio.to_thread(self.telegram_service.send_message, content)
+
+    def __enqueue(self, request: SocialMediaCompositionRequest):
+        if self.event_loop:
+            self.event_loop.spawn(self.__aprocess_request(request))
+        else:
+            self.content_queue.put(request)
+
+    def __processing_message_request(self, topic: dict, last_user_message: str) -> dict:
+        prompt = SOCIAL_MEDIA_PROCESSING_MESSAGE_PROMPT.render(
+            main_topic=topic['main_topic'],
+            subtopics=', '.join(topic['subtopics']),
+            target_audience=topic['target_audience'],
+            context=topic['context'],
+            last_user_message=last_user_message,
+        )
 
-        response = self.client.chat.completions.create(
+        return dict(
             messages=[{"role": "user", "content": prompt}],
             model=self.groq_notification_model_id,
             max_tokens=192,
@@ -126,7 +233,12 @@ User's original message: '''{last_user_message}'''
             stream=False,
         )
 
-        return response.choices[0].message.content
+    def __generate_processing_message(self, topic: dict, last_user_message: str) -> str:
+        """Generate an engaging response about content being processed"""
+        return complete(self.client, **self.__processing_message_request(topic, last_user_message))
+
+    async def __agenerate_processing_message(self, topic: dict, last_user_message: str) -> str:
+        return await acomplete(self.groq_client_pool.async_client, **self.__processing_message_request(topic, last_user_message))
     
     def __transform_sources_to_context(self, sources):
         """
@@ -168,6 +280,17 @@ User's original message: '''{last_user_message}'''
         
         return context
 
+    def __fit_sources(self, sources):
+        """The highest ranked sources whose texts fit in SOURCES_TOKEN_BUDGET, at least one"""
+        encoding = prompt_registry.encoding
+        fitted_sources, tokens = [], 0
+        for source in sources:
+            tokens += len(encoding.encode(source.get('text', '')))
+            if fitted_sources and tokens > self.SOURCES_TOKEN_BUDGET:
+                break
+            fitted_sources.append(source)
+        return fitted_sources
+
     # Example usage:
     def __create_prompt_with_context(self, sources, target_audience, tone, complexity, conversation_context, last_user_message):
         """
@@ -180,81 +303,18 @@ User's original message: '''{last_user_message}'''
         Returns:
             str: Complete prompt with context and instructions
         """
-        # Transform sources into context
-        context = self.__transform_sources_to_context(sources)
+        # Transform the sources that fit in the budget into context
+        context = self.__transform_sources_to_context(self.__fit_sources(sources))
         
         # Create the full prompt
-        prompt = f"""# CONTEXT
-{context}
-
-# INSTRUCTIONS:
-Create a social media post that:
-1. Addresses this hint from prior conversation: '''{conversation_context}'''
-2. Is related to the following user message: '''{last_user_message}'''
-3. Review points 1 and 2 to infer the target platform (Twitter, LinkedIn/Facebook, Instagram because that influences length and style)
-4. Infers emoji usage based on conversation context and message tone
-5. Answer only with the final result of the post, do NOT add any additional text related to the task encommeded to you
-
-# PLATFORM SPECIFICATIONS:
-Once platform is determined, follow these limits:
-- Twitter: Maximum 280 characters
-- LinkedIn: Optimal 1200-1500 characters
-- Facebook: Optimal 500-1000 characters
-- Instagram: Maximum 2200 characters
-
-# STRUCTURE BY PLATFORM:
-Apply appropriate structure after platform inference:
-
-Twitter:
-- Concise message
-- Hashtags (if requested)
-- Call to action (if needed)
-- Link (if applicable)
-
-LinkedIn/Facebook:
-- Hook/Opening line
-- Main message (2-3 short paragraphs)
-- Call to action
-- Relevant hashtags (if requested)
-
-Instagram:
-- Engaging opening
-- Message body
-- Hashtags (if requested)
-- Call to action
-
-# STYLE:
-- Audience: '{target_audience}'
-- Tone: '{tone}'
-- Complexity: '{complexity}'
-
-# FORMATTING:
-- Use line breaks appropriately for readability
-- Place hashtags according to platform best practices
-  - Twitter: Integrated into text
-  - Instagram: Below main content
-  - LinkedIn/Facebook: Minimal, integrated naturally
-- Match emoji style and frequency to inferred context
-
-# CONTENT GUIDELINES:
-- Start with attention-grabbing opening
-- Include clear call-to-action when appropriate
-- Use language appropriate to inferred platform
-- Incorporate keywords naturally
-- Keep message focused on single main point
-
-# TEMPLATE:
-
-[Engaging opening line]
-
-[Main message content]
-
-[Call to action]
-
-[Hashtags if appropriate]
-
-[Link if applicable]
-"""
+        prompt = SOCIAL_MEDIA_POST_PROMPT.render(
+            sources=context,
+            conversation_context=conversation_context,
+            last_user_message=last_user_message,
+            target_audience=target_audience,
+            tone=tone,
+            complexity=complexity,
+        )
 
         return prompt
     
@@ -274,6 +334,8 @@ Instagram:
             Input article format: [{'text': 'long article content...', ...}]
             Output format: [{'text': 'long article content...', 'chunks': [{'text': 'chunk1...'}, {'text': 'chunk2...'}], ...}]
         """
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1024,
             chunk_overlap=280,
@@ -284,8 +346,8 @@ Instagram:
             article['chunks'] = [{'text': chunk} for chunk in chunks if len(chunk) > 280]
         return [article for article in articles if article['chunks']]
 
-    def __process_content(self, request: SocialMediaCompositionRequest) -> str:
-        """Process content creation with various APIs and inference"""
+    def __post_request(self, request: SocialMediaCompositionRequest) -> dict:
+        """Gather the sources of a post and build its completion request"""
 
         main_topic_subtopics = [request.topic['context']] + [request.topic['main_topic']] + request.topic['subtopics']
         all_bing_articles = self.news_service.search_bing_news(main_topic_subtopics, 5)
@@ -312,7 +374,7 @@ Instagram:
 
         prompt = self.__create_prompt_with_context(sources, target_audience, tone, complexity, conversation_context, last_user_message)
 
-        response = self.client.chat.completions.create(
+        return dict(
             messages=[{"role": "user", "content": prompt}],
             model=self.groq_interaction_model_id,
             max_tokens=2048,
@@ -320,10 +382,14 @@ Instagram:
             frequency_penalty=1.1,
             stream=False,
         )
+
+    def __process_content(self, request: SocialMediaCompositionRequest) -> str:
+        """Process content creation with various APIs and inference"""
+        content = complete(self.client, **self.__post_request(request))
         
         # self.vectara_service.remove_all_documents_and_data_in_a_corpus(self.NEWS_VECTARA_CORPUS_KEY)
 
-        return response.choices[0].message.content
+        return content
     
     def handle_content_request(self, topic: dict, last_user_message: str) -> str:
         """
@@ -353,5 +419,15 @@ Instagram:
             topic=topic,
             last_user_message=last_user_message
         )
-        self.content_queue.put(request)
-        return self.__generate_processing_message(topic, last_user_message)
\ No newline at end of file
+        self.__enqueue(request)
+        return self.__generate_processing_message(topic, last_user_message)
+
+    async def ahandle_content_request(self, topic: dict, last_user_message: str) -> str:
+        """Async counterpart of handle_content_request"""
+        request = SocialMediaCompositionRequest(
+            id=str(uuid.uuid4()),
+            topic=topic,
+            last_user_message=last_user_message
+        )
+        self.__enqueue(request)
+        return await self.__agenerate_processing_message(topic, last_user_message)
\ No newline at end of file
@@ -1,7 +1,6 @@
 import json
 import uuid
 import requests
-import pandas as pd
 from langdetect import detect
 import urllib.parse as urlparse
 
@@ -97,6 +96,9 @@ class VectaraService:
         Returns:
             pandas.DataFrame: Search results in a DataFrame format.
         """
+        # Imported on use, pandas is slow to load
+        import pandas as pd
+
         url = f"https://api.vectara.io/v2/corpora/{corpus_key}/query?query={urlparse.quote(query)}&limit={limit}"
 
         payload = {}
@@ -121,6 +123,8 @@ class VectaraService:
             This method fetches twice the requested limit of initial results before
             applying reranking to get the final limited set.
         """
+        import pandas as pd
+
         url = f"https://api.vectara.io/v2/corpora/{corpus_key}/query"
 
         payload = json.dumps(
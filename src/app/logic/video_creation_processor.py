@@ -1,13 +1,18 @@
 import json
 import uuid
+import asyncio
 import traceback
 import threading
 from queue import Queue
 from datetime import datetime
 
-from groq import Groq
 from dataclasses import dataclass
 
+from .groq_client_pool import GroqClientPool
+from .llm_response_cache import complete, acomplete
+from .llm_gateway import current_lane, BACKGROUND
+from .prompt_registry import prompt_registry
+
 @dataclass
 class VideoCreationRequest:
     id: str
@@ -15,6 +20,63 @@ class VideoCreationRequest:
     status: str = "pending"
     created_at: datetime = datetime.now()
 
+VIDEO_PARAMETERS_PROMPT = prompt_registry.register("video_parameters", """You are a helpful assistant that extracts, infers, or formulates cohesive image and video generation prompts from user messages. You create prompts suitable for AI image generators (like DALL-E, Stable Diffusion, or FLUX.1) and video generation tools (like Runway).
+
+Your task is to:
+1. Extract or infer the key visual elements and descriptive details from the user's message
+2. Create an image generation prompt that will serve as the base for the video
+3. Create a video generation prompt that describes the motion or transformation desired
+4. Return the information in a JSON format
+
+Guidelines for image prompt creation:
+- Preserve the user's core intent and desired outcome
+- Consider how the image will work as a starting point for the video
+
+Guidelines for video prompt creation:
+- Keep descriptions clear and focused on motion or transformation
+- Ensure the motion prompt naturally extends from the base image
+- Use simple, direct language that describes the desired animation
+- Focus on one primary motion or transformation
+- Avoid complex or multiple simultaneous actions
+- Consider technical limitations of AI video generation
+
+Example pairs of image and video prompts:
+
+1. Nature Scene:
+   - Image: "A lone cherry blossom tree in full bloom against a sunset sky"
+   - Video: "Petals gently falling in the breeze"
+
+2. Character:
+   - Image: "A serene koi fish in crystal clear water, traditional Japanese art style"
+   - Video: "The koi fish gracefully swimming forward"
+
+3. Landscape:
+   - Image: "A sweeping desert landscape with golden sand dunes at twilight"
+   - Video: "Sand shifting and flowing across the dunes"
+
+4. Urban:
+   - Image: "A neon-lit cyberpunk city street in the rain"
+   - Video: "Rain droplets falling as neon lights flicker"
+
+5. Abstract:
+   - Image: "A spiral galaxy of vibrant watercolors on black background"
+   - Video: "The galaxy slowly spinning and expanding"
+
+Return JSON format:
+{
+    "image_gen_prompt": string or null,
+    "video_gen_prompt": string or null
+}
+
+Extract image and video generation prompts from this message:
+
+'''
+**${main_topic}: ${context}**
+
+${user_message}
+'''
+""", input_budgets={"user_message": 256})
+
 class VideoCreationProcessor:
     """
     A processor class for handling video creation requests based on user inputs.
@@ -22,19 +84,25 @@ class VideoCreationProcessor:
     and video content and communicates updates to the user through Telegram.
 
     Attributes:
+        groq_client_pool (GroqClientPool): Shared Groq clients.
         groq_client (Groq): The Groq client for processing AI-driven interactions.
         groq_interaction_model_id (str): The model ID for generating prompts via Groq.
+        llm_response_cache (LlmResponseCache): Optional cache of deterministic LLM responses.
         groq_notification_model_id (str): The model ID for generating notification messages.
         telegram_service: A service for sending notifications to users via Telegram.
         open_ai_service: A service for generating images based on prompts.
         runway_service: A service for creating and retrieving videos based on generated images and prompts.
+        event_loop (EventLoopThread): Loop running video jobs as coroutines, None to use a processing thread.
         content_queue (Queue): A thread-safe queue for managing video creation requests.
 
     Methods:
         handle_content_request(topic, last_user_message):
             Processes a user's request to generate video content by analyzing the topic 
             and user message, queuing the request, and generating a response.
-        
+
+        ahandle_content_request(topic, last_user_message):
+            Async counterpart of handle_content_request, used by InteractionManager.ahandle_message.
+
         __start_processing_thread():
             Initializes a background thread to process requests from the queue.
         
@@ -61,19 +129,24 @@ class VideoCreationProcessor:
         processor.handle_content_request(topic, user_message)
     """
     
-    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, open_ai_service, runway_service):
-        self.groq_client = Groq(api_key=groq_api_key)
+    def __init__(self, groq_api_key, groq_interaction_model_id, groq_notification_model_id, telegram_service, open_ai_service, runway_service, llm_response_cache=None, groq_client_pool=None, event_loop=None):
+        self.groq_client_pool = groq_client_pool or GroqClientPool(groq_api_key)
+        self.groq_client = self.groq_client_pool.client
         self.groq_interaction_model_id = groq_interaction_model_id
+        self.llm_response_cache = llm_response_cache
         self.groq_notification_model_id = groq_notification_model_id
         self.telegram_service = telegram_service
         self.open_ai_service = open_ai_service
         self.runway_service = runway_service
+        self.event_loop = event_loop
         self.content_queue = Queue()
-        self.__start_processing_thread()
+        if event_loop is None:
+            self.__start_processing_thread()
 
     def __start_processing_thread(self):
         """Start background thread for content processing"""
         def process_queue():
+            current_lane.set(BACKGROUND)
             while True:
                 request = self.content_queue.get()
                 try:
@@ -87,65 +160,28 @@ class VideoCreationProcessor:
         thread = threading.Thread(target=process_queue, daemon=True)
         thread.start()
 
-    def __detect_image_parameters(self, topic, user_message):               
-        prompt = f"""You are a helpful assistant that extracts, infers, or formulates cohesive image and video generation prompts from user messages. You create prompts suitable for AI image generators (like DALL-E, Stable Diffusion, or FLUX.1) and video generation tools (like Runway).
-
-Your task is to:
-1. Extract or infer the key visual elements and descriptive details from the user's message
-2. Create an image generation prompt that will serve as the base for the video
-3. Create a video generation prompt that describes the motion or transformation desired
-4. Return the information in a JSON format
-
-Guidelines for image prompt creation:
-- Preserve the user's core intent and desired outcome
-- Consider how the image will work as a starting point for the video
-
-Guidelines for video prompt creation:
-- Keep descriptions clear and focused on motion or transformation
-- Ensure the motion prompt naturally extends from the base image
-- Use simple, direct language that describes the desired animation
-- Focus on one primary motion or transformation
-- Avoid complex or multiple simultaneous actions
-- Consider technical limitations of AI video generation
-
-Example pairs of image and video prompts:
-
-1. Nature Scene:
-   - Image: "A lone cherry blossom tree in full bloom against a sunset sky"
-   - Video: "Petals gently falling in the breeze"
-
-2. Character:
-   - Image: "A serene koi fish in crystal clear water, traditional Japanese art style"
-   - Video: "The koi fish gracefully swimming forward"
-
-3. Landscape:
-   - Image: "A sweeping desert landscape with golden sand dunes at twilight"
-   - Video: "Sand shifting and flowing across the dunes"
-
-4. Urban:
-   - Image: "A neon-lit cyberpunk city street in the rain"
-   - Video: "Rain droplets falling as neon lights flicker"
-
-5. Abstract:
-   - Image: "A spiral galaxy of vibrant watercolors on black background"
-   - Video: "The galaxy slowly spinning and expanding"
-
-Return JSON format:
-{{
-    "image_gen_prompt": string or null,
-    "video_gen_prompt": string or null
-}}
-
-Extract image and video generation prompts from this message:
-
-'''
-**{topic['main_topic']}: {topic['context']}**
-
-{user_message}
-'''
-"""
-
-        response = self.groq_client.chat.completions.create(
+    async def __aprocess_request(self, request: VideoCreationRequest):
+        """Coroutine counterpart of the processing thread's work for one request"""
+        current_lane.set(BACKGROUND)
+        print('[VideoCreationProcessor] __aprocess_request.request:', request)
+        # Each blocking API call gets a worker thread, the minutes of polling between them do not
+        prompt_image = await asyncio.to_thread(self.open_ai_service.generate_image, request.gen_params['image_gen_prompt'])
+        print('[VideoCreationProcessor] __aprocess_request.prompt_image:', prompt_image)
+        task_id = await asyncio.to_thread(self.runway_service.create_video, prompt_image, request.gen_params['video_gen_prompt'])
+        print('[VideoCreationProcessor] __aprocess_request.task_id:', task_id)
+        video_url = await self.runway_service.aretrieve_video(task_id)
+        print('[VideoCreationProcessor] __aprocess_request.video_url:', video_url)
+        await asyncio.to_thread(self.telegram_service.send_message, video_url)
+
+    def __enqueue(self, request: VideoCreationRequest):
+        if self.event_loop:
+            self.event_loop.spawn(self.__aprocess_request(request))
+        else:
+            self.content_queue.put(request)
+
+    def __video_parameters_request(self, topic, user_message) -> dict:
+        prompt = VIDEO_PARAMETERS_PROMPT.render(main_topic=topic['main_topic'], context=topic['context'], user_message=user_message)
+        return dict(
                 messages=[{"role": "user", "content": prompt}],
                 model=self.groq_interaction_model_id,
                 max_tokens=192,
@@ -154,13 +190,22 @@ Extract image and video generation prompts from this message:
                 response_format={"type": "json_object"}
                 )
 
-        result = response.choices[0].message.content
+    def __detect_image_parameters(self, topic, user_message):
+        result = complete(self.groq_client, self.llm_response_cache, **self.__video_parameters_request(topic, user_message))
+
         parsed_result = json.loads(result)
         print('[VideoCreationProcessor] __detect_image_parameters.parsed_result:', parsed_result)
         return parsed_result
 
+    async def __adetect_image_parameters(self, topic, user_message):
+        result = await acomplete(self.groq_client_pool.async_client, self.llm_response_cache, **self.__video_parameters_request(topic, user_message))
 
-    def __generate_processing_message(self, gen_params: dict, last_user_message: str) -> str:
+        parsed_result = json.loads(result)
+        print('[VideoCreationProcessor] __adetect_image_parameters.parsed_result:', parsed_result)
+        return parsed_result
+
+
+    def __processing_message_request(self, gen_params: dict, last_user_message: str) -> dict:
         prompt = f"""Generate an engaging and concise response about the video being generated that will be sent to the user's Telegram.
 
 **Mention general thoughts about the video concept based on these specific details:**
@@ -175,18 +220,24 @@ User's original message: '''{last_user_message}'''
         
         print('[VideoCreationProcessor] __generate_processing_message.prompt:', prompt)
 
-        response = self.groq_client.chat.completions.create(
+        return dict(
                 messages=[{"role": "user", "content": prompt}],
                 model=self.groq_notification_model_id,
                 max_tokens=192,
                 temperature=0.08,
                 frequency_penalty=1.1,
                 stream=False)
-        
-        response_text = response.choices[0].message.content
+
+    def __generate_processing_message(self, gen_params: dict, last_user_message: str) -> str:
+        response_text = complete(self.groq_client, **self.__processing_message_request(gen_params, last_user_message))
         print('[VideoCreationProcessor] __generate_processing_message.response_text:', response_text)
         return response_text
 
+    async def __agenerate_processing_message(self, gen_params: dict, last_user_message: str) -> str:
+        response_text = await acomplete(self.groq_client_pool.async_client, **self.__processing_message_request(gen_params, last_user_message))
+        print('[VideoCreationProcessor] __agenerate_processing_message.response_text:', response_text)
+        return response_text
+
     def __process_content(self, request: VideoCreationRequest) -> str:
         print('[VideoCreationProcessor] __process_content.request:', request)
         prompt_image = self.open_ai_service.generate_image(request.gen_params['image_gen_prompt'])
@@ -203,5 +254,15 @@ User's original message: '''{last_user_message}'''
             id=str(uuid.uuid4()),
             gen_params=gen_params
         )
-        self.content_queue.put(request)
-        return self.__generate_processing_message(gen_params, last_user_message)
\ No newline at end of file
+        self.__enqueue(request)
+        return self.__generate_processing_message(gen_params, last_user_message)
+
+    async def ahandle_content_request(self, topic, last_user_message: str) -> str:
+        """Async counterpart of handle_content_request"""
+        gen_params = await self.__adetect_image_parameters(topic, last_user_message)
+        request = VideoCreationRequest(
+            id=str(uuid.uuid4()),
+            gen_params=gen_params
+        )
+        self.__enqueue(request)
+        return await self.__agenerate_processing_message(gen_params, last_user_message)
\ No newline at end of file
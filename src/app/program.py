@@ -2,21 +2,29 @@ import os
 import time
 import subprocess
 
-from dotenv import load_dotenv
+from client.startup_profiler import StartupProfiler
 
-from client import CaseyListenAndTalks
-from logic import (
-    InteractionManager,
-    TelegramService,
-    NewsService,
-    VectaraService,
-    ImgflipService,
-    OpenAIService,
-    RunwayService
-)
-from logic import (
-    SemanticMemoryModule
-)
+startup_profiler = StartupProfiler()
+
+with startup_profiler.phase("imports"):
+    from dotenv import load_dotenv
+
+    from client import CaseyListenAndTalks
+    from logic import (
+        InteractionManager,
+        TelegramService,
+        NewsService,
+        VectaraService,
+        ImgflipService,
+        OpenAIService,
+        RunwayService
+    )
+    from logic import (
+        SemanticMemoryModule,
+        LlmResponseCache,
+        GroqClientPool,
+        LlmGateway
+    )
 
 load_dotenv(override=True)
 
@@ -33,36 +41,63 @@ def run_casey_see():
     )
 
 def run_casey_listen_and_talks():
-    news_service = NewsService(os.environ.get("BING_API_KEY"))
-    vectara_service = VectaraService(os.environ.get("VECTARA_API_KEY"))
-    open_ai_service = OpenAIService(
-        os.environ["AZURE_OPENAI_API_KEY"], os.environ["AZURE_OPENAI_ENDPOINT"]
-    )
-    imgflip_service = ImgflipService(
-        os.environ.get("IMGFLIP_USERNAME"), os.environ.get("IMGFLIP_PASSWORD")
-    )
-    telegram_service = TelegramService(
-        os.environ.get("TELEGRAM_API_TOKEN"), os.environ.get("TELEGRAM_CHAT_ID")
-    )
-    runway_service = RunwayService(os.environ.get('RUNWAYML_API_SECRET'))
+    with startup_profiler.phase("services"):
+        news_service = NewsService(os.environ.get("BING_API_KEY"))
+        vectara_service = VectaraService(os.environ.get("VECTARA_API_KEY"))
+        open_ai_service = OpenAIService(
+            os.environ["AZURE_OPENAI_API_KEY"], os.environ["AZURE_OPENAI_ENDPOINT"]
+        )
+        imgflip_service = ImgflipService(
+            os.environ.get("IMGFLIP_USERNAME"), os.environ.get("IMGFLIP_PASSWORD")
+        )
+        telegram_service = TelegramService(
+            os.environ.get("TELEGRAM_API_TOKEN"), os.environ.get("TELEGRAM_CHAT_ID")
+        )
+        runway_service = RunwayService(os.environ.get('RUNWAYML_API_SECRET'))
 
-    semantic_memory_module = SemanticMemoryModule(os.environ.get("GROQ_API_KEY"), os.environ.get("GROQ_INTERACTION_MODEL_ID"), vectara_service)
+        llm_cache_dir = os.environ.get("LLM_CACHE_DIR", "logic/data/llm_cache")
+        llm_response_cache = LlmResponseCache(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), llm_cache_dir) if llm_cache_dir else None,
+            ttl_seconds=float(os.environ.get("LLM_CACHE_TTL_HOURS", "24")) * 3600,
+        )
 
-    interaction_manager = InteractionManager(
-        os.environ.get("GROQ_API_KEY"),
-        os.environ.get("GROQ_INTERACTION_MODEL_ID"),
-        os.environ.get("GROQ_NOTIFICATION_MODEL_ID"),
-        telegram_service,
-        news_service,
-        vectara_service,
-        imgflip_service,
-        open_ai_service,
-        runway_service,
-        semantic_memory_module
-    )
+        llm_gateway = LlmGateway(
+            requests_per_minute=int(os.environ.get("GROQ_REQUESTS_PER_MINUTE", "30")),
+            max_concurrency=int(os.environ.get("GROQ_MAX_CONCURRENCY", "8")),
+        )
+        groq_client_pool = GroqClientPool(os.environ.get("GROQ_API_KEY"), llm_gateway=llm_gateway)
+
+        semantic_memory_module = SemanticMemoryModule(os.environ.get("GROQ_API_KEY"), os.environ.get("GROQ_INTERACTION_MODEL_ID"), vectara_service, llm_response_cache, groq_client_pool)
+
+        interaction_manager = InteractionManager(
+            os.environ.get("GROQ_API_KEY"),
+            os.environ.get("GROQ_INTERACTION_MODEL_ID"),
+            os.environ.get("GROQ_NOTIFICATION_MODEL_ID"),
+            telegram_service,
+            news_service,
+            vectara_service,
+            imgflip_service,
+            open_ai_service,
+            runway_service,
+            semantic_memory_module,
+            local_intent_classification=os.environ.get("LOCAL_INTENT_CLASSIFIER", "true").lower() == "true",
+            llm_response_cache=llm_response_cache,
+            async_mode=os.environ.get("ASYNC_PROCESSORS", "false").lower() == "true",
+            groq_client_pool=groq_client_pool,
+            intent_classifier_model=os.environ.get("INTENT_CLASSIFIER_MODEL") or None,
+        )
 
     casey_listen = CaseyListenAndTalks(
-        os.environ.get("APP_LANG"), interaction_manager, 120, os.environ.get("AZURE_SPEECH_SUBSCRIPTION_KEY")
+        os.environ.get("APP_LANG"), interaction_manager, 120, os.environ.get("AZURE_SPEECH_SUBSCRIPTION_KEY"),
+        transcription_profile=os.environ.get("WHISPER_PROFILE", "accurate"),
+        transcription_device=os.environ.get("WHISPER_DEVICE", "auto"),
+        barge_in=os.environ.get("BARGE_IN", "false").lower() == "true",
+        stream_replies=os.environ.get("STREAM_REPLIES", "true").lower() == "true",
+        speculative_replies=os.environ.get("SPECULATIVE_REPLIES", "true").lower() == "true",
+        combined_replies=os.environ.get("COMBINED_REPLIES", "false").lower() == "true",
+        latency_log_path=os.environ.get("LATENCY_LOG_PATH") or None,
+        transcription_cache_dir=os.environ.get("WHISPER_CACHE_DIR") or None,
+        startup_profiler=startup_profiler,
     )
     casey_listen.run()
 